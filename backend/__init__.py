@@ -30,8 +30,33 @@ def create_app(flask_env=None):
             "variable must be one of the following options: development, test or production."
         )
 
-    from backend.dao.postgres_db import init_db, DBSession
-    init_db()
+    from backend.util.time_uuid import new_uuid
+    new_uuid.configure(app.config["TIME_ORDERED_UUIDS"])
+
+    from backend.util.json_backend import json_backend, BackendJSONDecoder
+    try:
+        json_backend.configure(app.config["JSON_BACKEND"], encode=app.config["JSON_ENCODE_RESPONSES"])
+    except (ImportError, ValueError) as error:
+        raise SystemExit("JSON_BACKEND cannot be used: %s" % str(error))
+    app.json_decoder = BackendJSONDecoder
+
+    from backend.dao.postgres_db import init_db, DBSession, DBReplicaSession, shard_router
+    init_db(
+        auto_create=app.config["DATABASE_AUTO_CREATE"],
+        replica_url=app.config["DATABASE_REPLICA_URL"],
+        read_your_writes=app.config["DATABASE_READ_YOUR_WRITES"],
+        shards=app.config["DATABASE_SHARDS"],
+        pool_options={
+            "pool_size": app.config["DATABASE_POOL_SIZE"],
+            "max_overflow": app.config["DATABASE_MAX_OVERFLOW"],
+            "pool_timeout": app.config["DATABASE_POOL_TIMEOUT"],
+            "pool_recycle": app.config["DATABASE_POOL_RECYCLE"],
+            "pool_pre_ping": app.config["DATABASE_POOL_PRE_PING"]
+        }
+    )
+
+    from backend.dao.willstores_ws import init_willstores
+    init_willstores(app)
 
     from backend.controller.api import bpapi
     app.register_blueprint(bpapi, url_prefix="/api")
@@ -46,5 +71,7 @@ def create_app(flask_env=None):
     @app.teardown_request
     def teardown_request(e):
         DBSession.remove()
+        DBReplicaSession.remove()
+        shard_router.remove()
 
     return app
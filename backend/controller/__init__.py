@@ -5,6 +5,8 @@ from functools import wraps
 from backend.service import JWTService
 from backend.errors.access_error import AccessError
 from .error_handler import ErrorHandler
+from .read_after import read_after_headers, read_after_token, READ_AFTER_HEADER
+from .conditional import validator_headers, not_modified
 
 
 def auth_required():
@@ -1,6 +1,8 @@
-from flask import Blueprint
+from flask import Blueprint, make_response, current_app
 from flask_restplus import Api
 
+from backend.util.json_backend import json_backend
+
 
 bpapi = Blueprint("api", __name__)
 
@@ -22,7 +24,23 @@ api = Api(bpapi,
 
 api.namespaces.clear()
 
+
+@api.representation("application/json")
+def output_json(data, code, headers=None):
+    settings = dict(current_app.config.get("RESTPLUS_JSON", {}))
+    if current_app.debug:
+        settings.setdefault("indent", 4)
+
+    response = make_response(json_backend.dumps(data, **settings) + "\n", code)
+    response.headers.extend(headers or {})
+    return response
+
+
 from .order import NSOrder
+from .stats import NSStats
 
 for ns in NSOrder:
     api.add_namespace(ns, path="/order")
+
+for ns in NSStats:
+    api.add_namespace(ns, path="/stats")
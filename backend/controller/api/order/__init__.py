@@ -2,10 +2,12 @@ from .select_by_slug import selectBySlugNS
 from .select_by_user import selectByUserNS
 from .insert import insertNS
 from .delete import deleteNS
+from .import_orders import importNS
 
 NSOrder = [
     selectBySlugNS,
     selectByUserNS,
     insertNS,
-    deleteNS
+    deleteNS,
+    importNS
 ]
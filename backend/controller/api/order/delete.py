@@ -2,7 +2,7 @@ from flask_restplus import Namespace, Resource
 
 from backend.service import OrderService
 from backend.util.response.error import ErrorResponse
-from backend.controller import ErrorHandler, auth_required
+from backend.controller import ErrorHandler, auth_required, read_after_headers
 
 
 deleteNS = Namespace("Order", description="Order related operations.")
@@ -30,6 +30,6 @@ class DeleteController(Resource):
         """Order delete."""
         try:
             self.__orderservice.delete(user_slug=user_slug, order_slug=order_slug)
-            return {}, 200
+            return {}, 200, read_after_headers()
         except Exception as error:
             return ErrorHandler(error).handle_error()
@@ -0,0 +1,37 @@
+from flask_restplus import Namespace, Resource
+from flask import request, current_app as app
+
+from backend.service import OrderImportService
+from backend.util.response.order_import import OrderImportResponse
+from backend.util.response.error import ErrorResponse
+from backend.controller import ErrorHandler, auth_required
+
+
+importNS = Namespace("Order", description="Order related operations.")
+
+RESPONSEMODEL = OrderImportResponse.get_model(importNS, "OrderImportResponse")
+ERRORMODEL = ErrorResponse.get_model(importNS, "ErrorResponse")
+
+
+@importNS.route("/import", strict_slashes=False)
+class ImportController(Resource):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__orderimportservice = OrderImportService()
+
+    @auth_required()
+    @importNS.doc(security=["token"])
+    @importNS.param("payload", description="NDJSON, one {user_slug, item_list} order per line", _in="body", required=True)
+    @importNS.response(200, "Success", RESPONSEMODEL)
+    @importNS.response(401, "Unauthorized", ERRORMODEL)
+    @importNS.response(500, "Unexpected Error", ERRORMODEL)
+    @importNS.response(504, "No response from gateway server", ERRORMODEL)
+    def post(self):
+        """Bulk order import, loaded in batches."""
+        try:
+            report = self.__orderimportservice.import_orders(request.stream, batch_size=app.config["ORDER_IMPORT_BATCH_SIZE"])
+
+            jsonsend = OrderImportResponse.marshall_json(report)
+            return jsonsend
+        except Exception as error:
+            return ErrorHandler(error).handle_error()
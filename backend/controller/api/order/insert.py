@@ -1,12 +1,12 @@
-import os
 from flask_restplus import Namespace, Resource
 from flask import current_app as app
-from requests import post
 
 from backend.service import OrderService
+from backend.dao.willstores_ws import willstores
+from backend.util.price import sum_total
 from backend.util.request.order_insert import OrderInsertRequest
 from backend.util.response.error import ErrorResponse
-from backend.controller import ErrorHandler, auth_required
+from backend.controller import ErrorHandler, auth_required, read_after_headers
 
 
 insertNS = Namespace("Order", description="Order related operations.")
@@ -35,12 +35,14 @@ class InsertController(Resource):
         try:
             in_data = OrderInsertRequest.parse_json()
 
-            url = app.config["WILLSTORES_WS"]
-            headers = {"Authorization": "Bearer %s" % os.getenv("ACCESS_TOKEN")}
-            req = post("%s/api/product/total" % (url), headers=headers, json={"item_list": in_data["item_list"]})
-            req.raise_for_status()
+            if app.config["ORDER_SNAPSHOTS"]:
+                products = willstores.product_list(in_data["item_list"])["products"]
+                total = sum_total(in_data["item_list"], products)
+            else:
+                products = None
+                total = willstores.product_total(in_data["item_list"])["total"]
 
-            self.__orderservice.insert(**in_data)
-            return {}, 201
+            self.__orderservice.insert(**in_data, total=total, products=products)
+            return {}, 201, read_after_headers()
         except Exception as error:
             return ErrorHandler(error).handle_error()
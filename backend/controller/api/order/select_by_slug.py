@@ -1,12 +1,14 @@
-import os
+from datetime import datetime, timedelta
 from flask_restplus import Namespace, Resource
 from flask import current_app as app
-from requests import post
 
 from backend.service import OrderService
+from backend.dao.postgres_db import DBSession, shard_router
+from backend.dao.willstores_ws import willstores
+from backend.util.price import sum_total
 from backend.util.response.order import OrderResponse
 from backend.util.response.error import ErrorResponse
-from backend.controller import ErrorHandler, auth_required
+from backend.controller import ErrorHandler, auth_required, read_after_token, validator_headers, not_modified
 
 
 selectBySlugNS = Namespace("Order", description="Order related operations.")
@@ -15,6 +17,18 @@ RESPONSEMODEL = OrderResponse.get_model(selectBySlugNS, "OrderResponse")
 ERRORMODEL = ErrorResponse.get_model(selectBySlugNS, "ErrorResponse")
 
 
+def refresh_snapshots(flask_app, user_slug, order_slug, items_list):
+    with flask_app.app_context():
+        try:
+            products = willstores.product_list(items_list)["products"]
+            OrderService().refresh_snapshots(user_slug=user_slug, order_slug=order_slug, products=products)
+        except Exception as error:
+            flask_app.logger.error("SNAPSHOT REFRESH ERROR: %s" % str(error))
+        finally:
+            DBSession.remove()
+            shard_router.remove()
+
+
 @selectBySlugNS.route("/<string:user_slug>/<string:order_slug>", strict_slashes=False)
 class SelectBySlugController(Resource):
     def __init__(self, *args, **kwargs):
@@ -26,6 +40,7 @@ class SelectBySlugController(Resource):
     @selectBySlugNS.param("user_slug", description="User slug", _in="path", required=True)
     @selectBySlugNS.param("order_slug", description="Order slug", _in="path", required=True)
     @selectBySlugNS.response(200, "Success", RESPONSEMODEL)
+    @selectBySlugNS.response(304, "Not Modified")
     @selectBySlugNS.response(400, "Bad Request", ERRORMODEL)
     @selectBySlugNS.response(401, "Unauthorized", ERRORMODEL)
     @selectBySlugNS.response(404, "Not Found", ERRORMODEL)
@@ -35,21 +50,33 @@ class SelectBySlugController(Resource):
     def get(self, user_slug, order_slug):
         """Order information."""
         try:
-            order = self.__orderservice.select_by_slug(user_slug=user_slug, order_slug=order_slug)
-            items_list = [item.to_dict() for item in order.items]
-            items_info = {"item_list": items_list}
+            headers = {}
+            version = self.__orderservice.select_version_by_slug(user_slug=user_slug, order_slug=order_slug, read_after=read_after_token())
+            if version is not None:
+                headers = validator_headers((user_slug, order_slug) + version, last_modified=max(version))
+                if not_modified(headers):
+                    return {}, 304, headers
+
+            order = self.__orderservice.select_document_by_slug(user_slug=user_slug, order_slug=order_slug, read_after=read_after_token())
+            items = order.pop("items")
+            snapshot_at = order.pop("snapshot_at")
+            items_list = [{"item_id": item["item_id"], "amount": item["amount"]} for item in items]
+
+            if items and all(item["snapshot"] is not None for item in items):
+                result = {"products": [item["snapshot"] for item in items]}
+                result["total"] = order["total"] or sum_total(items_list, result["products"])
 
-            url = app.config["WILLSTORES_WS"]
-            headers = {"Authorization": "Bearer %s" % os.getenv("ACCESS_TOKEN")}
-            req = post("%s/api/product/list" % (url), headers=headers, json=items_info)
-            req.raise_for_status()
-            result = req.json()
+                ttl = app.config["ORDER_SNAPSHOT_TTL"]
+                if ttl > 0 and datetime.now() - snapshot_at > timedelta(seconds=ttl):
+                    willstores.submit(refresh_snapshots, app._get_current_object(), user_slug, order_slug, items_list)
+            else:
+                result = willstores.product_list(items_list)
 
             for item in items_list:
                 product = next(p for p in result["products"] if p["id"] == item["item_id"])
                 product["amount"] = item["amount"]
 
-            jsonsend = OrderResponse.marshall_json(dict(order.to_dict(), **result))
-            return jsonsend
+            jsonsend = OrderResponse.marshall_json(dict(order, **result))
+            return jsonsend, 200, headers
         except Exception as error:
             return ErrorHandler(error).handle_error()
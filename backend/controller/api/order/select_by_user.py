@@ -1,14 +1,13 @@
-import os
-import asyncio
 from flask_restplus import Namespace, Resource
 from flask import current_app as app
-from requests import Session
 
 from backend.service import OrderService
+from backend.dao.willstores_ws import willstores
+from backend.util.price import sum_total
 from backend.util.request.user_orders import UserOrdersRequest
 from backend.util.response.user_orders import UserOrdersResponse
 from backend.util.response.error import ErrorResponse
-from backend.controller import ErrorHandler, auth_required
+from backend.controller import ErrorHandler, auth_required, read_after_token, validator_headers, not_modified, READ_AFTER_HEADER
 
 
 selectByUserNS = Namespace("Order", description="Order related operations.")
@@ -18,20 +17,53 @@ RESPONSEMODEL = UserOrdersResponse.get_model(selectByUserNS, "UserOrdersResponse
 ERRORMODEL = ErrorResponse.get_model(selectByUserNS, "ErrorResponse")
 
 
-async def fetch_order(session, url, order):
-    req = session.post("%s/api/product/total" % (url), json={"item_list": [item.to_dict() for item in order.items]})
-    req.raise_for_status()
-    processed_order = order.to_dict()
-    processed_order.update(req.json())
-    return processed_order
+def fetch_totals(orders_items):
+    return [result["total"] for result in willstores.product_totals(orders_items)]
 
 
-async def process_orders(session, url, user_info):
-    orders = await asyncio.gather(*[fetch_order(session, url, order) for order in user_info["orders"]])
+def fetch_totals_batch(orders_items):
+    if not orders_items:
+        return []
+
+    item_ids = list(dict.fromkeys(item["item_id"] for item_list in orders_items for item in item_list))
+    products = willstores.product_list([{"item_id": item_id, "amount": 1} for item_id in item_ids])["products"]
+    return [sum_total(item_list, products) for item_list in orders_items]
+
+
+def process_orders(user_info, live_price=False):
+    pending_orders = [order for order in user_info["orders"] if live_price or order.total is None]
+    orders_items = [[item.to_dict() for item in order.items] for order in pending_orders]
+
+    if app.config["WILLSTORES_BATCH_TOTALS"]:
+        live_totals = iter(fetch_totals_batch(orders_items))
+    else:
+        live_totals = iter(fetch_totals(orders_items))
+
+    orders = []
+    for order in user_info["orders"]:
+        processed_order = order.to_dict()
+        if live_price or order.total is None:
+            processed_order["total"] = next(live_totals)
+        else:
+            processed_order["total"] = order.total
+        orders.append(processed_order)
+
     user_info["orders"] = orders
     return user_info
 
 
+def cache_headers(live_price=False):
+    shared_max_age = app.config["ORDER_LIST_SHARED_MAX_AGE"]
+    if live_price:
+        cache_control = "no-store"
+    elif shared_max_age > 0:
+        cache_control = "public, max-age=0, s-maxage=%d" % shared_max_age
+    else:
+        cache_control = "public, no-cache"
+
+    return {"Cache-Control": cache_control, "Vary": "Authorization, Cookie, %s" % READ_AFTER_HEADER}
+
+
 @selectByUserNS.route("/user/<string:user_slug>", strict_slashes=False)
 class SelectByUserController(Resource):
     def __init__(self, *args, **kwargs):
@@ -44,6 +76,7 @@ class SelectByUserController(Resource):
     @selectByUserNS.param("payload", description="Optional", _in="body", required=False)
     @selectByUserNS.expect(REQUESTMODEL)
     @selectByUserNS.response(200, "Success", RESPONSEMODEL)
+    @selectByUserNS.response(304, "Not Modified")
     @selectByUserNS.response(204, "No Content", ERRORMODEL)
     @selectByUserNS.response(400, "Bad Request", ERRORMODEL)
     @selectByUserNS.response(401, "Unauthorized", ERRORMODEL)
@@ -54,14 +87,51 @@ class SelectByUserController(Resource):
         """Orders for a user."""
         try:
             in_data = UserOrdersRequest.parse_json()
-            user_info = self.__orderservice.select_by_user_slug(user_slug=user_slug, **in_data)
-
-            url = app.config["WILLSTORES_WS"]
-            with Session() as sess:
-                sess.headers["Authorization"] = "Bearer %s" % os.getenv("ACCESS_TOKEN")
-                processed_user_info = asyncio.run(process_orders(sess, url, user_info))
+            return self.__select_orders(user_slug, in_data)
+        except Exception as error:
+            return ErrorHandler(error).handle_error()
 
-            jsonsend = UserOrdersResponse.marshall_json(processed_user_info)
-            return jsonsend
+    @auth_required()
+    @selectByUserNS.doc(security=["token"])
+    @selectByUserNS.param("user_slug", description="User Slug", _in="path", required=True)
+    @selectByUserNS.param("page", description="Page requested.", _in="query", type=int, default=1)
+    @selectByUserNS.param("cursor", description="Opaque cursor from a previous 'next_cursor', requests the following page. Cannot be used with 'page'.", _in="query", type=str)
+    @selectByUserNS.param("with_total", description="Send 'total' and 'pages'.", _in="query", type=bool, default=True)
+    @selectByUserNS.param("page_size", description="Amount of results per page.", _in="query", type=int, default=10)
+    @selectByUserNS.param("start", description="Search date interval start, requires 'end'.", _in="query", type=str, example="YYYY-MM-DD")
+    @selectByUserNS.param("end", description="Search date interval end, requires 'start'.", _in="query", type=str, example="YYYY-MM-DD")
+    @selectByUserNS.param("live_price", description="Price the orders with the current WillStores prices. Disables caching.", _in="query", type=bool, default=False)
+    @selectByUserNS.response(200, "Success", RESPONSEMODEL)
+    @selectByUserNS.response(304, "Not Modified")
+    @selectByUserNS.response(204, "No Content", ERRORMODEL)
+    @selectByUserNS.response(400, "Bad Request", ERRORMODEL)
+    @selectByUserNS.response(401, "Unauthorized", ERRORMODEL)
+    @selectByUserNS.response(500, "Unexpected Error", ERRORMODEL)
+    @selectByUserNS.response(502, "Error while accessing the gateway server", ERRORMODEL)
+    @selectByUserNS.response(504, "No response from gateway server", ERRORMODEL)
+    def get(self, user_slug):
+        """Orders for a user, cacheable by HTTP caches."""
+        try:
+            in_data = UserOrdersRequest.parse_args()
+            live_price = in_data.get("live_price", False)
+            jsonsend, status, headers = self.__select_orders(user_slug, in_data)
+            headers.update(cache_headers(live_price))
+            return jsonsend, status, headers
         except Exception as error:
             return ErrorHandler(error).handle_error()
+
+    def __select_orders(self, user_slug, in_data):
+        live_price = in_data.pop("live_price", False)
+
+        headers = {}
+        version = None if live_price else self.__orderservice.select_version_by_user_slug(user_slug=user_slug, read_after=read_after_token())
+        if version is not None:
+            headers = validator_headers((user_slug, sorted(in_data.items())) + version)
+            if not_modified(headers):
+                return {}, 304, headers
+
+        user_info = self.__orderservice.select_by_user_slug(user_slug=user_slug, with_items=live_price, read_after=read_after_token(), **in_data)
+        processed_user_info = process_orders(user_info, live_price)
+
+        jsonsend = UserOrdersResponse.marshall_json(processed_user_info)
+        return jsonsend, 200, headers
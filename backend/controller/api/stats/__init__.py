@@ -0,0 +1,7 @@
+from .product_cache import productCacheNS
+from .database_pool import databasePoolNS
+
+NSStats = [
+    productCacheNS,
+    databasePoolNS
+]
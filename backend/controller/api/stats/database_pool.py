@@ -0,0 +1,29 @@
+from flask_restplus import Namespace, Resource
+
+from backend.dao.postgres_db import engines
+from backend.util.response.database_pool_stats import DatabasePoolStatsResponse
+from backend.util.response.error import ErrorResponse
+from backend.controller import ErrorHandler, auth_required
+
+
+databasePoolNS = Namespace("Stats", description="Service statistics.")
+
+RESPONSEMODEL = DatabasePoolStatsResponse.get_model(databasePoolNS, "DatabasePoolStatsResponse")
+ERRORMODEL = ErrorResponse.get_model(databasePoolNS, "ErrorResponse")
+
+
+@databasePoolNS.route("/database-pool", strict_slashes=False)
+class DatabasePoolController(Resource):
+    @auth_required()
+    @databasePoolNS.doc(security=["token"])
+    @databasePoolNS.response(200, "Success", RESPONSEMODEL)
+    @databasePoolNS.response(401, "Unauthorized", ERRORMODEL)
+    @databasePoolNS.response(500, "Unexpected Error", ERRORMODEL)
+    def get(self):
+        """Database connection pool counters of the answering worker."""
+        try:
+            pools = [dict(engine.pool.status_dict(), name=name) for name, engine in engines.items()]
+            jsonsend = DatabasePoolStatsResponse.marshall_json({"pools": pools})
+            return jsonsend
+        except Exception as error:
+            return ErrorHandler(error).handle_error()
@@ -0,0 +1,33 @@
+from flask_restplus import Namespace, Resource
+
+from backend.dao.willstores_ws import willstores
+from backend.errors.not_found_error import NotFoundError
+from backend.util.response.product_cache_stats import ProductCacheStatsResponse
+from backend.util.response.error import ErrorResponse
+from backend.controller import ErrorHandler, auth_required
+
+
+productCacheNS = Namespace("Stats", description="Service statistics.")
+
+RESPONSEMODEL = ProductCacheStatsResponse.get_model(productCacheNS, "ProductCacheStatsResponse")
+ERRORMODEL = ErrorResponse.get_model(productCacheNS, "ErrorResponse")
+
+
+@productCacheNS.route("/product-cache", strict_slashes=False)
+class ProductCacheController(Resource):
+    @auth_required()
+    @productCacheNS.doc(security=["token"])
+    @productCacheNS.response(200, "Success", RESPONSEMODEL)
+    @productCacheNS.response(401, "Unauthorized", ERRORMODEL)
+    @productCacheNS.response(404, "Product cache disabled", ERRORMODEL)
+    @productCacheNS.response(500, "Unexpected Error", ERRORMODEL)
+    def get(self):
+        """Product cache counters of the answering worker."""
+        try:
+            if willstores.cache is None:
+                raise NotFoundError()
+
+            jsonsend = ProductCacheStatsResponse.marshall_json(willstores.cache.stats())
+            return jsonsend
+        except Exception as error:
+            return ErrorHandler(error).handle_error()
@@ -0,0 +1,22 @@
+from datetime import datetime, timezone
+from hashlib import md5
+from flask import request
+from werkzeug.http import http_date, parse_date
+
+
+def validator_headers(state: tuple, last_modified: datetime = None) -> dict:
+    headers = {"ETag": 'W/"%s"' % md5(repr(state).encode("utf-8")).hexdigest()}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified.astimezone(timezone.utc))
+
+    return headers
+
+
+def not_modified(headers: dict) -> bool:
+    if "If-None-Match" in request.headers:
+        return request.if_none_match.contains_weak(headers["ETag"][3:-1])
+
+    if request.if_modified_since is not None and "Last-Modified" in headers:
+        return request.if_modified_since >= parse_date(headers["Last-Modified"])
+
+    return False
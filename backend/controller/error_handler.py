@@ -4,7 +4,7 @@ from flask import current_app as app
 from flask_restplus import abort
 from werkzeug.exceptions import HTTPException, BadRequest
 from marshmallow import ValidationError as MarshmallowError
-from requests import HTTPError, ConnectionError
+from requests import HTTPError, ConnectionError, Timeout
 from sqlalchemy.exc import DatabaseError, SQLAlchemyError
 
 from backend.errors.no_content_error import NoContentError
@@ -26,6 +26,7 @@ class ErrorHandler(object):
             MarshmallowError: self.__handle_MarshmallowError,
             DatabaseError: self.__handle_SQLDatabaseError,
             NotFoundError: self.__handle_NotFoundError,
+            Timeout: self.__handle_Timeout,
             ConnectionError: self.__handle_ConnectionError,
             SQLAlchemyError: self.__handle_SQLAlchemyError,
             HTTPError: self.__handle_HTTPError
@@ -61,6 +62,9 @@ class ErrorHandler(object):
     def __handle_NotFoundError(self):
         return {}, 404
 
+    def __handle_Timeout(self):
+        abort(504, error="No response from the Web service.")
+
     def __handle_ConnectionError(self):
         abort(502, error="Error while connecting to the Web service.")
 
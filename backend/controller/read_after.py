@@ -0,0 +1,29 @@
+from flask import request, current_app as app
+from werkzeug.http import dump_cookie
+
+from backend.dao.postgres_db import DBSession, replica_router
+
+
+READ_AFTER_HEADER = "X-Read-After"
+READ_AFTER_COOKIE = "read_after"
+
+
+def read_after_headers() -> dict:
+    try:
+        token = replica_router.mark_write(DBSession())
+    except Exception as error:
+        DBSession().rollback()
+        app.logger.error("READ AFTER ERROR: %s" % str(error))
+        return {}
+
+    if token is None:
+        return {}
+
+    return {
+        READ_AFTER_HEADER: token,
+        "Set-Cookie": dump_cookie(READ_AFTER_COOKIE, token, max_age=int(replica_router.window), httponly=True)
+    }
+
+
+def read_after_token() -> str:
+    return request.headers.get(READ_AFTER_HEADER) or request.cookies.get(READ_AFTER_COOKIE)
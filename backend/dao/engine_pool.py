@@ -0,0 +1,110 @@
+import os
+from threading import Lock
+from time import time
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+
+class PoolStats(object):
+    """Checkout counters of a connection pool, shared by the pools an engine recreates."""
+
+    def __init__(self) -> None:
+        self.__lock = Lock()
+        self.__checkouts = 0
+        self.__checkout_seconds = 0.0
+        self.__max_checkout_seconds = 0.0
+        self.__timeouts = 0
+        self.__connects = 0
+        self.__fork_discards = 0
+
+    def record_checkout(self, seconds: float) -> None:
+        with self.__lock:
+            self.__checkouts += 1
+            self.__checkout_seconds += seconds
+            self.__max_checkout_seconds = max(self.__max_checkout_seconds, seconds)
+
+    def record_timeout(self) -> None:
+        with self.__lock:
+            self.__timeouts += 1
+
+    def record_connect(self) -> None:
+        with self.__lock:
+            self.__connects += 1
+
+    def record_fork_discard(self) -> None:
+        with self.__lock:
+            self.__fork_discards += 1
+
+    def stats(self) -> dict:
+        with self.__lock:
+            return {
+                "checkouts": self.__checkouts,
+                "checkout_seconds": self.__checkout_seconds,
+                "max_checkout_seconds": self.__max_checkout_seconds,
+                "timeouts": self.__timeouts,
+                "connects": self.__connects,
+                "fork_discards": self.__fork_discards
+            }
+
+
+class StatsQueuePool(QueuePool):
+    """QueuePool timing every checkout, including the wait for a free connection."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def connect(self):
+        return self.__timed_checkout(super().connect)
+
+    def unique_connection(self):
+        return self.__timed_checkout(super().unique_connection)
+
+    def __timed_checkout(self, checkout):
+        started = time()
+        try:
+            return checkout()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        finally:
+            self.stats.record_checkout(time() - started)
+
+    def status_dict(self) -> dict:
+        return dict(
+            self.stats.stats(),
+            size=self.size(),
+            checked_in=self.checkedin(),
+            checked_out=self.checkedout(),
+            overflow=self.overflow()
+        )
+
+
+def create_pooled_engine(url: str, **pool_options) -> Engine:
+    """Create an engine whose pool is measured and never reuses connections across a fork.
+
+    A connection opened before a fork is dropped on its first checkout in the child, without
+    closing it, since the parent process still owns the socket.
+    """
+
+    engine = create_engine(url, poolclass=StatsQueuePool, **pool_options)
+
+    @event.listens_for(engine, "connect")
+    def connect(dbapi_connection, connection_record):
+        connection_record.info["pid"] = os.getpid()
+        engine.pool.stats.record_connect()
+
+    @event.listens_for(engine, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        if connection_record.info["pid"] != os.getpid():
+            engine.pool.stats.record_fork_discard()
+            connection_record.connection = connection_proxy.connection = None
+            raise exc.DisconnectionError("Connection belongs to pid %d, discarded in pid %d." % (connection_record.info["pid"], os.getpid()))
+
+    return engine
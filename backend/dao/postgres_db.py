@@ -1,21 +1,45 @@
 import os
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.exc import OperationalError
 
+from .engine_pool import create_pooled_engine
+from .replica_router import ReplicaRouter
+from .shard_router import ShardRouter
+
 
 Base = declarative_base()
 session_factory = sessionmaker()
 DBSession = scoped_session(session_factory)
+replica_session_factory = sessionmaker()
+DBReplicaSession = scoped_session(replica_session_factory)
+replica_router = ReplicaRouter()
+shard_router = ShardRouter()
+engines = {}
+
 
+def init_db(auto_create: bool = True, replica_url: str = None, read_your_writes: float = 5.0, shards: dict = None, pool_options: dict = None):
+    pool_options = pool_options or {}
+    engine = create_pooled_engine(os.getenv("DATABASE_URL"), **pool_options)
+    replica_engine = create_pooled_engine(replica_url, **pool_options) if replica_url else engine
+    shard_engines = {name: create_pooled_engine(url, **pool_options) for name, url in (shards or {}).items()}
 
-def init_db():
-    engine = create_engine(os.getenv("DATABASE_URL"))
+    for old_engine in engines.values():
+        old_engine.dispose()
+    engines.clear()
+    engines["primary"] = engine
+    if replica_url:
+        engines["replica"] = replica_engine
+    engines.update(("shard:%s" % name, shard_engine) for name, shard_engine in shard_engines.items())
 
     import backend.model
     try:
         session_factory.configure(bind=engine)
-        Base.metadata.create_all(bind=engine)
+        replica_session_factory.configure(bind=replica_engine)
+        replica_router.configure(enabled=bool(replica_url) and not shard_engines, window=read_your_writes)
+        shard_router.configure(shard_engines)
+        if auto_create:
+            for bind in [engine] + list(shard_engines.values()):
+                Base.metadata.create_all(bind=bind)
     except OperationalError:
         raise SystemExit("OPERATIONAL ERROR: Database cannot be reached on startup.")
@@ -0,0 +1,89 @@
+import json
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import List, Tuple
+
+
+class ProductCache(object):
+    """Bounded LRU cache of WillStores products keyed by es_id.
+    Entries expire after ttl seconds. Least recently used entries are evicted
+    once max_entries or max_bytes is exceeded, where the size of an entry is
+    the length of its JSON encoding.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 8388608, ttl: float = 300) -> None:
+        self.__max_entries = max_entries
+        self.__max_bytes = max_bytes
+        self.__ttl = ttl
+        self.__entries = OrderedDict()
+        self.__bytes = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__expirations = 0
+        self.__lock = Lock()
+
+    def get_many(self, item_ids: List[str]) -> Tuple[dict, List[str]]:
+        found = {}
+        missing = []
+        now = monotonic()
+
+        with self.__lock:
+            for item_id in item_ids:
+                entry = self.__entries.get(item_id)
+                if entry is not None and entry[0] <= now:
+                    self.__remove(item_id)
+                    self.__expirations += 1
+                    entry = None
+
+                if entry is None:
+                    self.__misses += 1
+                    missing.append(item_id)
+                else:
+                    self.__hits += 1
+                    self.__entries.move_to_end(item_id)
+                    found[item_id] = dict(entry[2])
+
+        return found, missing
+
+    def set_many(self, products: List[dict]) -> None:
+        expires_at = monotonic() + self.__ttl
+
+        with self.__lock:
+            for product in products:
+                size = len(json.dumps(product))
+                if size > self.__max_bytes:
+                    continue
+
+                if product["id"] in self.__entries:
+                    self.__remove(product["id"])
+
+                self.__entries[product["id"]] = (expires_at, size, dict(product))
+                self.__bytes += size
+
+                while len(self.__entries) > self.__max_entries or self.__bytes > self.__max_bytes:
+                    self.__remove(next(iter(self.__entries)))
+                    self.__evictions += 1
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.__bytes = 0
+
+    def stats(self) -> dict:
+        with self.__lock:
+            return {
+                "entries": len(self.__entries),
+                "bytes": self.__bytes,
+                "max_entries": self.__max_entries,
+                "max_bytes": self.__max_bytes,
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "evictions": self.__evictions,
+                "expirations": self.__expirations
+            }
+
+    def __remove(self, item_id: str) -> None:
+        entry = self.__entries.pop(item_id)
+        self.__bytes -= entry[1]
@@ -0,0 +1,56 @@
+import re
+from time import time
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+LSN = re.compile(r"^[0-9A-Fa-f]{1,8}/[0-9A-Fa-f]{1,8}$")
+
+
+class ReplicaRouter(object):
+    """Decide whether a read may go to the replica.
+
+    After a write, `mark_write` returns a token with the primary WAL position and the
+    time it stops mattering, `window` seconds later. The token travels with the client,
+    so any worker can honour it: while it is valid, reads only go to the replica once it
+    has replayed up to that position. Tokens expiring later than `window` seconds from now
+    are not trusted and ignored.
+    """
+
+    def __init__(self, window: float = 5.0):
+        self.__enabled = False
+        self.__window = window
+
+    def configure(self, enabled: bool, window: float = 5.0) -> None:
+        self.__enabled = enabled
+        self.__window = window
+
+    @property
+    def enabled(self) -> bool:
+        return self.__enabled
+
+    @property
+    def window(self) -> float:
+        return self.__window
+
+    def mark_write(self, session: Session) -> str:
+        if not self.__enabled or self.__window <= 0:
+            return None
+
+        lsn = session.execute(text("SELECT pg_current_wal_lsn()::text")).scalar()
+        session.commit()
+        return "%s@%d" % (lsn, time() + self.__window)
+
+    def can_read(self, replica_session: Session, token: str = None) -> bool:
+        if not self.__enabled:
+            return False
+
+        lsn, _, expires_at = (token or "").partition("@")
+        if not LSN.match(lsn) or not expires_at.isdigit() or not time() < int(expires_at) <= time() + self.__window:
+            return True
+
+        replayed = replica_session.execute(
+            text("SELECT pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn)"),
+            {"lsn": lsn}
+        ).scalar()
+        return bool(replayed)
@@ -0,0 +1,62 @@
+from bisect import bisect
+from hashlib import md5
+from typing import Dict, List
+from uuid import UUID
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker, scoped_session
+
+
+class ShardRing(object):
+    """Consistent hash ring placing user uuids on named shards.
+
+    Every shard owns `points` positions on the ring, derived from its name only, so
+    adding or removing a shard only moves the users between its positions and their
+    neighbours, and the placement is the same in every process.
+    """
+
+    def __init__(self, names: List[str], points: int = 128):
+        ring = sorted((self.position("%s#%d" % (name, point)), name) for name in names for point in range(points))
+        self.__positions = [position for position, name in ring]
+        self.__names = [name for position, name in ring]
+
+    @staticmethod
+    def position(key: str) -> int:
+        return int(md5(key.encode("utf-8")).hexdigest()[:16], 16)
+
+    def shard_for(self, user_uuid: UUID) -> str:
+        index = bisect(self.__positions, self.position(str(user_uuid)))
+        return self.__names[index % len(self.__names)]
+
+
+class ShardRouter(object):
+    """Route each user's sessions to the shard owning the user on the ring."""
+
+    def __init__(self):
+        self.__ring = None
+        self.__sessions = {}
+
+    def configure(self, engines: Dict[str, Engine]) -> None:
+        self.remove()
+        self.__ring = ShardRing(list(engines)) if engines else None
+        self.__sessions = {name: scoped_session(sessionmaker(bind=engine)) for name, engine in engines.items()}
+
+    @property
+    def enabled(self) -> bool:
+        return self.__ring is not None
+
+    @property
+    def names(self) -> List[str]:
+        return sorted(self.__sessions)
+
+    def shard_for(self, user_uuid: UUID) -> str:
+        return self.__ring.shard_for(user_uuid)
+
+    def session(self, name: str) -> Session:
+        return self.__sessions[name]()
+
+    def session_for(self, user_uuid: UUID) -> Session:
+        return self.session(self.shard_for(user_uuid))
+
+    def remove(self) -> None:
+        for sessions in self.__sessions.values():
+            sessions.remove()
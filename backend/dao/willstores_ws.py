@@ -0,0 +1,98 @@
+import os
+from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from werkzeug.local import LocalProxy
+
+from backend.util.price import sum_total
+from backend.util.json_backend import json_backend
+from .product_cache import ProductCache
+
+
+class WillStoresWS(object):
+    def __init__(self, pool_size: int = 10, concurrency: int = 10, timeout: float = 5, retries: int = 2, cache: ProductCache = None) -> None:
+        self.__timeout = timeout
+        self.__cache = cache
+        self.__executor = ThreadPoolExecutor(max_workers=concurrency)
+
+        # WillStores product endpoints are read only, so POST requests are safe to retry
+        # The last response is kept once retries are exhausted, letting its status reach the client
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.1,
+            status_forcelist=(502, 503, 504),
+            method_whitelist=frozenset(["POST"]),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        self.__session = Session()
+        self.__session.headers["Authorization"] = "Bearer %s" % os.getenv("ACCESS_TOKEN")
+        self.__session.mount("http://", adapter)
+        self.__session.mount("https://", adapter)
+
+    @property
+    def cache(self) -> ProductCache:
+        return self.__cache
+
+    def product_list(self, item_list: List[dict]) -> dict:
+        if self.__cache is None:
+            return self.__post(self.__url("/api/product/list"), item_list)
+
+        item_ids = [item["item_id"] for item in item_list]
+        products, missing = self.__cache.get_many(item_ids)
+
+        if missing:
+            missing_items = [item for item in item_list if item["item_id"] in missing]
+            result = self.__post(self.__url("/api/product/list"), missing_items)
+            self.__cache.set_many(result["products"])
+            products.update({product["id"]: dict(product) for product in result["products"]})
+
+        product_list = [products[item_id] for item_id in item_ids]
+        return {
+            "products": product_list,
+            "total": sum_total(item_list, product_list)
+        }
+
+    def product_total(self, item_list: List[dict]) -> dict:
+        return self.__post(self.__url("/api/product/total"), item_list)
+
+    def product_totals(self, item_lists: List[List[dict]]) -> List[dict]:
+        url = self.__url("/api/product/total")
+        futures = [self.__executor.submit(self.__post, url, item_list) for item_list in item_lists]
+        return [future.result() for future in futures]
+
+    def submit(self, fn, *args, **kwargs):
+        return self.__executor.submit(fn, *args, **kwargs)
+
+    def __url(self, path: str) -> str:
+        return "%s%s" % (current_app.config["WILLSTORES_WS"], path)
+
+    def __post(self, url: str, item_list: List[dict]) -> dict:
+        req = self.__session.post(url, json={"item_list": item_list}, timeout=self.__timeout)
+        req.raise_for_status()
+        return json_backend.loads(req.content)
+
+
+willstores = LocalProxy(lambda: current_app.extensions["willstores"])
+
+
+def init_willstores(app):
+    cache = None
+    if app.config["PRODUCT_CACHE_SIZE"] > 0:
+        cache = ProductCache(
+            max_entries=app.config["PRODUCT_CACHE_SIZE"],
+            max_bytes=app.config["PRODUCT_CACHE_MAX_BYTES"],
+            ttl=app.config["PRODUCT_CACHE_TTL"]
+        )
+
+    app.extensions["willstores"] = WillStoresWS(
+        pool_size=app.config["WILLSTORES_POOL_SIZE"],
+        concurrency=app.config["WILLSTORES_CONCURRENCY"],
+        timeout=app.config["WILLSTORES_TIMEOUT"],
+        retries=app.config["WILLSTORES_RETRIES"],
+        cache=cache
+    )
@@ -17,3 +17,8 @@ class ValidationError(RequestError):
 class SlugDecodeError(RequestError):
     def __init__(self, message):
         super().__init__(message)
+
+
+class CursorDecodeError(RequestError):
+    def __init__(self, message):
+        super().__init__(message)
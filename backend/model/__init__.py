@@ -1,3 +1,4 @@
 from .product import Product
 from .order import Order
 from .order_product import OrderProduct
+from .order_summary import OrderSummary, ItemSummary
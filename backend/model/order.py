@@ -1,40 +1,117 @@
 from datetime import datetime
-from sqlalchemy import Column, BigInteger, DateTime
+from sqlalchemy import Table, Column, BigInteger, Integer, DateTime, Numeric, String, Index, UniqueConstraint, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
-from uuid import uuid4
 
 from ..dao.postgres_db import Base
 from ..util.slug import uuid_to_slug, slug_to_uuid
+from ..util.time_uuid import new_uuid
 
 
-class Order(Base):
-    __tablename__ = "orders"
+# Partitioned tables only enforce uniqueness together with the partition key, so the
+# global uniqueness of order slugs is kept by this lookup table, filled by triggers on orders.
+order_uuids = Table(
+    "order_uuids", Base.metadata,
+    Column("uuid", UUID(as_uuid=True), primary_key=True),
+    Column("order_id", BigInteger, nullable=False),
+    Column("created_at", DateTime, nullable=False)
+)
 
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
-    uuid = Column(UUID(as_uuid=True), unique=True, nullable=False, default=uuid4)
-    user_uuid = Column(UUID(as_uuid=True), nullable=False)
-    created_at = Column(DateTime, default=datetime.now)
-    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
-    items = relationship("OrderProduct", back_populates="order")
 
-    def __init__(self, user_slug: str, uuid: UUID = None) -> None:
-        self.user_uuid: UUID = slug_to_uuid(user_slug)
-        self.uuid: UUID = uuid
+class OrderFields(object):
+    """Order attributes shared by `Order` and the read-only `OrderSummary` rows."""
+
+    __slots__ = ()
 
     @property
     def uuid_slug(self):
         return uuid_to_slug(self.uuid)
 
     @property
-    def user_slug(self):
-        return uuid_to_slug(self.user_uuid)
+    def total(self):
+        if self.total_outlet is None:
+            return None
+
+        return {
+            "outlet": float(self.total_outlet),
+            "retail": float(self.total_retail),
+            "symbol": self.total_symbol
+        }
 
     def to_dict(self) -> dict:
         return {
             "slug": self.uuid_slug,
             "created_at": str(self.created_at),
             "updated_at": str(self.updated_at),
-            "product_types": len(self.items),
-            "items_amount": sum([item.amount for item in self.items])
+            "product_types": self.product_types,
+            "items_amount": self.items_amount
         }
+
+
+class Order(OrderFields, Base):
+    __tablename__ = "orders"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    uuid = Column(UUID(as_uuid=True), nullable=False, default=new_uuid)
+    user_uuid = Column(UUID(as_uuid=True), nullable=False)
+    total_outlet = Column(Numeric(12, 2))
+    total_retail = Column(Numeric(12, 2))
+    total_symbol = Column(String(10))
+    product_types = Column(Integer, nullable=False, default=0, server_default="0")
+    items_amount = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime, primary_key=True, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    items = relationship("OrderProduct", back_populates="order")
+
+    __table_args__ = (
+        UniqueConstraint(uuid, created_at),
+        Index("ix_orders_user_uuid_updated_at_id", user_uuid, updated_at.desc(), id.desc()),
+        {"postgresql_partition_by": "RANGE (created_at)"}
+    )
+
+    def __init__(self, user_slug: str, uuid: UUID = None, total: dict = None) -> None:
+        self.user_uuid: UUID = slug_to_uuid(user_slug)
+        self.uuid: UUID = uuid
+        if total is not None:
+            self.total_outlet = total["outlet"]
+            self.total_retail = total["retail"]
+            self.total_symbol = total["symbol"]
+
+    @property
+    def user_slug(self):
+        return uuid_to_slug(self.user_uuid)
+
+
+ORDER_UUIDS_DDL = """
+CREATE OR REPLACE FUNCTION orders_refresh_uuids() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO order_uuids (uuid, order_id, created_at) SELECT uuid, id, created_at FROM new_orders;
+    ELSIF TG_OP = 'DELETE' THEN
+        DELETE FROM order_uuids WHERE uuid IN (SELECT uuid FROM old_orders);
+    ELSE
+        DELETE FROM order_uuids WHERE (uuid, order_id, created_at) IN (
+            SELECT uuid, id, created_at FROM old_orders EXCEPT SELECT uuid, id, created_at FROM new_orders
+        );
+        INSERT INTO order_uuids (uuid, order_id, created_at)
+            SELECT uuid, id, created_at FROM new_orders EXCEPT SELECT uuid, id, created_at FROM old_orders;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER orders_uuids_insert AFTER INSERT ON orders
+    REFERENCING NEW TABLE AS new_orders
+    FOR EACH STATEMENT EXECUTE PROCEDURE orders_refresh_uuids();
+
+CREATE TRIGGER orders_uuids_update AFTER UPDATE ON orders
+    REFERENCING OLD TABLE AS old_orders NEW TABLE AS new_orders
+    FOR EACH STATEMENT EXECUTE PROCEDURE orders_refresh_uuids();
+
+CREATE TRIGGER orders_uuids_delete AFTER DELETE ON orders
+    REFERENCING OLD TABLE AS old_orders
+    FOR EACH STATEMENT EXECUTE PROCEDURE orders_refresh_uuids();
+"""
+
+event.listen(Order.__table__, "after_create", DDL("CREATE TABLE orders_default PARTITION OF orders DEFAULT").execute_if(dialect="postgresql"))
+event.listen(Order.__table__, "after_create", DDL(ORDER_UUIDS_DDL).execute_if(dialect="postgresql"))
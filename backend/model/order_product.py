@@ -1,4 +1,5 @@
-from sqlalchemy import Column, BigInteger, Integer, ForeignKey
+from datetime import datetime
+from sqlalchemy import Column, BigInteger, Integer, String, Numeric, Float, DateTime, ForeignKey, ForeignKeyConstraint, DDL, event
 from sqlalchemy.orm import relationship, backref
 
 from ..dao.postgres_db import Base
@@ -9,19 +10,109 @@ from .product import Product
 class OrderProduct(Base):
     __tablename__ = "order_product"
 
-    order_id = Column("order_id", BigInteger, ForeignKey("orders.id", onupdate="CASCADE", ondelete="CASCADE"), primary_key=True)
-    product_id = Column("product_id", BigInteger, ForeignKey("products.id", onupdate="CASCADE", ondelete="CASCADE"), primary_key=True)
+    order_id = Column("order_id", BigInteger, primary_key=True)
+    order_created_at = Column("order_created_at", DateTime, primary_key=True)
+    product_id = Column("product_id", BigInteger, ForeignKey("products.id", onupdate="CASCADE", ondelete="CASCADE"), primary_key=True, index=True)
     amount = Column("amount", Integer, nullable=False)
+    name = Column("name", String(255))
+    image = Column("image", String(1000))
+    price_outlet = Column("price_outlet", Numeric(12, 2))
+    price_retail = Column("price_retail", Numeric(12, 2))
+    price_symbol = Column("price_symbol", String(10))
+    discount = Column("discount", Float)
+    snapshot_at = Column("snapshot_at", DateTime)
     order = relationship("Order", backref=backref("order_link"))
     product = relationship("Product", backref=backref("product_link"))
 
-    def __init__(self, order: Order, product: Product, amount: int) -> None:
+    __table_args__ = (
+        ForeignKeyConstraint([order_id, order_created_at], ["orders.id", "orders.created_at"], onupdate="CASCADE", ondelete="CASCADE"),
+        {"postgresql_partition_by": "RANGE (order_created_at)"}
+    )
+
+    def __init__(self, order: Order, product: Product, amount: int, snapshot: dict = None) -> None:
         self.order: Order = order
         self.product: Product = product
         self.amount: int = amount
+        if snapshot is not None:
+            self.set_snapshot(snapshot)
+
+    @property
+    def snapshot(self):
+        if self.snapshot_at is None:
+            return None
+
+        return {
+            "id": self.product.es_id,
+            "name": self.name,
+            "image": self.image,
+            "price": {
+                "outlet": float(self.price_outlet),
+                "retail": float(self.price_retail),
+                "symbol": self.price_symbol
+            },
+            "discount": self.discount
+        }
+
+    def set_snapshot(self, product: dict) -> None:
+        for key, value in self.snapshot_values(product).items():
+            setattr(self, key, value)
+
+    @staticmethod
+    def snapshot_values(product: dict = None) -> dict:
+        if product is None:
+            return dict.fromkeys(["name", "image", "price_outlet", "price_retail", "price_symbol", "discount", "snapshot_at"])
+
+        return {
+            "name": product["name"],
+            "image": product["image"],
+            "price_outlet": product["price"]["outlet"],
+            "price_retail": product["price"]["retail"],
+            "price_symbol": product["price"]["symbol"],
+            "discount": product["discount"],
+            "snapshot_at": datetime.now()
+        }
 
     def to_dict(self) -> dict:
         return {
             "item_id": self.product.es_id,
             "amount": self.amount
         }
+
+
+ITEM_AGGREGATES_DDL = """
+CREATE OR REPLACE FUNCTION order_product_refresh_aggregates() RETURNS trigger AS $$
+BEGIN
+    IF current_setting('willorders.skip_item_aggregates', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'INSERT' OR TG_OP = 'UPDATE' THEN
+        UPDATE orders SET
+            product_types = (SELECT count(*) FROM order_product WHERE order_product.order_id = orders.id),
+            items_amount = (SELECT coalesce(sum(amount), 0) FROM order_product WHERE order_product.order_id = orders.id)
+        WHERE orders.id IN (SELECT DISTINCT order_id FROM new_items);
+    END IF;
+    IF TG_OP = 'DELETE' OR TG_OP = 'UPDATE' THEN
+        UPDATE orders SET
+            product_types = (SELECT count(*) FROM order_product WHERE order_product.order_id = orders.id),
+            items_amount = (SELECT coalesce(sum(amount), 0) FROM order_product WHERE order_product.order_id = orders.id)
+        WHERE orders.id IN (SELECT DISTINCT order_id FROM old_items);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER order_product_aggregates_insert AFTER INSERT ON order_product
+    REFERENCING NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE PROCEDURE order_product_refresh_aggregates();
+
+CREATE TRIGGER order_product_aggregates_update AFTER UPDATE ON order_product
+    REFERENCING OLD TABLE AS old_items NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE PROCEDURE order_product_refresh_aggregates();
+
+CREATE TRIGGER order_product_aggregates_delete AFTER DELETE ON order_product
+    REFERENCING OLD TABLE AS old_items
+    FOR EACH STATEMENT EXECUTE PROCEDURE order_product_refresh_aggregates();
+"""
+
+event.listen(OrderProduct.__table__, "after_create", DDL("CREATE TABLE order_product_default PARTITION OF order_product DEFAULT").execute_if(dialect="postgresql"))
+event.listen(OrderProduct.__table__, "after_create", DDL(ITEM_AGGREGATES_DDL).execute_if(dialect="postgresql"))
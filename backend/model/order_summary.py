@@ -0,0 +1,45 @@
+from datetime import datetime
+from uuid import UUID
+
+from .order import Order, OrderFields
+
+
+class ItemSummary(object):
+    """Read-only order item holding only what the listing sends upstream."""
+
+    __slots__ = ("order_id", "es_id", "amount")
+
+    def __init__(self, order_id: int, es_id: str, amount: int) -> None:
+        self.order_id = order_id
+        self.es_id = es_id
+        self.amount = amount
+
+    def to_dict(self) -> dict:
+        return {
+            "item_id": self.es_id,
+            "amount": self.amount
+        }
+
+
+class OrderSummary(OrderFields):
+    """Read-only order row of the listing, built from plain rows outside the session."""
+
+    __slots__ = ("id", "uuid", "created_at", "updated_at", "product_types", "items_amount", "total_outlet", "total_retail", "total_symbol", "items")
+
+    COLUMNS = [
+        Order.id, Order.uuid, Order.created_at, Order.updated_at, Order.product_types, Order.items_amount,
+        Order.total_outlet, Order.total_retail, Order.total_symbol
+    ]
+
+    def __init__(self, id: int, uuid: UUID, created_at: datetime, updated_at: datetime, product_types: int, items_amount: int,
+                 total_outlet=None, total_retail=None, total_symbol: str = None) -> None:
+        self.id = id
+        self.uuid = uuid
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.product_types = product_types
+        self.items_amount = items_amount
+        self.total_outlet = total_outlet
+        self.total_retail = total_retail
+        self.total_symbol = total_symbol
+        self.items = []
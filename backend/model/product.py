@@ -1,16 +1,16 @@
 from datetime import datetime
 from sqlalchemy import Column, BigInteger, String, DateTime
 from sqlalchemy.dialects.postgresql import UUID
-from uuid import uuid4
 
 from ..dao.postgres_db import Base
+from ..util.time_uuid import new_uuid
 
 
 class Product(Base):
     __tablename__ = "products"
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
-    uuid = Column(UUID(as_uuid=True), unique=True, nullable=False, default=uuid4)
+    uuid = Column(UUID(as_uuid=True), unique=True, nullable=False, default=new_uuid)
     es_id = Column(String(100), unique=True, nullable=False)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
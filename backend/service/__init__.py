@@ -1,2 +1,5 @@
 from .jwt_service import JWTService
 from .order_service import OrderService
+from .order_import_service import OrderImportService
+from .partition_service import PartitionService
+from .shard_service import ShardService
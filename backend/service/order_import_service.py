@@ -0,0 +1,136 @@
+import csv
+import io
+from typing import Iterable, List
+from datetime import datetime
+from marshmallow import ValidationError as MarshmallowError
+from psycopg2 import Error as PsycopgError
+from sqlalchemy import text
+from sqlalchemy.exc import DatabaseError
+
+from backend.dao.postgres_db import DBSession, shard_router
+from backend.service.order_service import OrderService
+from backend.util.slug import slug_to_uuid
+from backend.util.time_uuid import new_uuid
+from backend.util.json_backend import json_backend
+from backend.util.request.order_insert import OrderInsertSchema
+from backend.errors.request_error import RequestError, ValidationError
+
+
+class OrderImportService(object):
+    def __init__(self):
+        self.db_session = DBSession()
+        self.__orderservice = OrderService()
+        self.__schema = OrderInsertSchema()
+
+    def import_orders(self, lines: Iterable[bytes], batch_size: int = 5000) -> dict:
+        report = {
+            "imported": 0,
+            "failed": 0,
+            "errors": []
+        }
+
+        batch = []
+        for line_number, line in enumerate(lines, start=1):
+            if line.strip():
+                batch.append((line_number, line))
+
+            if len(batch) == batch_size:
+                self.__import_batch(batch, report)
+                batch = []
+
+        if batch:
+            self.__import_batch(batch, report)
+
+        return report
+
+    def __import_batch(self, batch: List[tuple], report: dict) -> None:
+        try:
+            records = [(line_number, self.__parse_record(line_number, line)) for line_number, line in batch]
+        except RequestError as error:
+            self.__report_failure(batch, error, report)
+            return
+
+        if not shard_router.enabled:
+            self.__import_records(self.db_session, records, report)
+            return
+
+        shards = {}
+        for line_number, record in records:
+            shards.setdefault(shard_router.shard_for(record["user_uuid"]), []).append((line_number, record))
+
+        for name, shard_records in sorted(shards.items()):
+            self.__import_records(shard_router.session(name), shard_records, report)
+
+    def __import_records(self, session, records: List[tuple], report: dict) -> None:
+        try:
+            self.__copy_orders(session, [record for line_number, record in records])
+            session.commit()
+            report["imported"] += len(records)
+        except (DatabaseError, PsycopgError) as error:
+            session.rollback()
+            pgcode = getattr(getattr(error, "orig", error), "pgcode", None)
+            self.__report_failure(records, "Database error while loading the batch (SQLSTATE %s)." % pgcode, report)
+
+    def __report_failure(self, lines: List[tuple], error, report: dict) -> None:
+        report["failed"] += len(lines)
+        report["errors"].append({
+            "first_line": lines[0][0],
+            "last_line": lines[-1][0],
+            "error": str(error).strip()
+        })
+
+    def __parse_record(self, line_number: int, line: bytes) -> dict:
+        try:
+            record = json_backend.loads(line)
+            if not self.__is_plain_record(record):
+                record = self.__schema.load(record)
+            record["user_uuid"] = slug_to_uuid(record["user_slug"])
+            return record
+        except (ValueError, TypeError, MarshmallowError, RequestError) as error:
+            raise ValidationError("Line %d: %s" % (line_number, str(error)))
+
+    @staticmethod
+    def __is_plain_record(record) -> bool:
+        """Whether the record already is what the schema would load, so loading it can be skipped."""
+
+        if type(record) is not dict or record.keys() != {"user_slug", "item_list"}:
+            return False
+
+        item_list = record["item_list"]
+        if type(record["user_slug"]) is not str or type(item_list) is not list:
+            return False
+
+        for item in item_list:
+            if type(item) is not dict or item.keys() != {"item_id", "amount"}:
+                return False
+            if type(item["item_id"]) is not str or type(item["amount"]) is not int or item["amount"] <= 0:
+                return False
+
+        return len({item["item_id"] for item in item_list}) == len(item_list)
+
+    def __copy_orders(self, session, records: List[dict]) -> None:
+        es_ids = list(dict.fromkeys(item["item_id"] for record in records for item in record["item_list"]))
+        product_ids = self.__orderservice.select_product_ids(es_ids, session)
+        order_ids = [row[0] for row in session.execute(
+            text("SELECT nextval(pg_get_serial_sequence('orders', 'id')) FROM generate_series(1, :amount)"),
+            {"amount": len(records)}
+        )]
+
+        now = datetime.now()
+        orders = io.StringIO()
+        items = io.StringIO()
+        orders_writer = csv.writer(orders)
+        items_writer = csv.writer(items)
+
+        for order_id, record in zip(order_ids, records):
+            item_list = record["item_list"]
+            orders_writer.writerow([order_id, new_uuid(), record["user_uuid"], now, now, len(item_list), sum(item["amount"] for item in item_list)])
+            for item in item_list:
+                items_writer.writerow([order_id, now, product_ids[item["item_id"]], item["amount"]])
+
+        orders.seek(0)
+        items.seek(0)
+        session.execute(text("SET LOCAL willorders.skip_item_aggregates = on"))
+        with session.connection().connection.cursor() as cursor:
+            cursor.copy_expert("COPY orders (id, uuid, user_uuid, created_at, updated_at, product_types, items_amount) FROM STDIN WITH (FORMAT csv)", orders)
+            cursor.copy_expert("COPY order_product (order_id, order_created_at, product_id, amount) FROM STDIN WITH (FORMAT csv)", items)
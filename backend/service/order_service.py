@@ -1,82 +1,274 @@
 from typing import List
 from math import ceil
-from sqlalchemy import and_
+from sqlalchemy import and_, tuple_, func, text
 from sqlalchemy.exc import DataError, DatabaseError
-from datetime import timedelta
+from sqlalchemy.orm import selectinload
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import datetime, timedelta
+from uuid import UUID
 
-from backend.model import Order, Product, OrderProduct
-from backend.dao.postgres_db import DBSession
-from backend.util.slug import slug_to_uuid
+from backend.model import Order, Product, OrderProduct, OrderSummary, ItemSummary
+from backend.dao.postgres_db import DBSession, DBReplicaSession, replica_router, shard_router
+from backend.util.slug import slug_to_uuid, uuid_to_slug
+from backend.util.time_uuid import new_uuid
+from backend.util.cursor import encode_cursor, decode_cursor
 from backend.errors.no_content_error import NoContentError
 from backend.errors.not_found_error import NotFoundError
 
 
+ITEMS_LOADER = selectinload(Order.items).joinedload(OrderProduct.product)
+
+ORDER_DOCUMENT = text("""
+SELECT orders.uuid, orders.created_at, orders.updated_at, items.snapshot_at, json_build_object(
+    'product_types', orders.product_types,
+    'items_amount', orders.items_amount,
+    'total', CASE WHEN orders.total_outlet IS NOT NULL THEN json_build_object(
+        'outlet', orders.total_outlet, 'retail', orders.total_retail, 'symbol', orders.total_symbol
+    ) END,
+    'items', COALESCE(items.items, '[]'::json)
+) AS document
+FROM orders
+LEFT JOIN LATERAL (
+    SELECT min(order_product.snapshot_at) AS snapshot_at, json_agg(json_build_object(
+        'item_id', products.es_id,
+        'amount', order_product.amount,
+        'snapshot', CASE WHEN order_product.snapshot_at IS NOT NULL THEN json_build_object(
+            'id', products.es_id,
+            'name', order_product.name,
+            'image', order_product.image,
+            'price', json_build_object(
+                'outlet', order_product.price_outlet, 'retail', order_product.price_retail, 'symbol', order_product.price_symbol
+            ),
+            'discount', order_product.discount
+        ) END
+    )) AS items
+    FROM order_product
+    JOIN products ON products.id = order_product.product_id
+    WHERE order_product.order_id = orders.id AND order_product.order_created_at = orders.created_at
+) items ON true
+WHERE orders.user_uuid = :user_uuid AND orders.uuid = :uuid
+""")
+
+
 class OrderService(object):
     def __init__(self):
         self.db_session = DBSession()
 
-    def select_by_slug(self, user_slug: str, order_slug: str) -> Order:
+    def select_by_slug(self, user_slug: str, order_slug: str, read_after: str = None) -> Order:
         user_uuid = slug_to_uuid(user_slug)
         uuid = slug_to_uuid(order_slug)
-        result = self.db_session.query(Order).filter(Order.user_uuid == user_uuid).filter(Order.uuid == uuid).one_or_none()
+        return self.__select_order(self.__read_session(user_uuid, read_after), user_uuid, uuid)
+
+    def select_version_by_slug(self, user_slug: str, order_slug: str, read_after: str = None) -> tuple:
+        user_uuid = slug_to_uuid(user_slug)
+        uuid = slug_to_uuid(order_slug)
+        session = self.__read_session(user_uuid, read_after)
+        items = (OrderProduct.order_id == Order.id, OrderProduct.order_created_at == Order.created_at)
+        snapshot_at = session.query(func.max(OrderProduct.snapshot_at)).filter(*items).correlate(Order).as_scalar()
+        live_items = session.query(func.count(OrderProduct.order_id)).filter(*items).filter(OrderProduct.snapshot_at.is_(None)).correlate(Order).as_scalar()
+        result = session.query(Order.updated_at, snapshot_at, live_items, Order.total_outlet).filter(Order.user_uuid == user_uuid).filter(Order.uuid == uuid).one_or_none()
+
+        if result is None:
+            raise NotFoundError()
+
+        updated_at, snapshot_at, live_items, total = result
+        if snapshot_at is None or live_items > 0 or total is None:
+            return None
+
+        return (updated_at, snapshot_at)
+
+    def select_version_by_user_slug(self, user_slug: str, read_after: str = None) -> tuple:
+        user_uuid = slug_to_uuid(user_slug)
+        updated_at, count, live_totals = self.__read_session(user_uuid, read_after).query(
+            func.max(Order.updated_at), func.count(), func.count(Order.id).filter(Order.total_outlet.is_(None))
+        ).filter(Order.user_uuid == user_uuid).one()
+
+        if live_totals > 0:
+            return None
+
+        return (updated_at, count)
+
+    def select_document_by_slug(self, user_slug: str, order_slug: str, read_after: str = None) -> dict:
+        user_uuid = slug_to_uuid(user_slug)
+        uuid = slug_to_uuid(order_slug)
+        row = self.__read_session(user_uuid, read_after).execute(ORDER_DOCUMENT, {"user_uuid": user_uuid, "uuid": uuid}).fetchone()
+
+        if row is None:
+            raise NotFoundError()
+
+        return dict(
+            row.document,
+            slug=uuid_to_slug(row.uuid),
+            created_at=str(row.created_at),
+            updated_at=str(row.updated_at),
+            snapshot_at=row.snapshot_at
+        )
+
+    def __session(self, user_uuid: UUID):
+        if shard_router.enabled:
+            return shard_router.session_for(user_uuid)
+
+        return self.db_session
+
+    def __read_session(self, user_uuid: UUID, read_after: str = None):
+        if shard_router.enabled:
+            return shard_router.session_for(user_uuid)
+
+        if replica_router.enabled:
+            replica_session = DBReplicaSession()
+            if replica_router.can_read(replica_session, read_after):
+                return replica_session
+
+        return self.db_session
+
+    def __select_order(self, session, user_uuid: UUID, uuid: UUID) -> Order:
+        result = session.query(Order).options(ITEMS_LOADER).filter(Order.user_uuid == user_uuid).filter(Order.uuid == uuid).one_or_none()
 
         if result is None:
             raise NotFoundError()
 
         return result
 
-    def select_by_user_slug(self,  user_slug: str, page: int = 1, page_size: int = 10, datespan: dict = None) -> dict:
+    def select_by_user_slug(
+        self, user_slug: str, page: int = 1, page_size: int = 10, datespan: dict = None, cursor: str = None,
+        with_total: bool = True, with_items: bool = False, read_after: str = None
+    ) -> dict:
+        user_uuid = slug_to_uuid(user_slug)
+        session = self.__read_session(user_uuid, read_after)
         try:
-            user_uuid = slug_to_uuid(user_slug)
-            search_query = self.db_session.query(Order).filter(Order.user_uuid == user_uuid)
+            search_query = session.query(*OrderSummary.COLUMNS).filter(Order.user_uuid == user_uuid)
 
             if datespan is not None:
                 search_query = search_query.filter(and_(Order.updated_at >= datespan["start"], Order.updated_at < datespan["end"] + timedelta(days=1)))
 
-            data = search_query.order_by(Order.updated_at.desc()).limit(page_size).offset((page - 1) * page_size).all()
-            total = search_query.order_by(None).count()
-            pages = ceil(total / page_size)
+            if cursor is not None:
+                updated_at, order_id = decode_cursor(cursor)
+                search_query = search_query.filter(tuple_(Order.updated_at, Order.id) < tuple_(updated_at, order_id))
+                page = 1
+                with_total = False
+
+            search_query = search_query.order_by(Order.updated_at.desc(), Order.id.desc())
+
+            if not with_total:
+                data = search_query.limit(page_size + 1).offset((page - 1) * page_size).all()
+
+                if not data:
+                    raise NoContentError()
+
+                orders = [OrderSummary(*row) for row in data[:page_size]]
+                self.__load_items(session, orders, with_items)
+
+                return {
+                    "orders": orders,
+                    "next_cursor": encode_cursor(orders[-1].updated_at, orders[-1].id) if len(data) > page_size else None
+                }
+
+            data = search_query.add_columns(func.count().over()).limit(page_size).offset((page - 1) * page_size).all()
 
             if not data:
                 raise NoContentError()
 
+            orders = [OrderSummary(*row[:-1]) for row in data]
+            self.__load_items(session, orders, with_items)
+
+            total = data[0][-1]
+            pages = ceil(total / page_size)
+
             return {
-                "orders": data,
+                "orders": orders,
                 "total": total,
-                "pages": pages
+                "pages": pages,
+                "next_cursor": encode_cursor(orders[-1].updated_at, orders[-1].id) if page < pages else None
             }
         except DataError:
-            self.db_session.rollback()
+            session.rollback()
             raise
 
-    def insert(self, user_slug: str, item_list: List[dict]) -> bool:
+    def __load_items(self, session, orders: List[OrderSummary], with_items: bool = False) -> None:
+        pending = {order.id: order for order in orders if with_items or order.total is None}
+        if not pending:
+            return
+
+        query = session.query(OrderProduct.order_id, Product.es_id, OrderProduct.amount).join(Product, OrderProduct.product_id == Product.id)
+        for row in query.filter(OrderProduct.order_id.in_(list(pending))).all():
+            pending[row[0]].items.append(ItemSummary(*row))
+
+    def insert(self, user_slug: str, item_list: List[dict], total: dict = None, products: List[dict] = None) -> bool:
+        session = self.__session(slug_to_uuid(user_slug))
         try:
-            order = Order(user_slug=user_slug)
-            self.db_session.add(order)
-            for item in item_list:
-                product = self.db_session.query(Product).filter(Product.es_id == item["item_id"]).one_or_none()
-                if product is None:
-                    product = Product(es_id=item["item_id"])
-                    self.db_session.add(product)
+            snapshots = {product["id"]: product for product in products or []}
+            order = Order(user_slug=user_slug, total=total)
+            order.product_types = len(item_list)
+            order.items_amount = sum(item["amount"] for item in item_list)
+            session.add(order)
+            session.flush()
 
-                OrderProduct(order=order, product=product, amount=item["amount"])
+            if item_list:
+                product_ids = self.select_product_ids([item["item_id"] for item in item_list], session)
+                items = [
+                    dict(
+                        order_id=order.id,
+                        order_created_at=order.created_at,
+                        product_id=product_ids[item["item_id"]],
+                        amount=item["amount"],
+                        **OrderProduct.snapshot_values(snapshots.get(item["item_id"]))
+                    )
+                    for item in item_list
+                ]
+                session.execute(OrderProduct.__table__.insert().values(items))
 
-            self.db_session.commit()
+            session.commit()
             return True
         except DatabaseError:
-            self.db_session.rollback()
+            session.rollback()
+            raise
+
+    def select_product_ids(self, es_ids: List[str], session=None) -> dict:
+        session = session or self.db_session
+        product_ids = dict(session.query(Product.es_id, Product.id).filter(Product.es_id.in_(es_ids)).all())
+        missing = sorted(set(es_ids) - set(product_ids))
+
+        if missing:
+            now = datetime.now()
+            statement = pg_insert(Product.__table__).values(
+                [{"uuid": new_uuid(), "es_id": es_id, "created_at": now, "updated_at": now} for es_id in missing]
+            ).on_conflict_do_nothing(index_elements=["es_id"]).returning(Product.es_id, Product.id)
+            product_ids.update(session.execute(statement).fetchall())
+
+            if not set(missing) <= set(product_ids):
+                product_ids.update(session.query(Product.es_id, Product.id).filter(Product.es_id.in_(missing)).all())
+
+        return product_ids
+
+    def refresh_snapshots(self, user_slug: str, order_slug: str, products: List[dict]) -> bool:
+        user_uuid = slug_to_uuid(user_slug)
+        uuid = slug_to_uuid(order_slug)
+        session = self.__session(user_uuid)
+        try:
+            order = self.__select_order(session, user_uuid, uuid)
+            snapshots = {product["id"]: product for product in products}
+            for item in order.items:
+                snapshot = snapshots.get(item.product.es_id)
+                if snapshot is not None:
+                    item.set_snapshot(snapshot)
+
+            session.commit()
+            return True
+        except DatabaseError:
+            session.rollback()
             raise
 
     def delete(self, user_slug: str, order_slug: str) -> bool:
+        user_uuid = slug_to_uuid(user_slug)
+        uuid = slug_to_uuid(order_slug)
+        session = self.__session(user_uuid)
         try:
-            user_uuid = slug_to_uuid(user_slug)
-            uuid = slug_to_uuid(order_slug)
-            result = self.db_session.query(Order).filter(Order.user_uuid == user_uuid).filter(Order.uuid == uuid).delete()
-            self.db_session.commit()
+            result = session.query(Order).filter(Order.user_uuid == user_uuid).filter(Order.uuid == uuid).delete()
+            session.commit()
             if result == 0:
                 raise NotFoundError()
             else:
                 return True
         except DatabaseError:
-            self.db_session.rollback()
+            session.rollback()
             raise
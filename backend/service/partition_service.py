@@ -0,0 +1,114 @@
+import re
+from typing import List
+from datetime import date
+from sqlalchemy import text
+
+from backend.dao.postgres_db import DBSession
+from backend.model import Order, OrderProduct
+
+
+PARTITIONED_TABLES = ["orders", "order_product"]
+PARTITION_COLUMNS = {"orders": "created_at", "order_product": "order_created_at"}
+TABLE_COLUMNS = {table.name: [column.name for column in table.columns] for table in [Order.__table__, OrderProduct.__table__]}
+
+
+def add_months(month: date, amount: int) -> date:
+    index = month.year * 12 + month.month - 1 + amount
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return "%s_y%04dm%02d" % (table, month.year, month.month)
+
+
+class PartitionService(object):
+    def __init__(self, db_session=None):
+        self.db_session = db_session or DBSession()
+
+    def create_partitions(self, months_ahead: int = 3, start: date = None) -> List[str]:
+        """Create the monthly partitions from the month of `start` on, one month per transaction.
+
+        Rows the DEFAULT partitions already hold for a month are moved into its new
+        partitions, which Postgres would otherwise refuse to create.
+        """
+
+        first_month = (start or date.today()).replace(day=1)
+        created = []
+        for i in range(months_ahead + 1):
+            lower = add_months(first_month, i)
+            try:
+                created += self.__create_month(lower, add_months(lower, 1))
+                self.db_session.commit()
+            except Exception:
+                self.db_session.rollback()
+                raise
+
+        return created
+
+    def detach_partitions(self, retain_months: int, archive_schema: str = None, today: date = None) -> List[str]:
+        cutoff = add_months((today or date.today()).replace(day=1), -retain_months)
+        detached = []
+
+        if archive_schema is not None:
+            self.db_session.execute(text("CREATE SCHEMA IF NOT EXISTS %s" % self.__quote(archive_schema)))
+
+        for table in reversed(PARTITIONED_TABLES):
+            for name in self.__monthly_partitions(table):
+                year, month = re.match(r"^%s_y(\d{4})m(\d{2})$" % table, name).groups()
+                if date(int(year), int(month), 1) >= cutoff:
+                    continue
+
+                self.db_session.execute(text("ALTER TABLE %s DETACH PARTITION %s" % (self.__quote(table), self.__quote(name))))
+                self.__drop_order_references(name)
+                if archive_schema is not None:
+                    self.db_session.execute(text("ALTER TABLE %s SET SCHEMA %s" % (self.__quote(name), self.__quote(archive_schema))))
+
+                detached.append(name)
+
+        self.db_session.commit()
+        return detached
+
+    def __create_month(self, lower: date, upper: date) -> List[str]:
+        missing = [table for table in PARTITIONED_TABLES if self.db_session.execute(
+            text("SELECT to_regclass(:name)"), {"name": partition_name(table, lower)}
+        ).scalar() is None]
+
+        moved = {}
+        for table in reversed(missing):
+            default, column = self.__quote("%s_default" % table), self.__quote(PARTITION_COLUMNS[table])
+            moved[table] = self.__quote("moved_%s" % table)
+            self.db_session.execute(text("LOCK TABLE %s IN ACCESS EXCLUSIVE MODE" % default))
+            condition = "%s >= :lower AND %s < :upper" % (column, column)
+            self.db_session.execute(text(
+                "CREATE TEMPORARY TABLE %s ON COMMIT DROP AS SELECT * FROM %s WHERE %s" % (moved[table], default, condition)
+            ), {"lower": lower, "upper": upper})
+            self.db_session.execute(text("DELETE FROM %s WHERE %s" % (default, condition)), {"lower": lower, "upper": upper})
+
+        for table in missing:
+            name = self.__quote(partition_name(table, lower))
+            columns = ", ".join(self.__quote(column) for column in TABLE_COLUMNS[table])
+            self.db_session.execute(text(
+                "CREATE TABLE %s PARTITION OF %s FOR VALUES FROM ('%s') TO ('%s')" % (name, self.__quote(table), lower, upper)
+            ))
+            self.db_session.execute(text("INSERT INTO %s (%s) SELECT %s FROM %s" % (name, columns, columns, moved[table])))
+
+        return [partition_name(table, lower) for table in missing]
+
+    def __quote(self, name: str) -> str:
+        return self.db_session.get_bind().dialect.identifier_preparer.quote(name)
+
+    def __monthly_partitions(self, table: str) -> List[str]:
+        rows = self.db_session.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = CAST(:table AS regclass) ORDER BY child.relname"
+        ), {"table": table})
+        return [row[0] for row in rows if re.match(r"^%s_y\d{4}m\d{2}$" % table, row[0])]
+
+    def __drop_order_references(self, name: str) -> None:
+        rows = self.db_session.execute(text(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = CAST(:name AS regclass) AND contype = 'f' AND confrelid = CAST('orders' AS regclass)"
+        ), {"name": name})
+        for row in rows.fetchall():
+            self.db_session.execute(text("ALTER TABLE %s DROP CONSTRAINT %s" % (self.__quote(name), self.__quote(row[0]))))
@@ -0,0 +1,103 @@
+from typing import List
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.exc import DatabaseError
+
+from backend.model import Order, Product, OrderProduct
+from backend.dao.postgres_db import shard_router
+from backend.service.order_service import OrderService
+
+
+ORDER_COLUMNS = [column for column in Order.__table__.columns if column.name != "id"]
+ITEM_COLUMNS = [column for column in OrderProduct.__table__.columns if column.name not in ("order_id", "order_created_at", "product_id")]
+
+
+class ShardService(object):
+    """Move users whose orders are not stored on the shard owning them on the hash ring.
+
+    Users are copied to their owner and committed there before being deleted from the
+    source, so a failed run leaves them readable and can simply be repeated: orders
+    already copied by a previous run are replaced on the owner. Orders the owner already
+    received through the new ring are left alone.
+
+    A run can be limited to a source shard, a target shard and a range of user uuids,
+    so a new shard can be filled one user range at a time.
+    """
+
+    def __init__(self):
+        self.__orderservice = OrderService()
+
+    def rebalance(self, source: str = None, target: str = None, start: UUID = None, end: UUID = None, batch_size: int = 500) -> dict:
+        for name in [source, target]:
+            if name is not None and name not in shard_router.names:
+                raise ValueError("Unknown shard: %s" % name)
+
+        moved = {}
+        for name in [source] if source is not None else shard_router.names:
+            session = shard_router.session(name)
+            users_query = session.query(Order.user_uuid).distinct()
+            if start is not None:
+                users_query = users_query.filter(Order.user_uuid >= start)
+            if end is not None:
+                users_query = users_query.filter(Order.user_uuid < end)
+            users = [row[0] for row in users_query.all()]
+            session.commit()
+
+            misplaced = {}
+            for user_uuid in users:
+                owner = shard_router.shard_for(user_uuid)
+                if owner != name and target in (None, owner):
+                    misplaced.setdefault(owner, []).append(user_uuid)
+
+            for owner, target_users in sorted(misplaced.items()):
+                for i in range(0, len(target_users), batch_size):
+                    self.move_users(target_users[i:i + batch_size], name, owner)
+
+                moved[(name, owner)] = len(target_users)
+
+        return moved
+
+    def move_users(self, users: List[UUID], source: str, target: str) -> None:
+        source_session = shard_router.session(source)
+        target_session = shard_router.session(target)
+        try:
+            orders = source_session.execute(select([Order.__table__]).where(Order.user_uuid.in_(users))).fetchall()
+            items = source_session.execute(
+                select([OrderProduct.__table__, Product.es_id]).select_from(OrderProduct.__table__.join(Product.__table__)).where(
+                    OrderProduct.order_id.in_([order.id for order in orders])
+                )
+            ).fetchall() if orders else []
+
+            if orders:
+                target_session.query(Order).filter(Order.user_uuid.in_(users)).filter(
+                    Order.uuid.in_([order.uuid for order in orders])
+                ).delete(synchronize_session=False)
+                inserted = target_session.execute(
+                    Order.__table__.insert().values([{column.name: order[column.name] for column in ORDER_COLUMNS} for order in orders]).returning(Order.uuid, Order.id)
+                ).fetchall()
+                order_ids = {order.id: dict(inserted)[order.uuid] for order in orders}
+
+            if items:
+                product_ids = self.__orderservice.select_product_ids(list({item.es_id for item in items}), target_session)
+                target_session.execute(OrderProduct.__table__.insert().values([
+                    dict(
+                        order_id=order_ids[item.order_id],
+                        order_created_at=item.order_created_at,
+                        product_id=product_ids[item.es_id],
+                        **{column.name: item[column.name] for column in ITEM_COLUMNS}
+                    )
+                    for item in items
+                ]))
+
+            target_session.commit()
+        except DatabaseError:
+            target_session.rollback()
+            source_session.rollback()
+            raise
+
+        try:
+            source_session.query(Order).filter(Order.user_uuid.in_(users)).delete(synchronize_session=False)
+            source_session.commit()
+        except DatabaseError:
+            source_session.rollback()
+            raise
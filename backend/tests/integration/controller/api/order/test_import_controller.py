@@ -0,0 +1,60 @@
+from flask import json
+from uuid import uuid4
+
+from backend.model import Order, Product, OrderProduct
+from backend.util.response.order_import import OrderImportSchema
+from backend.util.response.error import ErrorSchema
+from backend.util.slug import uuid_to_slug
+
+
+def test_import_controller(mocker, token_app, db_perm_session, prod_list):
+    mocker.patch.dict(token_app.config, {"ORDER_IMPORT_BATCH_SIZE": 2})
+    user_slug = uuid_to_slug(uuid4())
+    prod_id_list = [p.meta["id"] for p in prod_list]
+    records = [{"user_slug": user_slug, "item_list": [{"item_id": prod_id, "amount": 2}]} for prod_id in prod_id_list]
+    lines = [json.dumps(record) for record in records]
+    lines.insert(3, "churros")
+
+    with token_app.test_client() as client:
+        response = client.post(
+            "api/order/import",
+            data="\n".join(lines)
+        )
+
+    data = json.loads(response.data)
+    OrderImportSchema().load(data)
+    assert response.status_code == 200
+    assert data["imported"] == 4
+    assert data["failed"] == 2
+    assert data["errors"][0]["first_line"] == 3
+    assert data["errors"][0]["last_line"] == 4
+    assert data["errors"][0]["error"].startswith("Line 4")
+
+    assert len(db_perm_session.query(Order).all()) == 4
+    assert len(db_perm_session.query(Product).all()) == 4
+    assert len(db_perm_session.query(OrderProduct).all()) == 4
+
+    with token_app.test_client() as client:
+        response = client.post(
+            "api/order/user/%s" % user_slug
+        )
+
+    data = json.loads(response.data)
+    assert response.status_code == 200
+    assert data["total"] == 4
+
+    for order in data["orders"]:
+        assert order["product_types"] == 1
+        assert order["items_amount"] == 2
+
+
+def test_import_controller_unauthorized(flask_app):
+    with flask_app.test_client() as client:
+        response = client.post(
+            "api/order/import",
+            data=""
+        )
+
+    data = json.loads(response.data)
+    ErrorSchema().load(data)
+    assert response.status_code == 401
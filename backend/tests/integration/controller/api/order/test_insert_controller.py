@@ -2,6 +2,7 @@ from flask import json
 from uuid import uuid4
 
 from backend.model import Order, Product, OrderProduct
+from backend.dao.postgres_db import DBReplicaSession, replica_router
 from backend.util.response.error import ErrorSchema
 from backend.util.slug import uuid_to_slug
 
@@ -28,6 +29,18 @@ def test_insert_controller(token_app, db_perm_session, prod_list):
     assert len(db_perm_session.query(Product).all()) == 5
     assert len(db_perm_session.query(OrderProduct).all()) == 5
 
+    order = db_perm_session.query(Order).one()
+    assert order.total is not None
+
+    with token_app.test_client() as client:
+        response = client.post(
+            "api/order/user/%s" % user_slug
+        )
+
+    data = json.loads(response.data)
+    assert response.status_code == 200
+    assert data["orders"][0]["total"] == order.total
+
     with token_app.test_client() as client:
         response = client.put(
             "api/order/insert",
@@ -80,3 +93,31 @@ def test_insert_controller_unauthorized(flask_app, prod_list):
     data = json.loads(response.data)
     ErrorSchema().load(data)
     assert response.status_code == 401
+
+
+def test_insert_controller_read_after(token_app, db_perm_session, prod_list):
+    user_slug = uuid_to_slug(uuid4())
+    item_list = [{"item_id": prod_list[0].meta["id"], "amount": 2}]
+
+    replica_router.configure(enabled=True, window=60)
+    try:
+        with token_app.test_client() as client:
+            response = client.put(
+                "api/order/insert",
+                json={"user_slug": user_slug, "item_list": item_list}
+            )
+
+            assert response.status_code == 201
+            read_after = response.headers["X-Read-After"]
+            assert replica_router.can_read(DBReplicaSession(), read_after) is False
+
+            order = db_perm_session.query(Order).one()
+            response = client.get(
+                "api/order/%s/%s" % (user_slug, order.uuid_slug)
+            )
+
+            assert response.status_code == 200
+            assert json.loads(response.data)["slug"] == order.uuid_slug
+    finally:
+        replica_router.configure(enabled=False)
+        DBReplicaSession.remove()
@@ -1,7 +1,12 @@
 import pytest
+import time
 from flask import json
 from uuid import uuid4
+from sqlalchemy import func
 
+from backend.dao.willstores_ws import WillStoresWS
+from backend.dao.product_cache import ProductCache
+from backend.model import Order, OrderProduct
 from backend.tests.factories import OrderFactory, ProductFactory, OrderProductFactory
 from backend.util.response.order import OrderSchema
 from backend.util.response.error import ErrorSchema
@@ -67,6 +72,153 @@ def test_select_by_slug_controller(token_app, db_perm_session, prod_list):
     assert response.status_code == 404
 
 
+def test_select_by_slug_controller_product_cache(mocker, token_app, db_perm_session, prod_list):
+    user_slug = uuid_to_slug(uuid4())
+    obj = OrderFactory.create(user_slug=user_slug)
+    db_perm_session.commit()
+
+    order_slug = obj.uuid_slug
+    prod_id_list = [p.meta["id"] for p in prod_list]
+
+    amount = 1
+    for es_id in prod_id_list:
+        product = ProductFactory.create(es_id=es_id)
+        OrderProductFactory.create(order=obj, product=product, amount=amount)
+        amount += 1
+
+    db_perm_session.commit()
+
+    with token_app.test_client() as client:
+        response = client.get(
+            "api/order/%s/%s" % (user_slug, order_slug)
+        )
+
+    expected = json.loads(response.data)
+
+    client_ws = WillStoresWS(cache=ProductCache())
+    mocker.patch.dict(token_app.extensions, {"willstores": client_ws})
+
+    for i in range(2):
+        with token_app.test_client() as client:
+            response = client.get(
+                "api/order/%s/%s" % (user_slug, order_slug)
+            )
+
+        data = json.loads(response.data)
+        OrderSchema().load(data)
+        assert response.status_code == 200
+        assert data == expected
+
+    stats = client_ws.cache.stats()
+    assert stats["entries"] == len(prod_list)
+    assert stats["hits"] == len(prod_list)
+    assert stats["misses"] == len(prod_list)
+
+
+def test_select_by_slug_controller_snapshots(mocker, token_app, db_perm_session, prod_list):
+    mocker.patch.dict(token_app.config, {"ORDER_SNAPSHOTS": True})
+    user_slug = uuid_to_slug(uuid4())
+    item_list = [{"item_id": p.meta["id"], "amount": 2} for p in prod_list]
+
+    with token_app.test_client() as client:
+        response = client.put(
+            "api/order/insert",
+            json={"user_slug": user_slug, "item_list": item_list}
+        )
+
+    assert response.status_code == 201
+
+    order = db_perm_session.query(Order).one()
+    assert all(item.snapshot is not None for item in order.items)
+
+    with token_app.test_client() as client:
+        response = client.get(
+            "api/order/%s/%s" % (user_slug, order.uuid_slug)
+        )
+
+    expected = json.loads(response.data)
+    assert response.status_code == 200
+
+    willstores_ws = token_app.config["WILLSTORES_WS"]
+    mocker.patch.dict(token_app.config, {"WILLSTORES_WS": "http://127.0.0.1:1"})
+
+    with token_app.test_client() as client:
+        response = client.get(
+            "api/order/%s/%s" % (user_slug, order.uuid_slug)
+        )
+
+    data = json.loads(response.data)
+    OrderSchema().load(data)
+    assert response.status_code == 200
+    assert data == expected
+
+    snapshot_at = db_perm_session.query(OrderProduct.snapshot_at).first()[0]
+    mocker.patch.dict(token_app.config, {"WILLSTORES_WS": willstores_ws, "ORDER_SNAPSHOT_TTL": 0.001})
+
+    with token_app.test_client() as client:
+        response = client.get(
+            "api/order/%s/%s" % (user_slug, order.uuid_slug)
+        )
+
+    assert response.status_code == 200
+    assert json.loads(response.data) == expected
+
+    for i in range(50):
+        db_perm_session.rollback()
+        refreshed = [row[0] for row in db_perm_session.query(OrderProduct.snapshot_at).all()]
+        if all(refreshed_at > snapshot_at for refreshed_at in refreshed):
+            break
+        time.sleep(0.1)
+
+    assert all(refreshed_at > snapshot_at for refreshed_at in refreshed)
+
+
+def test_select_by_slug_controller_not_modified(mocker, token_app, db_perm_session, prod_list):
+    mocker.patch.dict(token_app.config, {"ORDER_SNAPSHOTS": True, "ORDER_SNAPSHOT_TTL": 0})
+    user_slug = uuid_to_slug(uuid4())
+
+    with token_app.test_client() as client:
+        response = client.put(
+            "api/order/insert",
+            json={"user_slug": user_slug, "item_list": [{"item_id": p.meta["id"], "amount": 1} for p in prod_list]}
+        )
+
+    order = db_perm_session.query(Order).one()
+    url = "api/order/%s/%s" % (user_slug, order.uuid_slug)
+
+    with token_app.test_client() as client:
+        response = client.get(url)
+
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+
+    mocker.patch.dict(token_app.config, {"WILLSTORES_WS": "http://127.0.0.1:1"})
+
+    with token_app.test_client() as client:
+        response = client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+
+    with token_app.test_client() as client:
+        response = client.get(url, headers={"If-Modified-Since": last_modified})
+
+    assert response.status_code == 304
+
+    db_perm_session.query(OrderProduct).update({OrderProduct.amount: 2}, synchronize_session=False)
+    db_perm_session.query(Order).update({Order.updated_at: func.now()}, synchronize_session=False)
+    db_perm_session.commit()
+
+    with token_app.test_client() as client:
+        response = client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert all(product["amount"] == 2 for product in json.loads(response.data)["products"])
+
+
 def test_select_by_slug_controller_unauthorized(flask_app):
     with flask_app.test_client() as client:
         response = client.get(
@@ -1,4 +1,5 @@
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from flask import json
 from uuid import uuid4
 from datetime import date, timedelta
@@ -102,6 +103,247 @@ def test_select_by_user_controller(token_app, db_perm_session, prod_list):
     assert response.status_code == 204
 
 
+def test_select_by_user_controller_threads(token_app, db_perm_session, prod_list):
+    product_list = [ProductFactory.create(es_id=p.meta["id"]) for p in prod_list]
+    user_slugs = [uuid_to_slug(uuid4()) for i in range(8)]
+    for amount, user_slug in enumerate(user_slugs, start=1):
+        for obj in OrderFactory.create_batch(2, user_slug=user_slug):
+            OrderProductFactory.create(order=obj, product=product_list[0], amount=amount)
+
+    db_perm_session.commit()
+
+    def select_orders(user_slug):
+        with token_app.test_client() as client:
+            response = client.post("api/order/user/%s" % user_slug)
+            return response.status_code, [order["items_amount"] for order in json.loads(response.data)["orders"]]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(select_orders, user_slugs * 2))
+
+    assert results == [(200, [amount, amount]) for amount in range(1, 9)] * 2
+
+
+def test_select_by_user_controller_batch_totals(mocker, token_app, db_perm_session, prod_list):
+    user_slug = uuid_to_slug(uuid4())
+    prod_id_list = [p.meta["id"] for p in prod_list]
+    product_list = [ProductFactory.create(es_id=es_id) for es_id in prod_id_list]
+    db_perm_session.commit()
+
+    obj_list = OrderFactory.create_batch(2, user_slug=user_slug)
+
+    for product in product_list:
+        OrderProductFactory.create(order=obj_list[0], product=product, amount=2)
+
+    for product in product_list[0:3]:
+        OrderProductFactory.create(order=obj_list[1], product=product, amount=5)
+
+    db_perm_session.commit()
+
+    with token_app.test_client() as client:
+        response = client.post(
+            "api/order/user/%s" % user_slug
+        )
+
+    expected = json.loads(response.data)
+
+    mocker.patch.dict(token_app.config, {"WILLSTORES_BATCH_TOTALS": True})
+
+    with token_app.test_client() as client:
+        response = client.post(
+            "api/order/user/%s" % user_slug
+        )
+
+    data = json.loads(response.data)
+    UserOrdersSchema().load(data)
+    assert response.status_code == 200
+    assert data == expected
+
+
+def test_select_by_user_controller_cursor(token_app, db_perm_session, prod_list):
+    user_slug = uuid_to_slug(uuid4())
+    product = ProductFactory.create(es_id=prod_list[0].meta["id"])
+    obj_list = OrderFactory.create_batch(5, user_slug=user_slug)
+
+    for order in obj_list:
+        OrderProductFactory.create(order=order, product=product, amount=2)
+
+    db_perm_session.commit()
+
+    with token_app.test_client() as client:
+        response = client.post(
+            "api/order/user/%s" % user_slug,
+            json={"page_size": 5}
+        )
+
+    expected = json.loads(response.data)["orders"]
+
+    with token_app.test_client() as client:
+        response = client.post(
+            "api/order/user/%s" % user_slug,
+            json={"page_size": 2}
+        )
+
+    data = json.loads(response.data)
+    UserOrdersSchema().load(data)
+    assert response.status_code == 200
+    assert data["total"] == 5
+    orders = data["orders"]
+
+    while data["next_cursor"] is not None:
+        with token_app.test_client() as client:
+            response = client.post(
+                "api/order/user/%s" % user_slug,
+                json={"page_size": 2, "cursor": data["next_cursor"]}
+            )
+
+        data = json.loads(response.data)
+        UserOrdersSchema().load(data)
+        assert response.status_code == 200
+        assert "total" not in data
+        orders += data["orders"]
+
+    assert orders == expected
+
+    with token_app.test_client() as client:
+        response = client.post(
+            "api/order/user/%s" % user_slug,
+            json={"page_size": 5, "with_total": False}
+        )
+
+    data = json.loads(response.data)
+    UserOrdersSchema().load(data)
+    assert response.status_code == 200
+    assert data == {"orders": expected, "next_cursor": None}
+
+
+def test_select_by_user_controller_not_modified(token_app, db_perm_session, prod_list):
+    user_slug = uuid_to_slug(uuid4())
+    product = ProductFactory.create(es_id=prod_list[0].meta["id"])
+    obj_list = OrderFactory.create_batch(2, user_slug=user_slug, total={"outlet": 10.55, "retail": 20.9, "symbol": "£"})
+
+    for order in obj_list:
+        OrderProductFactory.create(order=order, product=product, amount=2)
+
+    db_perm_session.commit()
+
+    with token_app.test_client() as client:
+        response = client.post(
+            "api/order/user/%s" % user_slug,
+            json={"page_size": 5}
+        )
+
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    with token_app.test_client() as client:
+        response = client.post(
+            "api/order/user/%s" % user_slug,
+            json={"page_size": 5},
+            headers={"If-None-Match": etag}
+        )
+
+    assert response.status_code == 304
+
+    with token_app.test_client() as client:
+        response = client.post(
+            "api/order/user/%s" % user_slug,
+            json={"page_size": 1},
+            headers={"If-None-Match": etag}
+        )
+
+    assert response.status_code == 200
+
+    OrderFactory.create(user_slug=user_slug, total={"outlet": 1.5, "retail": 3, "symbol": "£"})
+    db_perm_session.commit()
+
+    with token_app.test_client() as client:
+        response = client.post(
+            "api/order/user/%s" % user_slug,
+            json={"page_size": 5},
+            headers={"If-None-Match": etag}
+        )
+
+    assert response.status_code == 200
+    assert len(json.loads(response.data)["orders"]) == 3
+
+    with token_app.test_client() as client:
+        response = client.post(
+            "api/order/user/%s" % user_slug,
+            json={"page_size": 5, "live_price": True},
+            headers={"If-None-Match": response.headers["ETag"]}
+        )
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+
+def test_select_by_user_controller_get(token_app, db_perm_session, prod_list):
+    user_slug = uuid_to_slug(uuid4())
+    product = ProductFactory.create(es_id=prod_list[0].meta["id"])
+    obj_list = OrderFactory.create_batch(3, user_slug=user_slug, total={"outlet": 10.55, "retail": 20.9, "symbol": "£"})
+
+    for order in obj_list:
+        OrderProductFactory.create(order=order, product=product, amount=2)
+
+    db_perm_session.commit()
+
+    datenow = date.today()
+    query_string = {"page_size": 2, "start": str(datenow - timedelta(days=1)), "end": str(datenow + timedelta(days=1))}
+
+    with token_app.test_client() as client:
+        response = client.post(
+            "api/order/user/%s" % user_slug,
+            json={"page_size": 2, "datespan": {"start": query_string["start"], "end": query_string["end"]}}
+        )
+
+    expected = json.loads(response.data)
+
+    with token_app.test_client() as client:
+        response = client.get(
+            "api/order/user/%s" % user_slug,
+            query_string=query_string
+        )
+
+    data = json.loads(response.data)
+    UserOrdersSchema().load(data)
+    assert response.status_code == 200
+    assert data == expected
+    assert data["total"] == 3
+    assert response.headers["Cache-Control"] == "public, no-cache"
+    assert "Authorization" in response.headers["Vary"]
+
+    with token_app.test_client() as client:
+        response = client.get(
+            "api/order/user/%s" % user_slug,
+            query_string=dict(query_string, cursor=data["next_cursor"], with_total="false", page_size=2)
+        )
+
+    data = json.loads(response.data)
+    assert response.status_code == 200
+    assert len(data["orders"]) == 1
+    assert "total" not in data
+
+    with token_app.test_client() as client:
+        response = client.get(
+            "api/order/user/%s" % user_slug,
+            query_string=query_string,
+            headers={"If-None-Match": response.headers["ETag"]}
+        )
+
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    with token_app.test_client() as client:
+        response = client.get(
+            "api/order/user/%s" % user_slug,
+            query_string=query_string,
+            headers={"If-None-Match": etag}
+        )
+
+    assert response.status_code == 304
+    assert response.headers["Cache-Control"] == "public, no-cache"
+
+
 def test_select_by_user_controller_not_registered(token_app, db_perm_session):
     user_slug = uuid_to_slug(uuid4())
     bad_obj_list = OrderFactory.create_batch(4, user_slug=user_slug)
@@ -132,3 +374,13 @@ def test_select_by_user_controller_unauthorized(flask_app):
     data = json.loads(response.data)
     ErrorSchema().load(data)
     assert response.status_code == 401
+
+    with flask_app.test_client() as client:
+        response = client.get(
+            "api/order/user/WILLrogerPEREIRAslugBR",
+        )
+
+    data = json.loads(response.data)
+    ErrorSchema().load(data)
+    assert response.status_code == 401
+    assert "Cache-Control" not in response.headers
@@ -0,0 +1,32 @@
+from flask import json
+
+from backend.util.response.database_pool_stats import DatabasePoolStatsSchema
+from backend.util.response.error import ErrorSchema
+
+
+def test_database_pool_controller(token_app):
+    with token_app.test_client() as client:
+        client.post("api/order/user/WILLrogerPEREIRAslugBR")
+        response = client.get(
+            "api/stats/database-pool"
+        )
+
+    data = json.loads(response.data)
+    DatabasePoolStatsSchema().load(data)
+    assert response.status_code == 200
+
+    primary = next(pool for pool in data["pools"] if pool["name"] == "primary")
+    assert primary["size"] == token_app.config["DATABASE_POOL_SIZE"]
+    assert primary["checkouts"] >= 1
+    assert primary["connects"] >= 1
+
+
+def test_database_pool_controller_unauthorized(flask_app):
+    with flask_app.test_client() as client:
+        response = client.get(
+            "api/stats/database-pool"
+        )
+
+    data = json.loads(response.data)
+    ErrorSchema().load(data)
+    assert response.status_code == 401
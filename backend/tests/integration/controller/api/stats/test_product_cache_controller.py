@@ -0,0 +1,40 @@
+from flask import json
+
+from backend.dao.willstores_ws import WillStoresWS
+from backend.dao.product_cache import ProductCache
+from backend.util.response.product_cache_stats import ProductCacheStatsSchema
+from backend.util.response.error import ErrorSchema
+
+
+def test_product_cache_controller(mocker, token_app):
+    with token_app.test_client() as client:
+        response = client.get(
+            "api/stats/product-cache"
+        )
+
+    data = json.loads(response.data)
+    assert data == {}
+    assert response.status_code == 404
+
+    mocker.patch.dict(token_app.extensions, {"willstores": WillStoresWS(cache=ProductCache())})
+
+    with token_app.test_client() as client:
+        response = client.get(
+            "api/stats/product-cache"
+        )
+
+    data = json.loads(response.data)
+    ProductCacheStatsSchema().load(data)
+    assert response.status_code == 200
+    assert data["entries"] == 0
+
+
+def test_product_cache_controller_unauthorized(flask_app):
+    with flask_app.test_client() as client:
+        response = client.get(
+            "api/stats/product-cache"
+        )
+
+    data = json.loads(response.data)
+    ErrorSchema().load(data)
+    assert response.status_code == 401
@@ -12,7 +12,7 @@ def token_app(flask_app, jwt_test_token):
             super(FlaskTokenClient, self).__init__(*args, **kwargs)
 
         def open(self, *args, **kwargs):
-            headers = kwargs.pop("headers", Headers())
+            headers = Headers(kwargs.pop("headers", {}))
             headers.extend(Headers({"Authorization": "Bearer %s" % jwt_test_token}))
             kwargs["headers"] = headers
             return super().open(*args, **kwargs)
@@ -0,0 +1,88 @@
+import pytest
+from flask import json
+from uuid import uuid4
+
+from backend.service import OrderImportService
+from backend.model import Order, Product, OrderProduct
+from backend.tests.factories import ProductFactory
+from backend.util.slug import uuid_to_slug
+
+
+@pytest.fixture(scope="function", autouse=True)
+def factory_session(db_perm_session):
+    ProductFactory._meta.sqlalchemy_session = db_perm_session
+
+
+@pytest.fixture(scope="session")
+def service():
+    service = OrderImportService()
+    return service
+
+
+def test_order_import_service(service, db_perm_session):
+    product_list = ProductFactory.create_batch(3)
+    db_perm_session.commit()
+
+    es_ids = [p.es_id for p in product_list] + [str(uuid4()) for i in range(2)]
+    user_slug = uuid_to_slug(uuid4())
+    lines = [
+        json.dumps({"user_slug": user_slug, "item_list": [{"item_id": es_id, "amount": amount} for amount, es_id in enumerate(es_ids[i:], start=1)]}).encode("utf-8")
+        for i in range(5)
+    ]
+
+    report = service.import_orders(lines, batch_size=2)
+
+    assert report == {"imported": 5, "failed": 0, "errors": []}
+    assert len(db_perm_session.query(Product).all()) == 5
+    assert len(db_perm_session.query(OrderProduct).all()) == 15
+
+    orders = db_perm_session.query(Order).order_by(Order.product_types.desc()).all()
+    assert [order.product_types for order in orders] == [5, 4, 3, 2, 1]
+    assert [order.items_amount for order in orders] == [15, 10, 6, 3, 1]
+    assert all(order.user_slug == user_slug for order in orders)
+    assert all(order.total is None for order in orders)
+
+
+def test_order_import_service_errors(service, db_perm_session):
+    user_slug = uuid_to_slug(uuid4())
+    valid = json.dumps({"user_slug": user_slug, "item_list": [{"item_id": "id", "amount": 1}]}).encode("utf-8")
+    lines = [
+        valid,
+        b"{\"user_slug\": \"churros\", \"item_list\": [{\"item_id\": \"id\", \"amount\": 1}]}",
+        b"",
+        valid,
+        valid,
+        b"{\"user_slug\": \"WILLrogerPEREIRAslugBR\"}",
+        valid,
+        b"\xff",
+        valid,
+        valid,
+        json.dumps({"user_slug": user_slug, "item_list": [{"item_id": "id", "amount": 2147483648}]}).encode("utf-8")
+    ]
+
+    report = service.import_orders(lines, batch_size=2)
+
+    assert report["imported"] == 2
+    assert report["failed"] == 8
+    assert [(error["first_line"], error["last_line"]) for error in report["errors"]] == [(1, 2), (6, 7), (8, 9), (10, 11)]
+    assert report["errors"][0]["error"].startswith("Line 2")
+    assert report["errors"][1]["error"].startswith("Line 6")
+    assert report["errors"][2]["error"].startswith("Line 8")
+    assert report["errors"][3]["error"] == "Database error while loading the batch (SQLSTATE 22003)."
+    assert len(db_perm_session.query(Order).all()) == 2
+    assert len(db_perm_session.query(OrderProduct).all()) == 2
+
+
+def test_order_import_service_schema_fallback(service, db_perm_session):
+    user_slug = uuid_to_slug(uuid4())
+    lines = [
+        json.dumps({"user_slug": user_slug, "item_list": [{"item_id": "id", "amount": "2"}]}).encode("utf-8"),
+        json.dumps({"user_slug": user_slug, "item_list": [{"item_id": "id", "amount": 3}]}).encode("utf-8"),
+        json.dumps({"user_slug": user_slug, "item_list": [{"item_id": "id", "amount": 1}, {"item_id": "id", "amount": 1}]}).encode("utf-8")
+    ]
+
+    report = service.import_orders(lines, batch_size=2)
+
+    assert report["imported"] == 2
+    assert report["errors"] == [{"first_line": 3, "last_line": 3, "error": "Line 3: item_list must have unique item_id values"}]
+    assert sorted(order.items_amount for order in db_perm_session.query(Order).all()) == [2, 3]
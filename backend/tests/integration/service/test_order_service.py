@@ -1,10 +1,13 @@
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
+from sqlalchemy import event
 from sqlalchemy.exc import DataError
 from uuid import uuid4
 
 from backend.service import OrderService
-from backend.model import Order, Product, OrderProduct
+from backend.dao.postgres_db import DBSession, DBReplicaSession, replica_router
+from backend.model import Order, Product, OrderProduct, OrderSummary
 from backend.tests.factories import OrderFactory, ProductFactory
 from backend.errors.no_content_error import NoContentError
 from backend.errors.not_found_error import NotFoundError
@@ -44,6 +47,74 @@ def test_order_service_select_by_slug(service, db_perm_session):
         service.select_by_slug(user_slug=user_slug, order_slug=order_slug)
 
 
+def test_order_service_select_document_by_slug(service, db_perm_session):
+    user_slug = uuid_to_slug(uuid4())
+    products = ProductFactory.create_batch(2)
+    snapshot = {"id": products[0].es_id, "name": "name", "image": "image", "price": {"outlet": 10.55, "retail": 20.9, "symbol": "£"}, "discount": 49.52}
+    obj = OrderFactory.create(user_slug=user_slug, total={"outlet": 21.1, "retail": 41.8, "symbol": "£"})
+    OrderProduct(order=obj, product=products[0], amount=2, snapshot=snapshot)
+    OrderProduct(order=obj, product=products[1], amount=3)
+    empty = OrderFactory.create(user_slug=user_slug)
+    db_perm_session.commit()
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = service.db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        result = service.select_document_by_slug(user_slug=user_slug, order_slug=obj.uuid_slug)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    assert len(statements) == 1
+    assert result.pop("snapshot_at") == obj.items[0].snapshot_at
+    assert sorted(result.pop("items"), key=lambda item: item["amount"]) == [
+        {"item_id": products[0].es_id, "amount": 2, "snapshot": snapshot},
+        {"item_id": products[1].es_id, "amount": 3, "snapshot": None}
+    ]
+    assert result == dict(obj.to_dict(), total=obj.total)
+
+    result = service.select_document_by_slug(user_slug=user_slug, order_slug=empty.uuid_slug)
+    assert (result["items"], result["snapshot_at"], result["total"], result["product_types"]) == ([], None, None, 0)
+
+    with pytest.raises(NotFoundError):
+        service.select_document_by_slug(user_slug=uuid_to_slug(uuid4()), order_slug=obj.uuid_slug)
+
+
+def test_order_service_select_version(service, db_perm_session):
+    user_slug = uuid_to_slug(uuid4())
+    assert service.select_version_by_user_slug(user_slug=user_slug) == (None, 0)
+
+    with pytest.raises(NotFoundError):
+        service.select_version_by_slug(user_slug=user_slug, order_slug=uuid_to_slug(uuid4()))
+
+    products = ProductFactory.create_batch(2)
+    snapshot = {"id": products[0].es_id, "name": "name", "image": "image", "price": {"outlet": 10.55, "retail": 20.9, "symbol": "£"}, "discount": 49.52}
+    total = {"outlet": 10.55, "retail": 20.9, "symbol": "£"}
+    obj = OrderFactory.create(user_slug=user_slug, total=total)
+    OrderProduct(order=obj, product=products[0], amount=1, snapshot=snapshot)
+    live = OrderFactory.create(user_slug=user_slug, total=total)
+    OrderProduct(order=live, product=products[0], amount=1, snapshot=snapshot)
+    OrderProduct(order=live, product=products[1], amount=1)
+    empty = OrderFactory.create(user_slug=user_slug, total=total)
+    db_perm_session.commit()
+
+    assert service.select_version_by_slug(user_slug=user_slug, order_slug=obj.uuid_slug) == (obj.updated_at, obj.items[0].snapshot_at)
+    assert service.select_version_by_slug(user_slug=user_slug, order_slug=live.uuid_slug) is None
+    assert service.select_version_by_slug(user_slug=user_slug, order_slug=empty.uuid_slug) is None
+    assert service.select_version_by_user_slug(user_slug=user_slug) == (max(obj.updated_at, live.updated_at, empty.updated_at), 3)
+
+    unpriced = OrderFactory.create(user_slug=user_slug)
+    OrderProduct(order=unpriced, product=products[0], amount=1, snapshot=snapshot)
+    db_perm_session.commit()
+
+    assert service.select_version_by_slug(user_slug=user_slug, order_slug=unpriced.uuid_slug) is None
+    assert service.select_version_by_user_slug(user_slug=user_slug) is None
+
+
 def test_order_service_select_by_user_slug(service, db_perm_session):
     user_slug = uuid_to_slug(uuid4())
 
@@ -55,7 +126,7 @@ def test_order_service_select_by_user_slug(service, db_perm_session):
 
     result = service.select_by_user_slug(user_slug=user_slug)
     assert len(result["orders"]) == 5
-    assert type(result["orders"][0]) is Order
+    assert type(result["orders"][0]) is OrderSummary
     assert result["total"] == 5
     assert result["pages"] == 1
 
@@ -64,7 +135,7 @@ def test_order_service_select_by_user_slug(service, db_perm_session):
     spanend = datenow + timedelta(days=1)
     result = service.select_by_user_slug(user_slug=user_slug, datespan={"start": spanstart, "end": spanend})
     assert len(result["orders"]) == 5
-    assert type(result["orders"][0]) is Order
+    assert type(result["orders"][0]) is OrderSummary
     assert result["total"] == 5
     assert result["pages"] == 1
 
@@ -86,7 +157,7 @@ def test_order_service_select_by_user_slug_pages(service, db_perm_session):
 
     assert result is not None
     assert len(result["orders"]) == 10
-    assert type(result["orders"][0]) is Order
+    assert type(result["orders"][0]) is OrderSummary
     assert result["total"] == 22
     assert result["pages"] == 3
 
@@ -94,20 +165,104 @@ def test_order_service_select_by_user_slug_pages(service, db_perm_session):
 
     assert result is not None
     assert len(result["orders"]) == 2
-    assert type(result["orders"][0]) is Order
+    assert type(result["orders"][0]) is OrderSummary
     assert result["total"] == 22
     assert result["pages"] == 5
 
     with pytest.raises(NoContentError):
         service.select_by_user_slug(user_slug=user_slug, page=6, page_size=5)
 
-    with pytest.raises(ZeroDivisionError):
+    with pytest.raises(NoContentError):
         service.select_by_user_slug(user_slug=user_slug, page=1, page_size=0)
 
+    result = service.select_by_user_slug(user_slug=user_slug, page=5, page_size=5, with_total=False)
+
+    assert len(result["orders"]) == 2
+    assert "total" not in result
+    assert "pages" not in result
+    assert result["next_cursor"] is None
+
     with pytest.raises(DataError):
         service.select_by_user_slug(user_slug=user_slug, page=0, page_size=5)
 
 
+def test_order_service_select_by_user_slug_cursor(service, db_perm_session):
+    user_slug = uuid_to_slug(uuid4())
+    orders = OrderFactory.create_batch(22, user_slug=user_slug)
+    db_perm_session.commit()
+
+    for order in orders[5:10]:
+        order.updated_at = orders[4].updated_at
+
+    db_perm_session.commit()
+
+    expected = [order.id for order in sorted(orders, key=lambda order: (order.updated_at, order.id), reverse=True)]
+
+    result = service.select_by_user_slug(user_slug=user_slug, page_size=5)
+    order_ids = [order.id for order in result["orders"]]
+
+    while result["next_cursor"] is not None:
+        result = service.select_by_user_slug(user_slug=user_slug, page_size=5, cursor=result["next_cursor"])
+        assert "total" not in result
+        assert len(result["orders"]) <= 5
+        order_ids += [order.id for order in result["orders"]]
+
+    assert order_ids == expected
+
+    result = service.select_by_user_slug(user_slug=user_slug, page=4, page_size=5)
+    assert [order.id for order in result["orders"]] == expected[15:20]
+    assert [order.id for order in service.select_by_user_slug(user_slug=user_slug, page_size=5, cursor=result["next_cursor"])["orders"]] == expected[20:]
+
+
+def test_order_service_select_query_count(service, db_perm_session):
+    user_slug = uuid_to_slug(uuid4())
+    products = ProductFactory.create_batch(3)
+    for order in OrderFactory.create_batch(20, user_slug=user_slug):
+        for product in products:
+            OrderProduct(order=order, product=product, amount=2)
+
+    priced_slug = uuid_to_slug(uuid4())
+    total = {"outlet": 10.55, "retail": 20.9, "symbol": "£"}
+    for order in OrderFactory.create_batch(5, user_slug=priced_slug, total=total):
+        for product in products:
+            OrderProduct(order=order, product=product, amount=2)
+
+    db_perm_session.commit()
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def count_queries(select, read_items=True, **kwargs):
+        service.db_session.expunge_all()
+        statements.clear()
+        result = select(**kwargs)
+        for order in result["orders"] if isinstance(result, dict) else [result]:
+            assert order.to_dict()["product_types"] == 3
+            assert order.to_dict()["items_amount"] == 6
+            if read_items:
+                [item.to_dict() for item in order.items]
+
+        return len(statements)
+
+    engine = service.db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        small_page = count_queries(service.select_by_user_slug, user_slug=user_slug, page_size=2, with_items=True)
+        large_page = count_queries(service.select_by_user_slug, user_slug=user_slug, page_size=20, with_items=True)
+        assert small_page == large_page == 2
+        assert count_queries(service.select_by_user_slug, user_slug=user_slug, page_size=20, with_total=False, with_items=True) == 2
+        assert count_queries(service.select_by_user_slug, user_slug=user_slug, page_size=20) == 2
+        assert count_queries(service.select_by_user_slug, user_slug=user_slug, page_size=20, with_total=False) == 2
+        assert count_queries(service.select_by_user_slug, read_items=False, user_slug=priced_slug, page_size=20) == 1
+
+        order = db_perm_session.query(Order).first()
+        assert count_queries(service.select_by_slug, user_slug=user_slug, order_slug=order.uuid_slug) == 2
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+
 def test_order_service_insert(service, db_perm_session):
     user_slug = uuid_to_slug(uuid4())
 
@@ -121,6 +276,8 @@ def test_order_service_insert(service, db_perm_session):
     assert len(db_perm_session.query(Order).all()) == 1
     assert len(db_perm_session.query(Product).all()) == 2
     assert len(db_perm_session.query(OrderProduct).all()) == 2
+    assert db_perm_session.query(Order).one().uuid.version == 7
+    assert {product.uuid.version for product in db_perm_session.query(Product).all()} == {7}
 
     result = service.select_by_user_slug(user_slug=user_slug)
 
@@ -128,6 +285,7 @@ def test_order_service_insert(service, db_perm_session):
     order_info = result["orders"][0].to_dict()
     assert order_info["product_types"] == 2
     assert order_info["items_amount"] == 4
+    assert result["orders"][0].total is None
 
     product_list = ProductFactory.create_batch(5)
     db_perm_session.commit()
@@ -148,7 +306,8 @@ def test_order_service_insert(service, db_perm_session):
     assert order_info["items_amount"] == 15
 
     user_slug = uuid_to_slug(uuid4())
-    ins = service.insert(user_slug=user_slug, item_list=item_list)
+    total = {"outlet": 10.55, "retail": 20.9, "symbol": "£"}
+    ins = service.insert(user_slug=user_slug, item_list=item_list, total=total)
 
     assert ins is True
     assert len(db_perm_session.query(Order).all()) == 3
@@ -158,6 +317,90 @@ def test_order_service_insert(service, db_perm_session):
     result = service.select_by_user_slug(user_slug=user_slug)
 
     assert len(result["orders"]) == 1
+    assert result["orders"][0].total == total
+
+
+def test_order_service_insert_empty(service, db_perm_session):
+    user_slug = uuid_to_slug(uuid4())
+    ins = service.insert(user_slug=user_slug, item_list=[])
+
+    assert ins is True
+    assert len(db_perm_session.query(OrderProduct).all()) == 0
+
+    order = db_perm_session.query(Order).one()
+    assert order.user_slug == user_slug
+    assert (order.product_types, order.items_amount) == (0, 0)
+
+
+def test_order_service_insert_statements(service, db_perm_session):
+    user_slug = uuid_to_slug(uuid4())
+    product_list = ProductFactory.create_batch(25)
+    db_perm_session.commit()
+
+    item_list = [{"item_id": p.es_id, "amount": 2} for p in product_list]
+    item_list += [{"item_id": str(uuid_to_slug(uuid4())), "amount": 1} for i in range(25)]
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = service.db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        assert service.insert(user_slug=user_slug, item_list=item_list) is True
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    assert len([statement for statement in statements if statement.startswith(("SELECT", "INSERT"))]) == 4
+    assert len(db_perm_session.query(Product).all()) == 50
+    assert len(db_perm_session.query(OrderProduct).all()) == 50
+
+    order = db_perm_session.query(Order).one()
+    assert order.product_types == 50
+    assert order.items_amount == 75
+
+
+def test_order_service_insert_concurrent_products(db_perm_session):
+    item_list = [{"item_id": str(uuid_to_slug(uuid4())), "amount": 1} for i in range(10)]
+
+    def insert_cart(i):
+        try:
+            return OrderService().insert(user_slug=uuid_to_slug(uuid4()), item_list=item_list)
+        finally:
+            DBSession.remove()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(insert_cart, range(8)))
+
+    assert results == [True] * 8
+    assert len(db_perm_session.query(Product).all()) == 10
+    assert len(db_perm_session.query(OrderProduct).all()) == 80
+
+
+def test_order_service_replica_routing(service, db_perm_session, mocker):
+    user_slug = uuid_to_slug(uuid4())
+    item_list = [{"item_id": str(uuid_to_slug(uuid4())), "amount": 2}]
+    service.insert(user_slug=user_slug, item_list=item_list)
+
+    replica_router.configure(enabled=True, window=60)
+    try:
+        read_after = replica_router.mark_write(DBSession())
+
+        assert replica_router.can_read(DBReplicaSession(), read_after) is False
+        assert replica_router.can_read(DBReplicaSession()) is True
+
+        primary_query = mocker.spy(service.db_session, "query")
+        replica_query = mocker.spy(DBReplicaSession(), "query")
+        order = service.select_by_user_slug(user_slug=user_slug, read_after=read_after)["orders"][0]
+        assert (primary_query.call_count, replica_query.call_count) == (2, 0)
+        order = service.select_by_user_slug(user_slug=user_slug)["orders"][0]
+        assert (primary_query.call_count, replica_query.call_count) == (2, 2)
+        assert service.select_by_slug(user_slug=user_slug, order_slug=order.uuid_slug) in DBReplicaSession()
+        assert service.select_by_slug(user_slug=user_slug, order_slug=order.uuid_slug, read_after=read_after) in service.db_session
+    finally:
+        replica_router.configure(enabled=False)
+        DBReplicaSession.remove()
 
 
 def test_order_service_delete(service, db_perm_session):
@@ -0,0 +1,95 @@
+import pytest
+from datetime import date, datetime
+
+from backend.service import PartitionService
+from backend.model import Order, OrderProduct
+from backend.tests.factories import OrderFactory, ProductFactory
+
+
+@pytest.fixture(scope="function", autouse=True)
+def factory_session(db_perm_session):
+    OrderFactory._meta.sqlalchemy_session = db_perm_session
+    ProductFactory._meta.sqlalchemy_session = db_perm_session
+
+
+@pytest.fixture(scope="session")
+def service():
+    service = PartitionService()
+    return service
+
+
+def test_partition_service(service, db_perm_session):
+    created = service.create_partitions(months_ahead=1, start=date(2001, 1, 20))
+
+    assert created == ["orders_y2001m01", "order_product_y2001m01", "orders_y2001m02", "order_product_y2001m02"]
+    assert service.create_partitions(months_ahead=1, start=date(2001, 1, 1)) == []
+
+    try:
+        obj = OrderFactory.create()
+        obj.created_at = datetime(2001, 1, 15)
+        OrderProduct(order=obj, product=ProductFactory.create(), amount=2)
+        db_perm_session.flush()
+        order_id, order_uuid = obj.id, obj.uuid
+        db_perm_session.commit()
+
+        detached = service.detach_partitions(1, archive_schema="archive_test", today=date(2001, 3, 10))
+
+        assert detached == ["order_product_y2001m01", "orders_y2001m01"]
+        db_perm_session.expire_all()
+        assert db_perm_session.query(Order).all() == []
+        assert db_perm_session.query(OrderProduct).all() == []
+        assert db_perm_session.execute("SELECT id FROM archive_test.orders_y2001m01").fetchall() == [(order_id, )]
+        assert db_perm_session.execute("SELECT order_id, amount FROM archive_test.order_product_y2001m01").fetchall() == [(order_id, 2)]
+        assert db_perm_session.execute("SELECT order_id FROM order_uuids WHERE uuid = :uuid", {"uuid": order_uuid}).fetchall() == [(order_id, )]
+        db_perm_session.commit()
+
+        assert service.detach_partitions(1, today=date(2001, 3, 10)) == []
+        assert service.detach_partitions(0, today=date(2001, 3, 10)) == ["order_product_y2001m02", "orders_y2001m02"]
+        assert db_perm_session.execute("SELECT to_regclass('orders_y2001m02')").scalar() == "orders_y2001m02"
+        db_perm_session.commit()
+    finally:
+        db_perm_session.rollback()
+        service.db_session.rollback()
+        service.db_session.execute("DROP SCHEMA IF EXISTS archive_test CASCADE")
+        service.db_session.execute("DELETE FROM order_uuids WHERE created_at < '2001-03-01'")
+        for name in ["order_product_y2001m01", "order_product_y2001m02", "orders_y2001m01", "orders_y2001m02"]:
+            service.db_session.execute("DROP TABLE IF EXISTS %s" % name)
+        service.db_session.commit()
+
+
+def test_partition_service_default_rows(service, db_perm_session):
+    try:
+        obj = OrderFactory.create()
+        obj.created_at = datetime(2001, 5, 15)
+        OrderProduct(order=obj, product=ProductFactory.create(), amount=3)
+        other = OrderFactory.create()
+        other.created_at = datetime(2001, 7, 2)
+        db_perm_session.flush()
+        order_id, order_uuid, other_id = obj.id, obj.uuid, other.id
+        db_perm_session.commit()
+
+        assert db_perm_session.execute("SELECT id FROM orders_default WHERE created_at < '2001-08-01' ORDER BY id").fetchall() == [(order_id, ), (other_id, )]
+        db_perm_session.commit()
+
+        assert service.create_partitions(months_ahead=1, start=date(2001, 5, 1)) == [
+            "orders_y2001m05", "order_product_y2001m05", "orders_y2001m06", "order_product_y2001m06"
+        ]
+        assert db_perm_session.execute("SELECT id, product_types, items_amount FROM orders_y2001m05").fetchall() == [(order_id, 1, 3)]
+        assert db_perm_session.execute("SELECT order_id, amount FROM order_product_y2001m05").fetchall() == [(order_id, 3)]
+        assert db_perm_session.execute("SELECT id FROM orders_default WHERE created_at < '2001-08-01'").fetchall() == [(other_id, )]
+        assert db_perm_session.execute("SELECT order_id FROM order_uuids WHERE uuid = :uuid", {"uuid": order_uuid}).fetchall() == [(order_id, )]
+        db_perm_session.commit()
+
+        detached = service.detach_partitions(0, archive_schema="Archive Test", today=date(2001, 7, 1))
+        assert detached == ["order_product_y2001m05", "order_product_y2001m06", "orders_y2001m05", "orders_y2001m06"]
+        assert db_perm_session.execute('SELECT id FROM "Archive Test".orders_y2001m05').fetchall() == [(order_id, )]
+        db_perm_session.commit()
+    finally:
+        db_perm_session.rollback()
+        service.db_session.rollback()
+        service.db_session.execute('DROP SCHEMA IF EXISTS "Archive Test" CASCADE')
+        service.db_session.execute("DELETE FROM orders WHERE created_at < '2001-08-01'")
+        service.db_session.execute("DELETE FROM order_uuids WHERE created_at < '2001-08-01'")
+        for name in ["order_product_y2001m05", "order_product_y2001m06", "orders_y2001m05", "orders_y2001m06"]:
+            service.db_session.execute("DROP TABLE IF EXISTS %s" % name)
+        service.db_session.commit()
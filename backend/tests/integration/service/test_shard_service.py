@@ -0,0 +1,118 @@
+import pytest
+from flask import json
+from sqlalchemy import create_engine
+from sqlalchemy.engine.url import make_url
+from uuid import uuid4
+
+from backend.service import OrderService, OrderImportService, ShardService
+from backend.dao.postgres_db import Base, shard_router
+from backend.util.slug import uuid_to_slug
+
+
+SHARDS = ["willorders_shard_a", "willorders_shard_b", "willorders_shard_c"]
+
+
+@pytest.fixture(scope="function")
+def shard_engines(database_url):
+    admin = create_engine(database_url, isolation_level="AUTOCOMMIT")
+    engines = {}
+    try:
+        for name in SHARDS:
+            admin.execute("DROP DATABASE IF EXISTS %s" % name)
+            admin.execute("CREATE DATABASE %s" % name)
+            url = make_url(database_url)
+            url.database = name
+            engines[name] = create_engine(url)
+            Base.metadata.create_all(bind=engines[name])
+
+        yield engines
+    finally:
+        shard_router.configure({})
+        for name, engine in engines.items():
+            engine.dispose()
+            admin.execute("DROP DATABASE IF EXISTS %s" % name)
+        admin.dispose()
+
+
+def stored_users(engine):
+    return {row[0]: row[1] for row in engine.execute("SELECT user_uuid, count(*) FROM orders GROUP BY user_uuid")}
+
+
+def test_shard_service_rebalance(shard_engines):
+    shard_router.configure({name: shard_engines[name] for name in SHARDS[:2]})
+    users = [uuid4() for i in range(30)]
+    for user_uuid in users[:20]:
+        OrderService().insert(user_slug=uuid_to_slug(user_uuid), item_list=[{"item_id": "shard-product", "amount": 2}])
+
+    lines = [
+        json.dumps({"user_slug": uuid_to_slug(user_uuid), "item_list": [{"item_id": "shard-product", "amount": 3}]}).encode("utf-8")
+        for user_uuid in users[10:]
+    ]
+    assert OrderImportService().import_orders(lines, batch_size=7) == {"imported": 20, "failed": 0, "errors": []}
+
+    for name in SHARDS[:2]:
+        for user_uuid, amount in stored_users(shard_engines[name]).items():
+            assert shard_router.shard_for(user_uuid) == name
+            assert amount == (2 if 10 <= users.index(user_uuid) < 20 else 1)
+    assert stored_users(shard_engines[SHARDS[2]]) == {}
+
+    user_slug = uuid_to_slug(users[15])
+    order_slug = OrderService().select_by_user_slug(user_slug=user_slug)["orders"][0].uuid_slug
+    shard_router.remove()
+
+    shard_router.configure(shard_engines)
+    moved = ShardService().rebalance(batch_size=4)
+
+    assert set(moved) <= {(SHARDS[0], SHARDS[2]), (SHARDS[1], SHARDS[2])}
+    assert sum(moved.values()) == len(stored_users(shard_engines[SHARDS[2]])) > 0
+    assert ShardService().rebalance() == {}
+
+    placement = {}
+    for name, engine in shard_engines.items():
+        for user_uuid, amount in stored_users(engine).items():
+            assert user_uuid not in placement
+            assert shard_router.shard_for(user_uuid) == name
+            placement[user_uuid] = amount
+    assert set(placement) == set(users)
+
+    order = OrderService().select_by_slug(user_slug=user_slug, order_slug=order_slug)
+    assert [(item.product.es_id, item.amount) for item in order.items] in ([("shard-product", 2)], [("shard-product", 3)])
+    assert OrderService().select_by_user_slug(user_slug=user_slug)["total"] == 2
+    shard_router.remove()
+
+
+def test_shard_service_rebalance_range(shard_engines):
+    shard_router.configure({name: shard_engines[name] for name in SHARDS[:2]})
+    users = sorted(uuid4() for i in range(30))
+    for user_uuid in users:
+        OrderService().insert(user_slug=uuid_to_slug(user_uuid), item_list=[{"item_id": "shard-product", "amount": 1}])
+    shard_router.remove()
+
+    shard_router.configure(shard_engines)
+    moving = [user_uuid for user_uuid in users if shard_router.shard_for(user_uuid) == SHARDS[2]]
+    assert moving
+    for user_uuid in moving:
+        OrderService().insert(user_slug=uuid_to_slug(user_uuid), item_list=[{"item_id": "shard-product", "amount": 2}])
+    assert stored_users(shard_engines[SHARDS[2]]) == {user_uuid: 1 for user_uuid in moving}
+
+    with pytest.raises(ValueError):
+        ShardService().rebalance(target="churros")
+
+    middle = users[15]
+    moved = ShardService().rebalance(target=SHARDS[2], end=middle)
+    assert sum(moved.values()) == len([user_uuid for user_uuid in moving if user_uuid < middle])
+    assert ShardService().rebalance(source=SHARDS[0], target=SHARDS[1]) == {}
+
+    stored = stored_users(shard_engines[SHARDS[2]])
+    assert stored == {user_uuid: 2 if user_uuid < middle else 1 for user_uuid in moving}
+
+    moved = ShardService().rebalance(target=SHARDS[2], start=middle)
+    assert sum(moved.values()) == len([user_uuid for user_uuid in moving if user_uuid >= middle])
+    assert stored_users(shard_engines[SHARDS[2]]) == {user_uuid: 2 for user_uuid in moving}
+    for name in SHARDS[:2]:
+        assert not set(stored_users(shard_engines[name])) & set(moving)
+
+    for user_uuid in moving:
+        orders = OrderService().select_by_user_slug(user_slug=uuid_to_slug(user_uuid), with_items=True)["orders"]
+        assert sorted(item.amount for order in orders for item in order.items) == [1, 2]
+    shard_router.remove()
@@ -0,0 +1,59 @@
+import pytest
+from flask import json
+
+from backend.service import OrderImportService
+from backend.util.response.order_import import OrderImportSchema
+from backend.util.response.error import ErrorSchema
+from sqlalchemy.exc import DatabaseError, SQLAlchemyError
+
+
+@pytest.fixture(scope="function", autouse=True)
+def controller_mocker(mocker):
+    mocker.patch.object(OrderImportService, "__init__", return_value=None)
+
+
+def test_import_controller(mocker, login_disabled_app):
+    report = {
+        "imported": 2,
+        "failed": 1,
+        "errors": [{"first_line": 3, "last_line": 3, "error": "Line 3: error message"}]
+    }
+    import_orders = mocker.patch.object(OrderImportService, "import_orders", return_value=report)
+
+    with login_disabled_app.test_client() as client:
+        response = client.post(
+            "api/order/import",
+            data=b'{"user_slug": "WILLrogerPEREIRAslugBR", "item_list": [{"item_id": "id", "amount": 1}]}\n'
+        )
+
+    data = json.loads(response.data)
+    OrderImportSchema().load(data)
+    assert response.status_code == 200
+    assert data == report
+
+    _, kwargs = import_orders.call_args
+    assert kwargs["batch_size"] == login_disabled_app.config["ORDER_IMPORT_BATCH_SIZE"]
+
+
+@pytest.mark.parametrize(
+    "method,http_method,test_url,error,status_code",
+    [
+        ("import_orders", "POST", "api/order/import", DatabaseError("statement", "params", "orig"), 400),
+        ("import_orders", "POST", "api/order/import", SQLAlchemyError(), 504),
+        ("import_orders", "POST", "api/order/import", Exception(), 500)
+    ]
+)
+def test_import_controller_error(mocker, get_request_function, method, http_method, test_url, error, status_code):
+    mocker.patch.object(OrderImportService, method, side_effect=error)
+
+    make_request = get_request_function(http_method)
+
+    response = make_request(
+        test_url,
+        data=b""
+    )
+
+    data = json.loads(response.data)
+    ErrorSchema().load(data)
+
+    assert response.status_code == status_code
@@ -60,6 +60,76 @@ def test_insert_controller(mocker, login_disabled_app, willstores_ws, request_js
         assert response.status_code == 201
 
 
+def test_insert_controller_read_after(mocker, login_disabled_app, willstores_ws, request_json, willstores_response_json):
+    mocker.patch.object(OrderService, "insert", return_value=True)
+    mocker.patch("backend.controller.read_after.DBSession")
+    mark_write = mocker.patch("backend.controller.read_after.replica_router.mark_write", return_value="0/16B3748@2000")
+
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.POST, re.compile(willstores_ws),
+            status=200,
+            json=willstores_response_json
+        )
+
+        with login_disabled_app.test_client() as client:
+            response = client.put(
+                "api/order/insert",
+                json=request_json
+            )
+
+        assert response.status_code == 201
+        assert response.headers["X-Read-After"] == "0/16B3748@2000"
+        assert 'read_after="0/16B3748@2000"' in response.headers["Set-Cookie"]
+
+        mark_write.side_effect = DatabaseError("statement", "params", "orig")
+        with login_disabled_app.test_client() as client:
+            response = client.put(
+                "api/order/insert",
+                json=request_json
+            )
+
+        data = json.loads(response.data)
+        assert data == {}
+        assert response.status_code == 201
+        assert "X-Read-After" not in response.headers
+
+
+def test_insert_controller_snapshots(mocker, login_disabled_app, willstores_ws, request_json):
+    mocker.patch.dict(login_disabled_app.config, {"ORDER_SNAPSHOTS": True})
+    insert = mocker.patch.object(OrderService, "insert", return_value=True)
+    product = {
+        "id": "string",
+        "name": "string",
+        "image": "string",
+        "price": {
+            "outlet": 10.55,
+            "retail": 20.9,
+            "symbol": "£"
+        },
+        "discount": 80.5
+    }
+
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.POST, re.compile(willstores_ws),
+            status=200,
+            json={"products": [product]}
+        )
+
+        with login_disabled_app.test_client() as client:
+            response = client.put(
+                "api/order/insert",
+                json=request_json
+            )
+
+        data = json.loads(response.data)
+        assert data == {}
+        assert response.status_code == 201
+
+    _, kwargs = insert.call_args
+    assert kwargs["products"] == [product]
+    assert kwargs["total"] == {"outlet": 10.55, "retail": 20.9, "symbol": "£"}
+
+
 def test_insert_controller_no_json(login_disabled_app):
     with login_disabled_app.test_client() as client:
         response = client.put(
@@ -2,7 +2,7 @@ import pytest
 import responses
 import re
 from flask import json
-from unittest.mock import MagicMock
+from datetime import datetime
 
 from backend.service import OrderService
 from backend.util.response.order import OrderSchema
@@ -50,15 +50,12 @@ def willstores_response_json():
 @pytest.fixture(scope="function", autouse=True)
 def controller_mocker(mocker):
     mocker.patch.object(OrderService, "__init__", return_value=None)
+    mocker.patch.object(OrderService, "select_version_by_slug", return_value=(datetime(2019, 10, 12), datetime(2019, 10, 11)))
 
 
 def test_select_by_slug_controller(mocker, login_disabled_app, willstores_ws, response_json, willstores_response_json):
-    mock_item = MagicMock()
-    mock_item.to_dict.return_value = {"item_id": "id", "amount": 5}
-    mock_order = MagicMock()
-    mock_order.items = [mock_item]
-    mock_order.to_dict.return_value = response_json
-    mocker.patch.object(OrderService, "select_by_slug", return_value=mock_order)
+    order = dict(response_json, items=[{"item_id": "id", "amount": 5, "snapshot": None}], snapshot_at=None)
+    mocker.patch.object(OrderService, "select_document_by_slug", return_value=order)
 
     with responses.RequestsMock() as rsps:
         rsps.add(responses.POST, re.compile(willstores_ws),
@@ -80,6 +77,80 @@ def test_select_by_slug_controller(mocker, login_disabled_app, willstores_ws, re
         assert len(data["products"]) == 1
 
 
+def test_select_by_slug_controller_snapshot(mocker, login_disabled_app, response_json, willstores_response_json):
+    item = {"item_id": "id", "amount": 5, "snapshot": dict(willstores_response_json["products"][0])}
+    order = dict(response_json, items=[item], snapshot_at=datetime.now())
+    mocker.patch.object(OrderService, "select_document_by_slug", return_value=order)
+
+    with responses.RequestsMock():
+        with login_disabled_app.test_client() as client:
+            response = client.get(
+                "api/order/WILLrogerPEREIRAslugBR/WILLrogerPEREIRAslugBR"
+            )
+
+    data = json.loads(response.data)
+    OrderSchema().load(data)
+    assert response.status_code == 200
+    assert data["total"] == response_json["total"]
+    assert len(data["products"]) == 1
+    assert data["products"][0]["amount"] == 5
+
+
+def test_select_by_slug_controller_not_modified(mocker, login_disabled_app, response_json, willstores_response_json):
+    item = {"item_id": "id", "amount": 5, "snapshot": dict(willstores_response_json["products"][0])}
+    select = mocker.patch.object(OrderService, "select_document_by_slug", side_effect=lambda **kwargs: dict(response_json, items=[item], snapshot_at=datetime.now()))
+
+    with login_disabled_app.test_client() as client:
+        response = client.get(
+            "api/order/WILLrogerPEREIRAslugBR/WILLrogerPEREIRAslugBR"
+        )
+
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('W/"')
+    assert "Last-Modified" in response.headers
+    select.reset_mock()
+
+    for headers in [{"If-None-Match": response.headers["ETag"]}, {"If-Modified-Since": "Sun, 13 Oct 2019 00:00:00 GMT"}]:
+        with login_disabled_app.test_client() as client:
+            response = client.get(
+                "api/order/WILLrogerPEREIRAslugBR/WILLrogerPEREIRAslugBR",
+                headers=headers
+            )
+
+        assert response.status_code == 304
+        select.assert_not_called()
+
+    with login_disabled_app.test_client() as client:
+        response = client.get(
+            "api/order/WILLrogerPEREIRAslugBR/WILLrogerPEREIRAslugBR",
+            headers={"If-None-Match": 'W/"other"', "If-Modified-Since": "Sun, 13 Oct 2019 00:00:00 GMT"}
+        )
+
+    assert response.status_code == 200
+
+
+def test_select_by_slug_controller_live_document(mocker, login_disabled_app, willstores_ws, response_json, willstores_response_json):
+    order = dict(response_json, items=[{"item_id": "id", "amount": 5, "snapshot": None}], snapshot_at=None)
+    mocker.patch.object(OrderService, "select_version_by_slug", return_value=None)
+    mocker.patch.object(OrderService, "select_document_by_slug", return_value=order)
+
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.POST, re.compile(willstores_ws),
+            status=200,
+            json=willstores_response_json
+        )
+
+        with login_disabled_app.test_client() as client:
+            response = client.get(
+                "api/order/WILLrogerPEREIRAslugBR/WILLrogerPEREIRAslugBR",
+                headers={"If-Modified-Since": "Sun, 13 Oct 2019 00:00:00 GMT"}
+            )
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+    assert "Last-Modified" not in response.headers
+
+
 def test_select_by_slug_controller_invalid_slug(login_disabled_app):
     with login_disabled_app.test_client() as client:
         response = client.get(
@@ -105,12 +176,12 @@ def test_select_by_slug_controller_invalid_slug(login_disabled_app):
 @pytest.mark.parametrize(
     "method,http_method,test_url,error,status_code",
     [
-        ("select_by_slug", "GET", "api/order/WILLrogerPEREIRAslugBR/WILLrogerPEREIRAslugBR", HTTPException(), 400),
-        ("select_by_slug", "GET", "api/order/WILLrogerPEREIRAslugBR/WILLrogerPEREIRAslugBR", NotFoundError(), 404),
-        ("select_by_slug", "GET", "api/order/WILLrogerPEREIRAslugBR/WILLrogerPEREIRAslugBR", ConnectionError(), 502),
-        ("select_by_slug", "GET", "api/order/WILLrogerPEREIRAslugBR/WILLrogerPEREIRAslugBR", DatabaseError("statement", "params", "orig"), 400),
-        ("select_by_slug", "GET", "api/order/WILLrogerPEREIRAslugBR/WILLrogerPEREIRAslugBR", SQLAlchemyError(), 504),
-        ("select_by_slug", "GET", "api/order/WILLrogerPEREIRAslugBR/WILLrogerPEREIRAslugBR", Exception(), 500)
+        ("select_document_by_slug", "GET", "api/order/WILLrogerPEREIRAslugBR/WILLrogerPEREIRAslugBR", HTTPException(), 400),
+        ("select_document_by_slug", "GET", "api/order/WILLrogerPEREIRAslugBR/WILLrogerPEREIRAslugBR", NotFoundError(), 404),
+        ("select_document_by_slug", "GET", "api/order/WILLrogerPEREIRAslugBR/WILLrogerPEREIRAslugBR", ConnectionError(), 502),
+        ("select_document_by_slug", "GET", "api/order/WILLrogerPEREIRAslugBR/WILLrogerPEREIRAslugBR", DatabaseError("statement", "params", "orig"), 400),
+        ("select_document_by_slug", "GET", "api/order/WILLrogerPEREIRAslugBR/WILLrogerPEREIRAslugBR", SQLAlchemyError(), 504),
+        ("select_document_by_slug", "GET", "api/order/WILLrogerPEREIRAslugBR/WILLrogerPEREIRAslugBR", Exception(), 500)
     ]
 )
 def test_select_by_slug_controller_error(mocker, get_request_function, method, http_method, test_url, error, status_code):
@@ -142,8 +213,8 @@ def test_select_by_slug_controller_error(mocker, get_request_function, method, h
         ("api/order/WILLrogerPEREIRAslugBR/WILLrogerPEREIRAslugBR", 504),
     ]
 )
-def test_select_by_slug_controller_http_error(mocker, login_disabled_app, willstores_ws, json_error_recv, test_url, status_code):
-    mocker.patch.object(OrderService, "select_by_slug", return_value=MagicMock(autospec=True))
+def test_select_by_slug_controller_http_error(mocker, login_disabled_app, willstores_ws, json_error_recv, response_json, test_url, status_code):
+    mocker.patch.object(OrderService, "select_document_by_slug", return_value=dict(response_json, items=[], snapshot_at=None))
 
     with responses.RequestsMock() as rsps:
         rsps.add(responses.POST, re.compile(willstores_ws),
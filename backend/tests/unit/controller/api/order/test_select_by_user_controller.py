@@ -4,15 +4,17 @@ import re
 from flask import json
 from unittest.mock import MagicMock
 from copy import deepcopy
+from datetime import date, datetime
 from json import JSONDecodeError
 
 from backend.service import OrderService
 from backend.util.response.user_orders import UserOrdersSchema
 from backend.util.response.error import ErrorSchema
 from werkzeug.exceptions import HTTPException
-from requests import ConnectionError
+from requests import ConnectionError, ReadTimeout
 from sqlalchemy.exc import DatabaseError, DataError, SQLAlchemyError
 from backend.errors.no_content_error import NoContentError
+from backend.util.cursor import encode_cursor
 
 
 @pytest.fixture(scope="module")
@@ -48,13 +50,45 @@ def willstores_response_json():
     }
 
 
+@pytest.fixture(scope="module")
+def willstores_list_response_json():
+    return {
+        "products": [
+            {
+                "id": "first",
+                "name": "string",
+                "image": "string",
+                "price": {
+                    "outlet": 10.55,
+                    "retail": 20.9,
+                    "symbol": "£"
+                },
+                "discount": 80.5
+            },
+            {
+                "id": "second",
+                "name": "string",
+                "image": "string",
+                "price": {
+                    "outlet": 1.5,
+                    "retail": 3,
+                    "symbol": "£"
+                },
+                "discount": 50
+            }
+        ]
+    }
+
+
 @pytest.fixture(scope="function", autouse=True)
 def controller_mocker(mocker):
     mocker.patch.object(OrderService, "__init__", return_value=None)
+    mocker.patch.object(OrderService, "select_version_by_user_slug", return_value=(datetime(2019, 10, 12), 2))
 
 
 def test_select_by_user_slug_controller(mocker, login_disabled_app, willstores_ws, request_json, response_json, willstores_response_json):
     mock_order = MagicMock()
+    mock_order.total = None
     mock_order.to_dict.return_value = response_json
     mocker.patch.object(OrderService, "select_by_user_slug", return_value={"orders": [mock_order, mock_order], "total": 0, "pages": 0})
 
@@ -114,6 +148,264 @@ def test_select_by_user_slug_controller(mocker, login_disabled_app, willstores_w
             assert order["total"]["symbol"] == "£"
 
 
+def test_select_by_user_slug_controller_stored_totals(mocker, login_disabled_app, willstores_ws, response_json, willstores_response_json):
+    stored_total = {"outlet": 1.5, "retail": 3, "symbol": "£"}
+    stored_order = MagicMock()
+    stored_order.total = stored_total
+    stored_order.to_dict.return_value = dict(response_json)
+    mocker.patch.object(OrderService, "select_by_user_slug", return_value={"orders": [stored_order], "total": 1, "pages": 1})
+
+    with responses.RequestsMock() as rsps:
+        with login_disabled_app.test_client() as client:
+            response = client.post(
+                "api/order/user/WILLrogerPEREIRAslugBR"
+            )
+
+        data = json.loads(response.data)
+        UserOrdersSchema().load(data)
+        assert response.status_code == 200
+        assert len(rsps.calls) == 0
+        assert data["orders"][0]["total"] == stored_total
+
+    legacy_order = MagicMock()
+    legacy_order.total = None
+    legacy_order.to_dict.return_value = dict(response_json)
+    mocker.patch.object(OrderService, "select_by_user_slug", return_value={"orders": [stored_order, legacy_order], "total": 2, "pages": 1})
+
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.POST, re.compile(willstores_ws),
+            status=200,
+            json=willstores_response_json
+        )
+
+        with login_disabled_app.test_client() as client:
+            response = client.post(
+                "api/order/user/WILLrogerPEREIRAslugBR"
+            )
+
+        data = json.loads(response.data)
+        UserOrdersSchema().load(data)
+        assert response.status_code == 200
+        assert len(rsps.calls) == 1
+        assert data["orders"][0]["total"] == stored_total
+        assert data["orders"][1]["total"] == willstores_response_json["total"]
+
+    mocker.patch.object(OrderService, "select_by_user_slug", return_value={"orders": [stored_order, legacy_order], "total": 2, "pages": 1})
+
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.POST, re.compile(willstores_ws),
+            status=200,
+            json=willstores_response_json
+        )
+
+        with login_disabled_app.test_client() as client:
+            response = client.post(
+                "api/order/user/WILLrogerPEREIRAslugBR",
+                json={"live_price": True}
+            )
+
+        data = json.loads(response.data)
+        UserOrdersSchema().load(data)
+        assert response.status_code == 200
+        assert len(rsps.calls) == 2
+        assert data["orders"][0]["total"] == willstores_response_json["total"]
+        assert data["orders"][1]["total"] == willstores_response_json["total"]
+
+
+def test_select_by_user_slug_controller_batch_totals(mocker, login_disabled_app, willstores_ws, response_json, willstores_list_response_json):
+    mocker.patch.dict(login_disabled_app.config, {"WILLSTORES_BATCH_TOTALS": True})
+
+    first_item = MagicMock()
+    first_item.to_dict.return_value = {"item_id": "first", "amount": 2}
+    second_item = MagicMock()
+    second_item.to_dict.return_value = {"item_id": "second", "amount": 1}
+    first_order = MagicMock()
+    first_order.total = None
+    first_order.items = [first_item, second_item]
+    first_order.to_dict.return_value = dict(response_json)
+    second_order = MagicMock()
+    second_order.total = None
+    second_order.items = [second_item]
+    second_order.to_dict.return_value = dict(response_json)
+    mocker.patch.object(OrderService, "select_by_user_slug", return_value={"orders": [first_order, second_order], "total": 2, "pages": 1})
+
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.POST, re.compile(willstores_ws),
+            status=200,
+            json=willstores_list_response_json
+        )
+
+        with login_disabled_app.test_client() as client:
+            response = client.post(
+                "api/order/user/WILLrogerPEREIRAslugBR"
+            )
+
+        data = json.loads(response.data)
+        UserOrdersSchema().load(data)
+        assert response.status_code == 200
+        assert len(rsps.calls) == 1
+        assert rsps.calls[0].request.url.endswith("/api/product/list")
+        assert len(json.loads(rsps.calls[0].request.body)["item_list"]) == 2
+        assert len(data["orders"]) == 2
+        assert data["orders"][0]["total"] == {"outlet": 22.6, "retail": 44.8, "symbol": "£"}
+        assert data["orders"][1]["total"] == {"outlet": 1.5, "retail": 3, "symbol": "£"}
+
+
+def test_select_by_user_slug_controller_cursor(mocker, login_disabled_app, response_json):
+    mock_order = MagicMock()
+    mock_order.total = {"outlet": 10.55, "retail": 20.9, "symbol": "£"}
+    mock_order.to_dict.return_value = response_json
+    next_cursor = encode_cursor(datetime(2019, 10, 12), 1)
+    select = mocker.patch.object(OrderService, "select_by_user_slug", return_value={"orders": [mock_order], "next_cursor": next_cursor})
+
+    with login_disabled_app.test_client() as client:
+        response = client.post(
+            "api/order/user/WILLrogerPEREIRAslugBR",
+            json={"cursor": next_cursor, "page_size": 1}
+        )
+
+    data = json.loads(response.data)
+    UserOrdersSchema().load(data)
+    assert response.status_code == 200
+    assert len(data["orders"]) == 1
+    assert data["next_cursor"] == next_cursor
+    assert "total" not in data
+    assert "pages" not in data
+    select.assert_called_once_with(user_slug="WILLrogerPEREIRAslugBR", with_items=False, read_after=None, cursor=next_cursor, page_size=1)
+
+
+def test_select_by_user_slug_controller_get(mocker, login_disabled_app, response_json):
+    mock_order = MagicMock()
+    mock_order.total = {"outlet": 10.55, "retail": 20.9, "symbol": "£"}
+    mock_order.to_dict.return_value = response_json
+    select = mocker.patch.object(OrderService, "select_by_user_slug", side_effect=lambda **kwargs: {"orders": [mock_order], "total": 1, "pages": 1})
+
+    with login_disabled_app.test_client() as client:
+        response = client.get(
+            "api/order/user/WILLrogerPEREIRAslugBR",
+            query_string={"page": "2", "page_size": "5", "with_total": "true", "start": "2019-10-20", "end": "2019-10-24"}
+        )
+
+    data = json.loads(response.data)
+    UserOrdersSchema().load(data)
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "public, no-cache"
+    assert response.headers["Vary"] == "Authorization, Cookie, X-Read-After"
+    assert "ETag" in response.headers
+    select.assert_called_once_with(
+        user_slug="WILLrogerPEREIRAslugBR", with_items=False, read_after=None,
+        page=2, page_size=5, with_total=True, datespan={"start": date(2019, 10, 20), "end": date(2019, 10, 24)}
+    )
+    select.reset_mock()
+
+    with login_disabled_app.test_client() as client:
+        response = client.post(
+            "api/order/user/WILLrogerPEREIRAslugBR",
+            json={"page": 2, "page_size": 5, "with_total": True, "datespan": {"start": "2019-10-20", "end": "2019-10-24"}}
+        )
+
+    assert json.loads(response.data) == data
+    etag = response.headers["ETag"]
+
+    with login_disabled_app.test_client() as client:
+        response = client.get(
+            "api/order/user/WILLrogerPEREIRAslugBR",
+            query_string={"page": "2", "page_size": "5", "with_total": "true", "start": "2019-10-20", "end": "2019-10-24"},
+            headers={"If-None-Match": etag}
+        )
+
+    assert response.status_code == 304
+    assert response.headers["Cache-Control"] == "public, no-cache"
+    assert response.headers["ETag"] == etag
+    assert select.call_count == 1
+
+    mocker.patch.dict(login_disabled_app.config, {"ORDER_LIST_SHARED_MAX_AGE": 30})
+
+    with login_disabled_app.test_client() as client:
+        response = client.get(
+            "api/order/user/WILLrogerPEREIRAslugBR"
+        )
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "public, max-age=0, s-maxage=30"
+
+
+def test_select_by_user_slug_controller_validators(mocker, login_disabled_app, response_json):
+    mock_order = MagicMock()
+    mock_order.total = {"outlet": 10.55, "retail": 20.9, "symbol": "£"}
+    mock_order.to_dict.return_value = response_json
+    mocker.patch.object(OrderService, "select_by_user_slug", side_effect=lambda **kwargs: {"orders": [mock_order], "total": 1, "pages": 1})
+
+    with login_disabled_app.test_client() as client:
+        response = client.post(
+            "api/order/user/WILLrogerPEREIRAslugBR",
+            headers={"If-Modified-Since": "Sun, 13 Oct 2019 00:00:00 GMT"}
+        )
+
+    assert response.status_code == 200
+    assert "ETag" in response.headers
+    assert "Last-Modified" not in response.headers
+
+    mocker.patch.object(OrderService, "select_version_by_user_slug", return_value=None)
+
+    with login_disabled_app.test_client() as client:
+        response = client.post(
+            "api/order/user/WILLrogerPEREIRAslugBR",
+            headers={"If-None-Match": response.headers["ETag"]}
+        )
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+
+def test_select_by_user_slug_controller_get_live_price(mocker, login_disabled_app, willstores_ws, response_json, willstores_response_json):
+    mock_order = MagicMock()
+    mock_order.to_dict.return_value = response_json
+    mock_order.items = []
+    mocker.patch.object(OrderService, "select_by_user_slug", return_value={"orders": [mock_order], "total": 1, "pages": 1})
+
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.POST, re.compile(willstores_ws),
+            status=200,
+            json=willstores_response_json
+        )
+
+        with login_disabled_app.test_client() as client:
+            response = client.get(
+                "api/order/user/WILLrogerPEREIRAslugBR",
+                query_string={"live_price": "true"}
+            )
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "no-store"
+    assert "ETag" not in response.headers
+
+
+@pytest.mark.parametrize(
+    "query_string",
+    [
+        {"page": "-1"},
+        {"page_size": "999"},
+        {"page": "one"},
+        {"start": "2019-10-20"},
+        {"start": "2019-10-25", "end": "2019-10-23"},
+        {"page": "1", "cursor": "cursor"},
+        {"unknown": "1"}
+    ]
+)
+def test_select_by_user_slug_controller_get_invalid_args(login_disabled_app, query_string):
+    with login_disabled_app.test_client() as client:
+        response = client.get(
+            "api/order/user/WILLrogerPEREIRAslugBR",
+            query_string=query_string
+        )
+
+    data = json.loads(response.data)
+    ErrorSchema().load(data)
+    assert response.status_code == 400
+    assert "Cache-Control" not in response.headers
+
+
 def test_select_by_user_slug_controller_invalid_slug(login_disabled_app):
     with login_disabled_app.test_client() as client:
         response = client.post(
@@ -183,6 +475,49 @@ def test_select_by_user_slug_controller_invalid_json(login_disabled_app, request
 
     assert response.status_code == 400
 
+    invalid_cursor = deepcopy(request_json)
+    invalid_cursor.pop("page")
+    invalid_cursor.update(cursor="churros")
+
+    with login_disabled_app.test_client() as client:
+        response = client.post(
+            "api/order/user/WILLrogerPEREIRAslugBR",
+            json=invalid_cursor
+        )
+
+    data = json.loads(response.data)
+    ErrorSchema().load(data)
+
+    assert response.status_code == 400
+
+    page_and_cursor = deepcopy(request_json)
+    page_and_cursor.update(cursor=encode_cursor(datetime(2019, 10, 12), 1))
+
+    with login_disabled_app.test_client() as client:
+        response = client.post(
+            "api/order/user/WILLrogerPEREIRAslugBR",
+            json=page_and_cursor
+        )
+
+    data = json.loads(response.data)
+    ErrorSchema().load(data)
+
+    assert response.status_code == 400
+
+    invalid_live_price = deepcopy(request_json)
+    invalid_live_price.update(live_price="churros")
+
+    with login_disabled_app.test_client() as client:
+        response = client.post(
+            "api/order/user/WILLrogerPEREIRAslugBR",
+            json=invalid_live_price
+        )
+
+    data = json.loads(response.data)
+    ErrorSchema().load(data)
+
+    assert response.status_code == 400
+
     overflow_datespan = deepcopy(request_json)
     overflow_datespan.update(datespan={"start": "2019-13-20", "end": "2019-10-33"})
 
@@ -204,6 +539,7 @@ def test_select_by_user_slug_controller_invalid_json(login_disabled_app, request
         ("select_by_user_slug", "POST", "api/order/user/WILLrogerPEREIRAslugBR", NoContentError(), 204),
         ("select_by_user_slug", "POST", "api/order/user/WILLrogerPEREIRAslugBR", HTTPException(), 400),
         ("select_by_user_slug", "POST", "api/order/user/WILLrogerPEREIRAslugBR", ConnectionError(), 502),
+        ("select_by_user_slug", "POST", "api/order/user/WILLrogerPEREIRAslugBR", ReadTimeout(), 504),
         ("select_by_user_slug", "POST", "api/order/user/WILLrogerPEREIRAslugBR", DataError("statement", "params", "DETAIL:  orig\n"), 400),
         ("select_by_user_slug", "POST", "api/order/user/WILLrogerPEREIRAslugBR", DatabaseError("statement", "params", "orig"), 400),
         ("select_by_user_slug", "POST", "api/order/user/WILLrogerPEREIRAslugBR", SQLAlchemyError(), 504),
@@ -240,7 +576,7 @@ def test_select_by_user_slug_controller_error(mocker, get_request_function, meth
     ]
 )
 def test_select_by_user_slug_controller_http_error(mocker, login_disabled_app, willstores_ws, json_error_recv, test_url, status_code):
-    mocker.patch.object(OrderService, "select_by_user_slug", return_value={"orders": [MagicMock()], "total": 0, "pages": 0})
+    mocker.patch.object(OrderService, "select_by_user_slug", return_value={"orders": [MagicMock(total=None)], "total": 0, "pages": 0})
 
     with responses.RequestsMock() as rsps:
         rsps.add(responses.POST, re.compile(willstores_ws),
@@ -257,3 +593,22 @@ def test_select_by_user_slug_controller_http_error(mocker, login_disabled_app, w
         ErrorSchema().load(data)
 
         assert response.status_code == status_code
+
+
+def test_select_by_user_slug_controller_timeout(mocker, login_disabled_app, willstores_ws):
+    mocker.patch.object(OrderService, "select_by_user_slug", return_value={"orders": [MagicMock(total=None), MagicMock(total=None)], "total": 0, "pages": 0})
+
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.POST, re.compile(willstores_ws),
+            body=ReadTimeout()
+        )
+
+        with login_disabled_app.test_client() as client:
+            response = client.post(
+                "api/order/user/WILLrogerPEREIRAslugBR"
+            )
+
+        data = json.loads(response.data)
+        ErrorSchema().load(data)
+
+        assert response.status_code == 504
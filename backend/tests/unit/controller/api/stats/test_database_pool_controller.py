@@ -0,0 +1,44 @@
+import pytest
+from flask import json
+
+from backend.dao.engine_pool import create_pooled_engine
+from backend.util.response.database_pool_stats import DatabasePoolStatsSchema
+from backend.util.response.error import ErrorSchema
+
+
+def test_database_pool_controller(mocker, login_disabled_app, tmp_path):
+    engine = create_pooled_engine("sqlite:///%s" % (tmp_path / "pool.db"), pool_size=2)
+    engine.execute("SELECT 1").scalar()
+    mocker.patch.dict("backend.dao.postgres_db.engines", {"primary": engine}, clear=True)
+
+    with login_disabled_app.test_client() as client:
+        response = client.get(
+            "api/stats/database-pool"
+        )
+
+    data = json.loads(response.data)
+    DatabasePoolStatsSchema().load(data)
+    assert response.status_code == 200
+    assert len(data["pools"]) == 1
+    assert data["pools"][0]["name"] == "primary"
+    assert data["pools"][0]["size"] == 2
+    assert data["pools"][0]["checkouts"] == 1
+
+
+@pytest.mark.parametrize(
+    "error,status_code",
+    [
+        (Exception(), 500)
+    ]
+)
+def test_database_pool_controller_error(mocker, login_disabled_app, error, status_code):
+    mocker.patch("backend.controller.api.stats.database_pool.DatabasePoolStatsResponse.marshall_json", side_effect=error)
+
+    with login_disabled_app.test_client() as client:
+        response = client.get(
+            "api/stats/database-pool"
+        )
+
+    data = json.loads(response.data)
+    ErrorSchema().load(data)
+    assert response.status_code == status_code
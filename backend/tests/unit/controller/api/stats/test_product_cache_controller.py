@@ -0,0 +1,59 @@
+import pytest
+from flask import json
+from unittest.mock import PropertyMock
+
+from backend.dao.willstores_ws import WillStoresWS
+from backend.dao.product_cache import ProductCache
+from backend.util.response.product_cache_stats import ProductCacheStatsSchema
+from backend.util.response.error import ErrorSchema
+
+
+def test_product_cache_controller(mocker, login_disabled_app):
+    cache = ProductCache()
+    cache.set_many([{"id": "id", "name": "string"}])
+    cache.get_many(["id", "other"])
+    mocker.patch.object(WillStoresWS, "cache", new_callable=PropertyMock, return_value=cache)
+
+    with login_disabled_app.test_client() as client:
+        response = client.get(
+            "api/stats/product-cache"
+        )
+
+    data = json.loads(response.data)
+    ProductCacheStatsSchema().load(data)
+    assert response.status_code == 200
+    assert data["entries"] == 1
+    assert data["hits"] == 1
+    assert data["misses"] == 1
+
+
+def test_product_cache_controller_disabled(mocker, login_disabled_app):
+    mocker.patch.object(WillStoresWS, "cache", new_callable=PropertyMock, return_value=None)
+
+    with login_disabled_app.test_client() as client:
+        response = client.get(
+            "api/stats/product-cache"
+        )
+
+    data = json.loads(response.data)
+    assert data == {}
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize(
+    "error,status_code",
+    [
+        (Exception(), 500)
+    ]
+)
+def test_product_cache_controller_error(mocker, login_disabled_app, error, status_code):
+    mocker.patch.object(WillStoresWS, "cache", new_callable=PropertyMock, side_effect=error)
+
+    with login_disabled_app.test_client() as client:
+        response = client.get(
+            "api/stats/product-cache"
+        )
+
+    data = json.loads(response.data)
+    ErrorSchema().load(data)
+    assert response.status_code == status_code
@@ -0,0 +1,58 @@
+import pytest
+import json
+from unittest.mock import MagicMock
+
+from backend.service import OrderService
+from backend.util.json_backend import json_backend
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+def test_json_backend_api(mocker, login_disabled_app, backend):
+    if backend == "orjson":
+        pytest.importorskip("orjson")
+
+    order = MagicMock(total={"outlet": 10.55, "retail": 20.9, "symbol": "£"})
+    order.to_dict.return_value = {"slug": "slug", "product_types": 1, "items_amount": 2, "updated_at": "2019-10-12 00:00:00"}
+    mocker.patch.object(OrderService, "__init__", return_value=None)
+    mocker.patch.object(OrderService, "select_version_by_user_slug", return_value=(None, 0))
+    select = mocker.patch.object(OrderService, "select_by_user_slug", return_value={"orders": [order], "total": 1, "pages": 1, "next_cursor": None})
+
+    json_backend.configure(backend)
+    try:
+        with login_disabled_app.test_client() as client:
+            response = client.post(
+                "api/order/user/WILLrogerPEREIRAslugBR",
+                data='{"page_size": 5, "datespan": {"start": "2019-10-20", "end": "2019-10-24"}}',
+                content_type="application/json"
+            )
+    finally:
+        json_backend.configure("json")
+
+    assert response.status_code == 200
+    assert select.call_args[1]["page_size"] == 5
+    indent = 4 if login_disabled_app.debug else None
+    assert response.data == (json.dumps(json.loads(response.data), indent=indent) + "\n").encode("utf-8")
+    assert b'"symbol": "\\u00a3"' in response.data
+
+
+def test_json_backend_api_encode(mocker, login_disabled_app):
+    pytest.importorskip("orjson")
+    order = MagicMock(total={"outlet": 10.55, "retail": 20.9, "symbol": "£"})
+    order.to_dict.return_value = {"slug": "slug", "product_types": 1, "items_amount": 2, "updated_at": "2019-10-12 00:00:00"}
+    mocker.patch.object(OrderService, "__init__", return_value=None)
+    mocker.patch.object(OrderService, "select_version_by_user_slug", return_value=(None, 0))
+    mocker.patch.object(OrderService, "select_by_user_slug", return_value={"orders": [order], "total": 1, "pages": 1, "next_cursor": None})
+
+    json_backend.configure("orjson", encode=True)
+    try:
+        with login_disabled_app.test_client() as client:
+            response = client.post(
+                "api/order/user/WILLrogerPEREIRAslugBR"
+            )
+    finally:
+        json_backend.configure("json")
+
+    assert response.status_code == 200
+    assert json.loads(response.data)["orders"][0]["total"]["symbol"] == "£"
+    assert '"£"'.encode("utf-8") in response.data
+    assert b"\\u00a3" not in response.data
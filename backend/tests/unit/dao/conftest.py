@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture(scope="session")
+def willstores_ws(flask_app):
+    return flask_app.config["WILLSTORES_WS"]
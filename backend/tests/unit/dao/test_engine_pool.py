@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy.exc import TimeoutError
+
+from backend.dao.engine_pool import PoolStats, create_pooled_engine
+
+
+def test_pool_stats():
+    stats = PoolStats()
+    stats.record_checkout(0.5)
+    stats.record_checkout(1.5)
+    stats.record_timeout()
+    stats.record_connect()
+    stats.record_fork_discard()
+
+    assert stats.stats() == {
+        "checkouts": 2,
+        "checkout_seconds": 2.0,
+        "max_checkout_seconds": 1.5,
+        "timeouts": 1,
+        "connects": 1,
+        "fork_discards": 1
+    }
+
+
+def test_pooled_engine(tmp_path):
+    engine = create_pooled_engine("sqlite:///%s" % (tmp_path / "pool.db"), pool_size=1, max_overflow=0, pool_timeout=0.1)
+
+    connection = engine.connect()
+    with pytest.raises(TimeoutError):
+        engine.connect()
+    connection.close()
+    engine.execute("SELECT 1").scalar()
+
+    status = engine.pool.status_dict()
+    assert (status["checkouts"], status["timeouts"], status["connects"]) == (3, 1, 1)
+    assert status["max_checkout_seconds"] >= 0.1
+    assert (status["size"], status["checked_in"], status["checked_out"]) == (1, 1, 0)
+
+    engine.dispose()
+    engine.execute("SELECT 1").scalar()
+
+    assert engine.pool.status_dict()["connects"] == 2
+
+
+def test_pooled_engine_fork(mocker, tmp_path):
+    engine = create_pooled_engine("sqlite:///%s" % (tmp_path / "pool.db"))
+    engine.execute("SELECT 1").scalar()
+    inherited = engine.pool._pool.queue[0].connection
+
+    mocker.patch("backend.dao.engine_pool.os.getpid", return_value=-1)
+    engine.execute("SELECT 1").scalar()
+
+    status = engine.pool.status_dict()
+    assert (status["connects"], status["fork_discards"]) == (2, 1)
+    assert inherited.execute("SELECT 1").fetchall() == [(1, )]
+    assert engine.pool._pool.queue[0].connection is not inherited
@@ -0,0 +1,14 @@
+import os
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+
+def test_migrations_single_head():
+    root = os.path.dirname(os.path.abspath(__file__))
+    for i in range(4):
+        root = os.path.dirname(root)
+
+    script = ScriptDirectory.from_config(Config(os.path.join(root, "alembic.ini")))
+
+    assert len(script.get_heads()) == 1
+    assert [revision.revision for revision in script.walk_revisions()][-1] == "0001"
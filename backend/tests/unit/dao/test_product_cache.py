@@ -0,0 +1,100 @@
+import pytest
+
+from backend.dao.product_cache import ProductCache
+
+
+@pytest.fixture(scope="function")
+def products():
+    return [
+        {"id": "id%s" % i, "name": "string", "price": {"outlet": 10.55, "retail": 20.9, "symbol": "£"}}
+        for i in range(5)
+    ]
+
+
+def test_product_cache_get_many(products):
+    cache = ProductCache()
+    found, missing = cache.get_many(["id0", "id1"])
+
+    assert found == {}
+    assert missing == ["id0", "id1"]
+
+    cache.set_many(products)
+    found, missing = cache.get_many(["id0", "id1", "id9"])
+
+    assert found == {"id0": products[0], "id1": products[1]}
+    assert missing == ["id9"]
+
+    stats = cache.stats()
+    assert stats["entries"] == 5
+    assert stats["hits"] == 2
+    assert stats["misses"] == 3
+    assert stats["evictions"] == 0
+
+
+def test_product_cache_copies(products):
+    cache = ProductCache()
+    cache.set_many(products)
+    products[0]["amount"] = 2
+
+    found, missing = cache.get_many(["id0"])
+    assert "amount" not in found["id0"]
+
+    found["id0"]["amount"] = 2
+    found, missing = cache.get_many(["id0"])
+    assert "amount" not in found["id0"]
+
+
+def test_product_cache_ttl(products):
+    cache = ProductCache(ttl=0)
+    cache.set_many(products)
+    found, missing = cache.get_many(["id0"])
+
+    assert found == {}
+    assert missing == ["id0"]
+
+    stats = cache.stats()
+    assert stats["entries"] == 4
+    assert stats["expirations"] == 1
+
+
+def test_product_cache_lru_eviction(products):
+    cache = ProductCache(max_entries=3)
+    cache.set_many(products[0:3])
+    cache.get_many(["id0"])
+    cache.set_many(products[3:5])
+
+    found, missing = cache.get_many(["id0", "id1", "id2", "id3", "id4"])
+    assert sorted(found.keys()) == ["id0", "id3", "id4"]
+    assert missing == ["id1", "id2"]
+
+    stats = cache.stats()
+    assert stats["entries"] == 3
+    assert stats["evictions"] == 2
+
+
+def test_product_cache_max_bytes(products):
+    cache = ProductCache()
+    cache.set_many(products[0:1])
+    entry_size = cache.stats()["bytes"]
+
+    cache = ProductCache(max_bytes=entry_size * 2)
+    cache.set_many(products)
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] <= entry_size * 2
+    assert stats["evictions"] == 3
+
+    cache = ProductCache(max_bytes=entry_size - 1)
+    cache.set_many(products)
+    assert cache.stats()["entries"] == 0
+
+
+def test_product_cache_clear(products):
+    cache = ProductCache()
+    cache.set_many(products)
+    cache.clear()
+
+    stats = cache.stats()
+    assert stats["entries"] == 0
+    assert stats["bytes"] == 0
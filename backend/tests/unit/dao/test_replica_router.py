@@ -0,0 +1,45 @@
+from unittest.mock import MagicMock
+
+from backend.dao.replica_router import ReplicaRouter
+
+
+def test_replica_router_disabled():
+    router = ReplicaRouter()
+    session = MagicMock()
+
+    assert router.mark_write(session) is None
+    assert router.enabled is False
+    assert router.can_read(session, "0/16B3748@%d" % (10 ** 10)) is False
+    session.execute.assert_not_called()
+
+
+def test_replica_router_read_your_writes(mocker):
+    router = ReplicaRouter()
+    router.configure(enabled=True, window=5)
+    primary = MagicMock()
+    primary.execute().scalar.return_value = "0/16B3748"
+    replica = MagicMock()
+    mocker.patch("backend.dao.replica_router.time", return_value=1000)
+
+    assert router.can_read(replica) is True
+    assert router.can_read(replica, "churros") is True
+    assert router.can_read(replica, "0'; DROP TABLE orders; --@2000") is True
+    replica.execute.assert_not_called()
+
+    token = router.mark_write(primary)
+
+    assert token == "0/16B3748@1005"
+    primary.commit.assert_called_once()
+
+    replica.execute().scalar.return_value = False
+    assert router.can_read(replica, token) is False
+
+    replica.execute().scalar.return_value = True
+    assert router.can_read(replica, token) is True
+
+    replica.execute().scalar.return_value = None
+    assert router.can_read(replica, token) is False
+
+    assert router.can_read(replica, "0/16B3748@1000") is True
+    assert router.can_read(replica, "ffffffff/ffffffff@9999999999") is True
+    assert router.can_read(replica, "0/16B3748@1006") is True
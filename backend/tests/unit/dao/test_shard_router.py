@@ -0,0 +1,37 @@
+from uuid import uuid4
+
+from backend.dao.shard_router import ShardRing, ShardRouter
+
+
+def test_shard_ring():
+    users = [uuid4() for _ in range(3000)]
+    ring = ShardRing(["a", "b", "c"])
+    placement = {user: ring.shard_for(user) for user in users}
+
+    reordered = ShardRing(["c", "b", "a"])
+    assert placement == {user: reordered.shard_for(user) for user in users}
+    for name in ["a", "b", "c"]:
+        assert 600 < list(placement.values()).count(name) < 1400
+
+    grown = ShardRing(["a", "b", "c", "d"])
+    moved = [user for user in users if grown.shard_for(user) != placement[user]]
+
+    assert all(grown.shard_for(user) == "d" for user in moved)
+    assert 400 < len(moved) < 1100
+
+
+def test_shard_router():
+    router = ShardRouter()
+
+    assert router.enabled is False
+    assert router.names == []
+
+    router.configure({"b": None, "a": None})
+
+    assert router.enabled is True
+    assert router.names == ["a", "b"]
+    assert router.shard_for(uuid4()) in ["a", "b"]
+
+    router.configure({})
+
+    assert router.enabled is False
@@ -0,0 +1,137 @@
+import pytest
+import responses
+import re
+from flask import json
+from requests import HTTPError
+
+from backend.dao.willstores_ws import WillStoresWS, willstores
+from backend.dao.product_cache import ProductCache
+
+
+@pytest.fixture(scope="module")
+def item_list():
+    return [{"item_id": "id", "amount": 2}]
+
+
+@pytest.fixture(scope="module")
+def willstores_response_json():
+    return {
+        "total": {
+            "outlet": 10.55,
+            "retail": 20.9,
+            "symbol": "£"
+        }
+    }
+
+
+def test_willstores_ws_app_client(flask_app):
+    with flask_app.app_context():
+        assert isinstance(willstores._get_current_object(), WillStoresWS)
+        assert willstores._get_current_object() is flask_app.extensions["willstores"]
+
+
+def test_willstores_ws_product_total(flask_app, willstores_ws, item_list, willstores_response_json):
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.POST, re.compile(willstores_ws),
+            status=200,
+            json=willstores_response_json
+        )
+
+        with flask_app.app_context():
+            result = willstores.product_total(item_list)
+
+        assert result == willstores_response_json
+        assert rsps.calls[0].request.url == "%s/api/product/total" % willstores_ws
+        assert rsps.calls[0].request.headers["Authorization"].startswith("Bearer ")
+        assert json.loads(rsps.calls[0].request.body) == {"item_list": item_list}
+
+
+def test_willstores_ws_product_list(flask_app, willstores_ws, item_list):
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.POST, re.compile(willstores_ws),
+            status=200,
+            json={"products": []}
+        )
+
+        with flask_app.app_context():
+            result = willstores.product_list(item_list)
+
+        assert result == {"products": []}
+        assert rsps.calls[0].request.url == "%s/api/product/list" % willstores_ws
+
+
+def test_willstores_ws_product_totals(flask_app, willstores_ws, item_list, willstores_response_json):
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.POST, re.compile(willstores_ws),
+            status=200,
+            json=willstores_response_json
+        )
+
+        with flask_app.app_context():
+            result = willstores.product_totals([item_list for i in range(5)])
+
+        assert result == [willstores_response_json for i in range(5)]
+        assert len(rsps.calls) == 5
+
+
+def test_willstores_ws_product_list_cache(flask_app, willstores_ws):
+    client = WillStoresWS(cache=ProductCache())
+    product_list = [
+        {"id": "id%s" % i, "name": "string", "image": "string", "price": {"outlet": 1.5, "retail": 3, "symbol": "£"}, "discount": 50}
+        for i in range(3)
+    ]
+
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.POST, re.compile(willstores_ws),
+            status=200,
+            json={"products": product_list[0:2]}
+        )
+        rsps.add(responses.POST, re.compile(willstores_ws),
+            status=200,
+            json={"products": product_list[2:3]}
+        )
+
+        with flask_app.app_context():
+            result = client.product_list([{"item_id": "id0", "amount": 1}, {"item_id": "id1", "amount": 2}])
+
+            assert result["products"] == product_list[0:2]
+            assert result["total"] == {"outlet": 4.5, "retail": 9, "symbol": "£"}
+
+            result = client.product_list([{"item_id": "id1", "amount": 1}, {"item_id": "id2", "amount": 1}])
+
+            assert result["products"] == product_list[1:3]
+            assert result["total"] == {"outlet": 3, "retail": 6, "symbol": "£"}
+
+            result = client.product_list([{"item_id": "id2", "amount": 1}, {"item_id": "id0", "amount": 1}])
+
+            assert result["products"] == [product_list[2], product_list[0]]
+
+        assert len(rsps.calls) == 2
+        assert json.loads(rsps.calls[1].request.body) == {"item_list": [{"item_id": "id2", "amount": 1}]}
+
+    stats = client.cache.stats()
+    assert stats["entries"] == 3
+    assert stats["hits"] == 3
+    assert stats["misses"] == 3
+
+
+@pytest.mark.parametrize(
+    "status_code",
+    [
+        (400),
+        (401),
+        (500),
+        (502),
+        (504)
+    ]
+)
+def test_willstores_ws_http_error(flask_app, willstores_ws, item_list, status_code):
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.POST, re.compile(willstores_ws),
+            status=status_code,
+            json={"error": "error message"}
+        )
+
+        with flask_app.app_context():
+            with pytest.raises(HTTPError):
+                willstores.product_list(item_list)
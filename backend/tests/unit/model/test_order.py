@@ -1,5 +1,6 @@
 import pytest
 from uuid import uuid4
+from datetime import datetime
 from sqlalchemy.exc import IntegrityError, DataError
 
 from backend.model import Product, Order, OrderProduct
@@ -151,3 +152,98 @@ def test_order_dict(db_session):
 
     assert item_dict["item_id"] == item.product.es_id
     assert item_dict["amount"] == 2
+
+
+def test_order_total(db_session):
+    obj = OrderFactory.create()
+    db_session.commit()
+
+    assert obj.total is None
+
+    total = {"outlet": 10.55, "retail": 20.9, "symbol": "£"}
+    obj = OrderFactory.create(total=total)
+    db_session.commit()
+
+    obj = db_session.query(Order).filter(Order.id == obj.id).one()
+    assert obj.total == total
+
+
+def test_order_product_snapshot(db_session):
+    order = OrderFactory.create()
+    product = ProductFactory.create()
+    item = OrderProduct(order=order, product=product, amount=2)
+    db_session.commit()
+
+    assert item.snapshot is None
+
+    snapshot = {
+        "id": product.es_id,
+        "name": "string",
+        "image": "string",
+        "price": {"outlet": 10.55, "retail": 20.9, "symbol": "£"},
+        "discount": 80.5
+    }
+    item.set_snapshot(snapshot)
+    db_session.commit()
+
+    item = db_session.query(OrderProduct).filter(OrderProduct.order_id == order.id).one()
+    assert item.snapshot == snapshot
+    assert item.snapshot_at is not None
+
+
+def test_order_indexes():
+    order_indexes = {index.name: [str(expression) for expression in index.expressions] for index in Order.__table__.indexes}
+    assert order_indexes["ix_orders_user_uuid_updated_at_id"] == ["orders.user_uuid", "orders.updated_at DESC", "orders.id DESC"]
+
+    item_indexes = {index.name for index in OrderProduct.__table__.indexes}
+    assert "ix_order_product_product_id" in item_indexes
+
+
+def test_order_item_aggregates(db_session):
+    obj = OrderFactory.create()
+    prod_list = ProductFactory.create_batch(3)
+    for p in prod_list:
+        OrderProduct(order=obj, product=p, amount=2)
+
+    db_session.commit()
+
+    assert (obj.product_types, obj.items_amount) == (3, 6)
+
+    obj.items[0].amount = 5
+    db_session.commit()
+
+    assert (obj.product_types, obj.items_amount) == (3, 9)
+
+    db_session.query(OrderProduct).filter(OrderProduct.product_id == prod_list[0].id).delete()
+    db_session.commit()
+
+    assert (obj.product_types, obj.items_amount) == (2, 4)
+
+
+def test_order_partitions(db_session):
+    db_session.execute("CREATE TABLE orders_y2001m01 PARTITION OF orders FOR VALUES FROM ('2001-01-01') TO ('2001-02-01')")
+    db_session.execute("CREATE TABLE order_product_y2001m01 PARTITION OF order_product FOR VALUES FROM ('2001-01-01') TO ('2001-02-01')")
+
+    current = OrderFactory.create()
+    archived = OrderFactory.create()
+    archived.created_at = datetime(2001, 1, 15)
+    product = ProductFactory.create()
+    for obj in [current, archived]:
+        OrderProduct(order=obj, product=product, amount=1)
+
+    db_session.commit()
+
+    assert archived.items[0].order_created_at == archived.created_at
+    rows = db_session.execute("SELECT tableoid::regclass::text, id FROM orders").fetchall()
+    assert sorted(rows) == sorted([("orders_default", current.id), ("orders_y2001m01", archived.id)])
+    rows = db_session.execute("SELECT tableoid::regclass::text, order_id FROM order_product").fetchall()
+    assert sorted(rows) == sorted([("order_product_default", current.id), ("order_product_y2001m01", archived.id)])
+
+    rows = db_session.execute("SELECT uuid, order_id, created_at FROM order_uuids").fetchall()
+    assert sorted(rows) == sorted([(obj.uuid, obj.id, obj.created_at) for obj in [current, archived]])
+
+    db_session.query(Order).filter(Order.id == current.id).delete()
+    db_session.commit()
+
+    rows = db_session.execute("SELECT uuid FROM order_uuids").fetchall()
+    assert rows == [(archived.uuid, )]
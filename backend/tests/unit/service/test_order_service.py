@@ -1,12 +1,18 @@
 import pytest
 from unittest.mock import MagicMock
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
+from uuid import uuid4
 from sqlalchemy.exc import DataError, DatabaseError
 
 from backend.service import OrderService
 from backend.errors.no_content_error import NoContentError
 from backend.errors.not_found_error import NotFoundError
-from backend.errors.request_error import SlugDecodeError
+from backend.errors.request_error import SlugDecodeError, CursorDecodeError
+from backend.util.cursor import encode_cursor, decode_cursor
+
+
+def order_row(order_id, total_outlet=10.55):
+    return (order_id, uuid4(), datetime(2019, 10, 10), datetime(2019, 10, 12), 1, 2, total_outlet, 20.9, "£")
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -21,10 +27,10 @@ def service():
 
 
 def test_order_service_select_by_slug(service):
-    service.db_session.query().filter().filter().one_or_none.return_value = MagicMock(autospec=True)
+    service.db_session.query().options().filter().filter().one_or_none.return_value = MagicMock(autospec=True)
     service.select_by_slug(user_slug="WILLrogerPEREIRAslugBR", order_slug="WILLrogerPEREIRAslugBR")
 
-    service.db_session.query().filter().filter().one_or_none.return_value = None
+    service.db_session.query().options().filter().filter().one_or_none.return_value = None
     with pytest.raises(NotFoundError):
         service.select_by_slug(user_slug="WILLrogerPEREIRAslugBR", order_slug="WILLrogerPEREIRAslugBR")
 
@@ -33,20 +39,20 @@ def test_order_service_select_by_slug(service):
 
 
 def test_order_service_select_by_user_slug(service):
-    service.db_session.query().filter().order_by().count.return_value = 10
-    service.db_session.query().filter().order_by().limit().offset().all.return_value = [MagicMock(autospec=True) for i in range(10)]
+    service.db_session.query().filter().order_by().add_columns().limit().offset().all.return_value = [order_row(i) + (10, ) for i in range(10)]
     result = service.select_by_user_slug(user_slug="WILLrogerPEREIRAslugBR")
 
     assert len(result["orders"]) == 10
     assert result["total"] == 10
     assert result["pages"] == 1
+    assert result["next_cursor"] is None
 
     result = service.select_by_user_slug(user_slug="WILLrogerPEREIRAslugBR", page_size=3)
 
     assert result["pages"] == 4
+    assert decode_cursor(result["next_cursor"]) == (datetime(2019, 10, 12), 9)
 
-    service.db_session.query().filter().filter().order_by().count.return_value = 5
-    service.db_session.query().filter().filter().order_by().limit().offset().all.return_value = [MagicMock(autospec=True) for i in range(5)]
+    service.db_session.query().filter().filter().order_by().add_columns().limit().offset().all.return_value = [order_row(i) + (5, ) for i in range(5)]
 
     result = service.select_by_user_slug(user_slug="WILLrogerPEREIRAslugBR", datespan={"start": date.today() - timedelta(days=1), "end": date.today() + timedelta(days=1)})
 
@@ -54,8 +60,7 @@ def test_order_service_select_by_user_slug(service):
     assert result["total"] == 5
     assert result["pages"] == 1
 
-    service.db_session.query().filter().order_by().count.return_value = 0
-    service.db_session.query().filter().order_by().limit().offset().all.return_value = []
+    service.db_session.query().filter().order_by().add_columns().limit().offset().all.return_value = []
 
     with pytest.raises(NoContentError):
         service.select_by_user_slug(user_slug="WILLrogerPEREIRAslugBR")
@@ -66,32 +71,110 @@ def test_order_service_select_by_user_slug(service):
     with pytest.raises(TypeError):
         result = service.select_by_user_slug(user_slug="WILLrogerPEREIRAslugBR", datespan={"start": "will", "end": "roger"})
 
-    service.db_session.query().filter().order_by().limit().offset().all.side_effect = DataError("statement", "params", "DETAIL:  orig\n")
+    service.db_session.query().filter().order_by().add_columns().limit().offset().all.side_effect = DataError("statement", "params", "DETAIL:  orig\n")
 
     with pytest.raises(DataError):
         service.select_by_user_slug(user_slug="WILLrogerPEREIRAslugBR")
 
 
+def test_order_service_select_by_user_slug_without_total(service):
+    service.db_session.query().filter().order_by().limit().offset().all.return_value = [order_row(i) for i in range(4)]
+    result = service.select_by_user_slug(user_slug="WILLrogerPEREIRAslugBR", page_size=3, with_total=False)
+
+    assert len(result["orders"]) == 3
+    assert "total" not in result
+    assert "pages" not in result
+    assert decode_cursor(result["next_cursor"]) == (datetime(2019, 10, 12), 2)
+
+    result = service.select_by_user_slug(user_slug="WILLrogerPEREIRAslugBR", page_size=4, with_total=False)
+
+    assert len(result["orders"]) == 4
+    assert result["next_cursor"] is None
+
+    service.db_session.query().filter().order_by().limit().offset().all.return_value = []
+
+    with pytest.raises(NoContentError):
+        service.select_by_user_slug(user_slug="WILLrogerPEREIRAslugBR", with_total=False)
+
+    service.db_session.query().filter().order_by().limit().offset().all.return_value = [order_row(i) for i in range(2)]
+    service.db_session.query().join().filter().all.return_value = [(0, "id", 2), (1, "id", 3), (1, "other", 1)]
+    result = service.select_by_user_slug(user_slug="WILLrogerPEREIRAslugBR", with_total=False, with_items=True)
+
+    assert len(result["orders"]) == 2
+    assert [item.to_dict() for item in result["orders"][1].items] == [{"item_id": "id", "amount": 3}, {"item_id": "other", "amount": 1}]
+    assert result["orders"][0].to_dict()["items_amount"] == 2
+    assert result["orders"][0].total == {"outlet": 10.55, "retail": 20.9, "symbol": "£"}
+
+
+def test_order_service_select_by_user_slug_cursor(service):
+    cursor = encode_cursor(datetime(2019, 10, 12), 20)
+    service.db_session.query().filter().filter().order_by().limit().offset().all.return_value = [order_row(i) for i in range(19, 15, -1)]
+    result = service.select_by_user_slug(user_slug="WILLrogerPEREIRAslugBR", page_size=3, cursor=cursor)
+
+    assert len(result["orders"]) == 3
+    assert "total" not in result
+    assert decode_cursor(result["next_cursor"]) == (datetime(2019, 10, 12), 17)
+
+    result = service.select_by_user_slug(user_slug="WILLrogerPEREIRAslugBR", page_size=4, cursor=cursor)
+
+    assert len(result["orders"]) == 4
+    assert result["next_cursor"] is None
+
+    service.db_session.query().filter().filter().order_by().limit().offset().all.return_value = []
+
+    with pytest.raises(NoContentError):
+        service.select_by_user_slug(user_slug="WILLrogerPEREIRAslugBR", cursor=cursor)
+
+    with pytest.raises(CursorDecodeError):
+        service.select_by_user_slug(user_slug="WILLrogerPEREIRAslugBR", cursor="churros")
+
+
 def test_order_service_insert(service):
-    service.db_session.query().filter().one_or_none.return_value = None
+    service.db_session.query().filter().all.return_value = []
+    service.db_session.execute().fetchall.return_value = [("id", 1)]
 
     result = service.insert(user_slug="WILLrogerPEREIRAslugBR", item_list=[{"item_id": "id", "amount": 2}])
     assert result is True
 
-    service.db_session.query().filter().one_or_none.return_value = MagicMock(autospec=True)
+    service.db_session.execute().fetchall.return_value = []
+    service.db_session.query().filter().all.return_value = [("id", 1)]
 
     result = service.insert(user_slug="WILLrogerPEREIRAslugBR", item_list=[{"item_id": "id", "amount": 2}])
     assert result is True
 
+    result = service.insert(user_slug="WILLrogerPEREIRAslugBR", item_list=[{"item_id": "id", "amount": 2}], total={"outlet": 10.55, "retail": 20.9, "symbol": "£"})
+    assert result is True
+
+    products = [{"id": "id", "name": "string", "image": "string", "price": {"outlet": 10.55, "retail": 20.9, "symbol": "£"}, "discount": 80.5}]
+    result = service.insert(user_slug="WILLrogerPEREIRAslugBR", item_list=[{"item_id": "id", "amount": 2}], products=products)
+    assert result is True
+
     with pytest.raises(SlugDecodeError):
         result = service.insert(user_slug="churros", item_list=[{"item_id": "id", "amount": 2}])
 
-    service.db_session.query().filter().one_or_none.side_effect = DatabaseError("statement", "params", "DETAIL:  orig\n"),
+    service.db_session.query().filter().all.side_effect = DatabaseError("statement", "params", "DETAIL:  orig\n"),
 
     with pytest.raises(DatabaseError):
         service.insert(user_slug="WILLrogerPEREIRAslugBR", item_list=[{"item_id": "id", "amount": 2}])
 
 
+def test_order_service_refresh_snapshots(service):
+    mock_item = MagicMock()
+    mock_item.product.es_id = "id"
+    mock_order = MagicMock()
+    mock_order.items = [mock_item]
+    service.db_session.query().options().filter().filter().one_or_none.return_value = mock_order
+
+    products = [{"id": "id", "name": "string", "image": "string", "price": {"outlet": 10.55, "retail": 20.9, "symbol": "£"}, "discount": 80.5}]
+    result = service.refresh_snapshots(user_slug="WILLrogerPEREIRAslugBR", order_slug="WILLrogerPEREIRAslugBR", products=products)
+    assert result is True
+    mock_item.set_snapshot.assert_called_once_with(products[0])
+
+    service.db_session.query().options().filter().filter().one_or_none.return_value = None
+    with pytest.raises(NotFoundError):
+        service.refresh_snapshots(user_slug="WILLrogerPEREIRAslugBR", order_slug="WILLrogerPEREIRAslugBR", products=products)
+
+
 def test_order_service_delete(service):
     service.db_session.query().filter().filter().delete.return_value = True
     result = service.delete(user_slug="WILLrogerPEREIRAslugBR", order_slug="WILLrogerPEREIRAslugBR")
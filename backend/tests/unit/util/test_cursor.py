@@ -0,0 +1,22 @@
+import pytest
+from datetime import datetime
+
+from backend.util.cursor import encode_cursor, decode_cursor
+from backend.errors.request_error import CursorDecodeError
+
+
+def test_cursor_encode_decode():
+    updated_at = datetime(2019, 10, 12, 10, 30, 15, 123456)
+    cursor = encode_cursor(updated_at, 42)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (updated_at, 42)
+
+    with pytest.raises(CursorDecodeError):
+        decode_cursor("churros")
+
+    with pytest.raises(CursorDecodeError):
+        decode_cursor(encode_cursor(updated_at, 42)[:-4])
+
+    with pytest.raises(CursorDecodeError):
+        decode_cursor("WyJjaHVycm9zIiwgMV0")
@@ -0,0 +1,55 @@
+import pytest
+import json
+from decimal import Decimal
+
+from backend.util.json_backend import JSONBackend, BackendJSONDecoder, json_backend
+
+
+def test_json_backend():
+    backend = JSONBackend()
+
+    assert backend.name == "json"
+    assert backend.loads(b'{"symbol": "\\u00a3", "amount": 2}') == {"symbol": "£", "amount": 2}
+    assert backend.dumps({"symbol": "£", "amount": 2}) == '{"symbol": "\\u00a3", "amount": 2}'
+
+    with pytest.raises(ValueError):
+        backend.configure("churros")
+
+    assert backend.name == "json"
+
+
+def test_json_backend_orjson():
+    pytest.importorskip("orjson")
+    backend = JSONBackend()
+    backend.configure("orjson")
+
+    assert backend.name == "orjson"
+    assert backend.loads('{"symbol": "£", "price": 10.55, "items": [1, null]}') == {"symbol": "£", "price": 10.55, "items": [1, None]}
+    assert backend.dumps({"symbol": "£", "amount": 2}) == json.dumps({"symbol": "£", "amount": 2})
+
+    with pytest.raises(ValueError):
+        backend.loads("{churros}")
+
+
+def test_json_backend_orjson_encode():
+    pytest.importorskip("orjson")
+    backend = JSONBackend()
+    backend.configure("orjson", encode=True)
+
+    data = {"symbol": "£", "price": Decimal("10.55"), "items": [1, None]}
+    assert backend.dumps(data, separators=(", ", ": ")) == '{"symbol":"£","price":10.55,"items":[1,null]}'
+    assert json.loads(backend.dumps(data, indent=4)) == json.loads(backend.dumps(data))
+    assert "\n" in backend.dumps(data, indent=4)
+
+    with pytest.raises(TypeError):
+        backend.dumps({"churros": object()})
+
+    backend.configure("json", encode=True)
+    assert backend.dumps(data["items"]) == "[1, null]"
+
+
+def test_backend_json_decoder(mocker):
+    loads = mocker.patch.object(json_backend, "loads", return_value={"page": 1})
+
+    assert json.loads('{"page": 1}', cls=BackendJSONDecoder) == {"page": 1}
+    loads.assert_called_once_with('{"page": 1}')
@@ -0,0 +1,38 @@
+import pytest
+
+from backend.util.price import sum_total
+
+
+@pytest.fixture(scope="module")
+def products():
+    return [
+        {"id": "first", "price": {"outlet": 10.55, "retail": 20.9, "symbol": "£"}},
+        {"id": "second", "price": {"outlet": 1.1, "retail": 2.2, "symbol": "£"}}
+    ]
+
+
+def test_sum_total(products):
+    total = sum_total([{"item_id": "first", "amount": 2}, {"item_id": "second", "amount": 3}], products)
+
+    assert total["outlet"] == 24.4
+    assert total["retail"] == 48.4
+    assert total["symbol"] == "£"
+
+    total = sum_total([{"item_id": "second", "amount": 1}], products)
+
+    assert total["outlet"] == 1.1
+    assert total["retail"] == 2.2
+    assert total["symbol"] == "£"
+
+
+def test_sum_total_empty(products):
+    total = sum_total([], products)
+
+    assert total["outlet"] == 0
+    assert total["retail"] == 0
+    assert total["symbol"] == ""
+
+
+def test_sum_total_missing_product(products):
+    with pytest.raises(KeyError):
+        sum_total([{"item_id": "third", "amount": 1}], products)
@@ -0,0 +1,43 @@
+from backend.util.response.order import OrderResponse
+from backend.util.response.user_orders import UserOrdersResponse
+
+
+def test_user_orders_response():
+    order = {
+        "slug": "slug",
+        "created_at": "2019-10-10 00:00:00",
+        "updated_at": "2019-10-12 00:00:00",
+        "product_types": 2,
+        "items_amount": 3,
+        "total": {"outlet": 10.55, "retail": 20.9, "symbol": "£"}
+    }
+
+    jsonsend = UserOrdersResponse.marshall_json({"orders": [order] * 100, "total": 100, "pages": 1, "next_cursor": None})
+
+    assert jsonsend["orders"] == [{key: value for key, value in order.items() if key != "created_at"}] * 100
+    assert (jsonsend["total"], jsonsend["pages"], jsonsend["next_cursor"]) == (100, 1, None)
+
+
+def test_order_response():
+    product = {
+        "id": "id",
+        "name": "name",
+        "image": "image",
+        "price": {"outlet": "10.55", "retail": 20.9, "symbol": "£"},
+        "discount": 80.5,
+        "amount": 2,
+        "kind": "unsent"
+    }
+
+    jsonsend = OrderResponse.marshall_json({
+        "slug": "slug",
+        "product_types": 1,
+        "items_amount": 2,
+        "total": {"outlet": 21.1, "retail": 41.8, "symbol": "£"},
+        "products": [product],
+        "updated_at": "2019-10-12 00:00:00",
+        "items": []
+    })
+
+    assert set(jsonsend) == {"slug", "product_types", "items_amount", "total", "products", "updated_at"}
+    assert jsonsend["products"] == [{"id": "id", "name": "name", "image": "image", "price": {"outlet": 10.55, "retail": 20.9, "symbol": "£"}, "discount": 80, "amount": 2}]
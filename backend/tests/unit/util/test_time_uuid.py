@@ -0,0 +1,30 @@
+from uuid import UUID, RFC_4122
+
+from backend.util.slug import slug_to_uuid, uuid_to_slug
+from backend.util.time_uuid import uuid7, UUIDFactory
+
+
+def test_uuid7(mocker):
+    mocker.patch("backend.util.time_uuid.time", side_effect=[1571000000.001, 1571000000.002, 1571000000.002, 1571000060])
+    uuid_list = [uuid7() for i in range(4)]
+
+    assert uuid_list[0] < uuid_list[1] < uuid_list[3]
+    assert uuid_list[2] != uuid_list[1]
+    assert uuid_list[1].int >> 80 == uuid_list[2].int >> 80 == 1571000000002
+    for uuid_value in uuid_list:
+        assert uuid_value.version == 7
+        assert uuid_value.variant == RFC_4122
+        assert slug_to_uuid(uuid_to_slug(uuid_value)) == uuid_value
+
+
+def test_uuid_factory():
+    factory = UUIDFactory()
+
+    assert factory.time_ordered is True
+    assert factory().version == 7
+
+    factory.configure(time_ordered=False)
+
+    assert factory.time_ordered is False
+    assert type(factory()) is UUID
+    assert factory().version == 4
@@ -0,0 +1,33 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from ...errors.request_error import CursorDecodeError
+
+
+def encode_cursor(updated_at: datetime, order_id: int) -> str:
+    """Convert the listing sort key of an order to an opaque URL safe cursor.
+    :param updated_at: Order update datetime
+    :param order_id: Order primary key, breaks ties between equal datetimes
+    :return: Base64 string like 'WyIyMDE5LTEwLTEyVDAwOjAwOjAwIiwgMV0'
+    """
+
+    encoded = base64.urlsafe_b64encode(json.dumps([updated_at.isoformat(), order_id]).encode("utf-8"))
+    return encoded.decode("utf-8").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Convert a cursor created by `encode_cursor` back to the listing sort key.
+    :param cursor: Base64 string presentation of the sort key
+    :raise: CursorDecodeError if the cursor is not a well-formed listing cursor
+    """
+
+    try:
+        updated_at, order_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if type(order_id) is not int:
+            raise ValueError("Invalid order id.")
+
+        return datetime.fromisoformat(updated_at), order_id
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise CursorDecodeError("Cannot decode supposed listing cursor: {}".format(cursor)) from e
@@ -0,0 +1,26 @@
+from typing import List
+
+
+def sum_total(item_list: List[dict], products: List[dict]) -> dict:
+    """Compute the outlet and retail totals of an item list from WillStores product data.
+    :param item_list: Items like {"item_id": "id", "amount": 2}
+    :param products: Products as returned by WillStores /api/product/list, which must contain every item_id
+    :return: Total like {"outlet": 21.1, "retail": 41.8, "symbol": "£"}
+    """
+
+    prices = {product["id"]: product["price"] for product in products}
+    outlet = 0.0
+    retail = 0.0
+    symbol = ""
+
+    for item in item_list:
+        price = prices[item["item_id"]]
+        outlet += price["outlet"] * item["amount"]
+        retail += price["retail"] * item["amount"]
+        symbol = price["symbol"]
+
+    return {
+        "outlet": round(outlet, 2),
+        "retail": round(retail, 2),
+        "symbol": symbol
+    }
@@ -5,6 +5,9 @@ from ..models.order_item import OrderItemRequest
 from .order_insert_schema import OrderInsertSchema
 
 
+ORDER_INSERT_SCHEMA = OrderInsertSchema()
+
+
 class OrderInsertRequest(object):
     @staticmethod
     def get_model(api, name):
@@ -19,6 +22,5 @@ class OrderInsertRequest(object):
     @staticmethod
     def parse_json():
         jsonrecv = request.get_json()
-        schema = OrderInsertSchema()
-        in_data = schema.load(jsonrecv)
+        in_data = ORDER_INSERT_SCHEMA.load(jsonrecv)
         return in_data
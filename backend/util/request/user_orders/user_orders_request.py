@@ -5,6 +5,9 @@ from .user_orders_schema import UserOrdersSchema
 from ..models.datespan import DatespanRequest
 
 
+USER_ORDERS_SCHEMA = UserOrdersSchema()
+
+
 class UserOrdersRequest(object):
     @staticmethod
     def get_model(api, name):
@@ -12,8 +15,11 @@ class UserOrdersRequest(object):
             name,
             {
                 "page": fields.Integer(description="Page requested.", default=1),
+                "cursor": fields.String(description="Opaque cursor from a previous 'next_cursor', requests the following page. Cannot be used with 'page'."),
+                "with_total": fields.Boolean(description="Send 'total' and 'pages'. Disable it when the amount of results is not needed.", default=True),
                 "page_size": fields.Integer(description="Amount of results per page.", default=10),
-                "datespan": fields.Nested(DatespanRequest.get_model(api, "DatespanRequest"), description="Search date interval.")
+                "datespan": fields.Nested(DatespanRequest.get_model(api, "DatespanRequest"), description="Search date interval."),
+                "live_price": fields.Boolean(description="Price the orders with the current WillStores prices instead of the ones stored on insert.", default=False)
             }
         )
 
@@ -21,8 +27,16 @@ class UserOrdersRequest(object):
     def parse_json():
         jsonrecv = request.get_json()
         if jsonrecv is not None:
-            schema = UserOrdersSchema()
-            in_data = schema.load(jsonrecv)
+            in_data = USER_ORDERS_SCHEMA.load(jsonrecv)
             return in_data
         else:
             return {}
+
+    @staticmethod
+    def parse_args():
+        argsrecv = request.args.to_dict()
+        if "start" in argsrecv or "end" in argsrecv:
+            argsrecv["datespan"] = {key: argsrecv.pop(key) for key in ("start", "end") if key in argsrecv}
+
+        in_data = USER_ORDERS_SCHEMA.load(argsrecv)
+        return in_data
@@ -1,7 +1,8 @@
 
-from marshmallow import Schema, fields, validates
+from marshmallow import Schema, fields, validates, validates_schema
 
 from backend.errors.request_error import ValidationError
+from backend.util.cursor import decode_cursor
 from ..models.datespan import DatespanSchema
 
 
@@ -9,6 +10,9 @@ class UserOrdersSchema(Schema):
     page = fields.Integer()
     page_size = fields.Integer()
     datespan = fields.Nested(DatespanSchema)
+    live_price = fields.Boolean()
+    cursor = fields.String()
+    with_total = fields.Boolean()
 
     @validates("page")
     def validate_page(self, value, **kwargs):
@@ -21,3 +25,12 @@ class UserOrdersSchema(Schema):
             raise ValidationError("'page_size' must be a natural positive number.")
         elif value > 100:
             raise ValidationError("'page_size' must be a natural positive number.")
+
+    @validates("cursor")
+    def validate_cursor(self, value, **kwargs):
+        decode_cursor(value)
+
+    @validates_schema
+    def validate_pagination(self, data, **kwargs):
+        if "page" in data and "cursor" in data:
+            raise ValidationError("'page' and 'cursor' cannot be used together.")
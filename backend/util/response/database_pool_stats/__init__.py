@@ -0,0 +1,2 @@
+from .database_pool_stats_response import DatabasePoolStatsResponse
+from .database_pool_stats_schema import DatabasePoolStatsSchema
@@ -0,0 +1,40 @@
+from flask_restplus import fields
+
+from .database_pool_stats_schema import DatabasePoolStatsSchema
+
+
+DATABASE_POOL_STATS_SCHEMA = DatabasePoolStatsSchema()
+
+
+class DatabasePoolStatsResponse(object):
+    @staticmethod
+    def get_model(api, name):
+        pool_model = api.model(
+            "PoolStatsResponse",
+            {
+                "name": fields.String(description="Engine name: primary, replica or shard:<name>", required=True),
+                "size": fields.Integer(description="Configured pool size", required=True),
+                "checked_in": fields.Integer(description="Idle connections kept by the pool", required=True),
+                "checked_out": fields.Integer(description="Connections in use", required=True),
+                "overflow": fields.Integer(description="Connections opened beyond the pool size, negative while the pool is not full", required=True),
+                "checkouts": fields.Integer(description="Connection checkouts", required=True),
+                "checkout_seconds": fields.Float(description="Total time spent checking out connections, waits included", required=True),
+                "max_checkout_seconds": fields.Float(description="Slowest checkout", required=True),
+                "timeouts": fields.Integer(description="Checkouts that gave up waiting for a connection", required=True),
+                "connects": fields.Integer(description="Database connections opened", required=True),
+                "fork_discards": fields.Integer(description="Connections inherited through a fork and discarded", required=True)
+            }
+        )
+
+        return api.model(
+            name,
+            {
+                "pools": fields.List(fields.Nested(pool_model), required=True)
+            }
+        )
+
+    @staticmethod
+    def marshall_json(dict_out):
+        data_out = dict_out
+        jsonsend = DATABASE_POOL_STATS_SCHEMA.dump(data_out)
+        return jsonsend
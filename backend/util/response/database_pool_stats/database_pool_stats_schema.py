@@ -0,0 +1,19 @@
+from marshmallow import Schema, fields
+
+
+class PoolStatsSchema(Schema):
+    name = fields.String(required=True)
+    size = fields.Integer(required=True)
+    checked_in = fields.Integer(required=True)
+    checked_out = fields.Integer(required=True)
+    overflow = fields.Integer(required=True)
+    checkouts = fields.Integer(required=True)
+    checkout_seconds = fields.Float(required=True)
+    max_checkout_seconds = fields.Float(required=True)
+    timeouts = fields.Integer(required=True)
+    connects = fields.Integer(required=True)
+    fork_discards = fields.Integer(required=True)
+
+
+class DatabasePoolStatsSchema(Schema):
+    pools = fields.Nested(PoolStatsSchema, required=True, many=True)
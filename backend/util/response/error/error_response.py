@@ -4,6 +4,9 @@ from flask import json
 from .error_schema import ErrorSchema
 
 
+ERROR_SCHEMA = ErrorSchema()
+
+
 class ErrorResponse(object):
     @staticmethod
     def get_model(api, name):
@@ -17,7 +20,6 @@ class ErrorResponse(object):
     @staticmethod
     def parse_HTTPError(content):
         jsonrecv = json.loads(content)
-        schema = ErrorSchema()
-        jsonsend = schema.load(jsonrecv)
+        jsonsend = ERROR_SCHEMA.load(jsonrecv)
         error = jsonsend["error"]
         return error
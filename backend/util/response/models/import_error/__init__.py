@@ -0,0 +1,2 @@
+from .import_error_response import ImportErrorResponse
+from .import_error_schema import ImportErrorSchema
@@ -0,0 +1,14 @@
+from flask_restplus import fields
+
+
+class ImportErrorResponse(object):
+    @staticmethod
+    def get_model(api, name):
+        return api.model(
+            name,
+            {
+                "first_line": fields.Integer(description="First line of the failed batch", example=1),
+                "last_line": fields.Integer(description="Last line of the failed batch", example=5000),
+                "error": fields.String(description="Reason the batch was rejected")
+            }
+        )
@@ -0,0 +1,7 @@
+from marshmallow import Schema, fields
+
+
+class ImportErrorSchema(Schema):
+    first_line = fields.Integer(required=True)
+    last_line = fields.Integer(required=True)
+    error = fields.String(required=True)
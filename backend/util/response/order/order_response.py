@@ -5,6 +5,9 @@ from ..models.product import ProductResponse
 from .order_schema import OrderSchema
 
 
+ORDER_SCHEMA = OrderSchema()
+
+
 class OrderResponse(object):
     @staticmethod
     def get_model(api, name):
@@ -23,6 +26,5 @@ class OrderResponse(object):
     @staticmethod
     def marshall_json(dict_out):
         data_out = dict_out
-        schema = OrderSchema()
-        jsonsend = schema.load(data_out)
+        jsonsend = ORDER_SCHEMA.dump(data_out)
         return jsonsend
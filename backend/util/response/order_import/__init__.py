@@ -0,0 +1,2 @@
+from .order_import_response import OrderImportResponse
+from .order_import_schema import OrderImportSchema
@@ -0,0 +1,26 @@
+from flask_restplus import fields
+
+from ..models.import_error import ImportErrorResponse
+from .order_import_schema import OrderImportSchema
+
+
+ORDER_IMPORT_SCHEMA = OrderImportSchema()
+
+
+class OrderImportResponse(object):
+    @staticmethod
+    def get_model(api, name):
+        return api.model(
+            name,
+            {
+                "imported": fields.Integer(description="Orders imported", required=True),
+                "failed": fields.Integer(description="Orders in rejected batches", required=True),
+                "errors": fields.List(fields.Nested(ImportErrorResponse.get_model(api, "ImportErrorResponse")), required=True)
+            }
+        )
+
+    @staticmethod
+    def marshall_json(dict_out):
+        data_out = dict_out
+        jsonsend = ORDER_IMPORT_SCHEMA.dump(data_out)
+        return jsonsend
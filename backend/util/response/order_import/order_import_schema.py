@@ -0,0 +1,9 @@
+from marshmallow import Schema, fields
+
+from ..models.import_error import ImportErrorSchema
+
+
+class OrderImportSchema(Schema):
+    imported = fields.Integer(required=True)
+    failed = fields.Integer(required=True)
+    errors = fields.Nested(ImportErrorSchema, required=True, many=True)
@@ -0,0 +1,2 @@
+from .product_cache_stats_response import ProductCacheStatsResponse
+from .product_cache_stats_schema import ProductCacheStatsSchema
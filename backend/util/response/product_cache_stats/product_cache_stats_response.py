@@ -0,0 +1,30 @@
+from flask_restplus import fields
+
+from .product_cache_stats_schema import ProductCacheStatsSchema
+
+
+PRODUCT_CACHE_STATS_SCHEMA = ProductCacheStatsSchema()
+
+
+class ProductCacheStatsResponse(object):
+    @staticmethod
+    def get_model(api, name):
+        return api.model(
+            name,
+            {
+                "entries": fields.Integer(description="Cached products", required=True),
+                "bytes": fields.Integer(description="Approximate size of the cached products", required=True),
+                "max_entries": fields.Integer(description="Cached products limit", required=True),
+                "max_bytes": fields.Integer(description="Cached products size limit", required=True),
+                "hits": fields.Integer(description="Lookups served from the cache", required=True),
+                "misses": fields.Integer(description="Lookups requested from WillStores", required=True),
+                "evictions": fields.Integer(description="Products evicted to respect the limits", required=True),
+                "expirations": fields.Integer(description="Products dropped after their TTL", required=True)
+            }
+        )
+
+    @staticmethod
+    def marshall_json(dict_out):
+        data_out = dict_out
+        jsonsend = PRODUCT_CACHE_STATS_SCHEMA.dump(data_out)
+        return jsonsend
@@ -0,0 +1,12 @@
+from marshmallow import Schema, fields
+
+
+class ProductCacheStatsSchema(Schema):
+    entries = fields.Integer(required=True)
+    bytes = fields.Integer(required=True)
+    max_entries = fields.Integer(required=True)
+    max_bytes = fields.Integer(required=True)
+    hits = fields.Integer(required=True)
+    misses = fields.Integer(required=True)
+    evictions = fields.Integer(required=True)
+    expirations = fields.Integer(required=True)
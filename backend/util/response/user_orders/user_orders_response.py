@@ -4,6 +4,9 @@ from ..models.order_min import OrderMinResponse
 from .user_orders_schema import UserOrdersSchema
 
 
+USER_ORDERS_SCHEMA = UserOrdersSchema()
+
+
 class UserOrdersResponse(object):
     @staticmethod
     def get_model(api, name):
@@ -11,14 +14,14 @@ class UserOrdersResponse(object):
             name,
             {
                 "orders": fields.List(fields.Nested(OrderMinResponse.get_model(api, "OrderMinResponse"), required=True), required=True),
-                "total": fields.Integer(description="Amount of results", required=True),
-                "pages": fields.Integer(description="Amount of pages", required=True)
+                "total": fields.Integer(description="Amount of results, not sent on cursor requests"),
+                "pages": fields.Integer(description="Amount of pages, not sent on cursor requests"),
+                "next_cursor": fields.String(description="Cursor for the following page, null on the last page")
             }
         )
 
     @staticmethod
     def marshall_json(dict_out):
         data_out = dict_out
-        schema = UserOrdersSchema()
-        jsonsend = schema.load(data_out)
+        jsonsend = USER_ORDERS_SCHEMA.dump(data_out)
         return jsonsend
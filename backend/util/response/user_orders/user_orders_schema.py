@@ -5,5 +5,6 @@ from ..models.order_min import OrderMinSchema
 
 class UserOrdersSchema(Schema):
     orders = fields.Nested(OrderMinSchema, required=True, many=True)
-    total = fields.Integer(required=True)
-    pages = fields.Integer(required=True)
+    total = fields.Integer()
+    pages = fields.Integer()
+    next_cursor = fields.String(allow_none=True)
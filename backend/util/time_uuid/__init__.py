@@ -0,0 +1,36 @@
+import os
+import uuid
+from time import time
+
+
+def uuid7() -> uuid.UUID:
+    """Create a time-ordered UUID with the version 7 layout.
+    The first 48 bits hold the Unix time in milliseconds and the remaining ones are random,
+    so new keys land on the right edge of their indexes instead of anywhere in them.
+    :return: UUID object, stored and slugged exactly like a random one
+    """
+
+    value = int(time() * 1000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xf << 76) | 0x7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+    return uuid.UUID(int=value)
+
+
+class UUIDFactory(object):
+    """Create the uuids of new orders and products, time-ordered unless configured otherwise."""
+
+    def __init__(self):
+        self.__time_ordered = True
+
+    def configure(self, time_ordered: bool) -> None:
+        self.__time_ordered = time_ordered
+
+    @property
+    def time_ordered(self) -> bool:
+        return self.__time_ordered
+
+    def __call__(self) -> uuid.UUID:
+        return uuid7() if self.__time_ordered else uuid.uuid4()
+
+
+new_uuid = UUIDFactory()
@@ -29,5 +29,72 @@ def test_cov_html():
     sys.exit(pytest.main(["backend/tests/", "-v", "--tb", "short", "--cov-report", "html:cov_html", "--cov=backend"]))
 
 
+@cli.command()
+@click.argument("ndjson_file", type=click.File("rb"))
+@click.option("--batch-size", default=None, type=int, help="Orders loaded per COPY batch. Defaults to ORDER_IMPORT_BATCH_SIZE.")
+def import_orders(ndjson_file, batch_size):
+    """Import NDJSON orders"""
+    from backend import create_app
+    from backend.service import OrderImportService
+
+    print("IMPORT ORDERS")
+    app = create_app()
+    with app.app_context():
+        report = OrderImportService().import_orders(ndjson_file, batch_size=batch_size or app.config["ORDER_IMPORT_BATCH_SIZE"])
+
+    for error in report["errors"]:
+        print("LINES %d-%d REJECTED: %s" % (error["first_line"], error["last_line"], error["error"]))
+
+    print("IMPORTED: %d FAILED: %d" % (report["imported"], report["failed"]))
+    sys.exit(1 if report["failed"] else 0)
+
+
+@cli.command()
+@click.option("--ahead", default=3, help="Months of partitions created ahead of the current one.")
+@click.option("--retain", default=None, type=int, help="Months of partitions kept attached; older ones are detached.")
+@click.option("--archive-schema", default=None, help="Schema the detached partitions are moved into.")
+def partitions(ahead, retain, archive_schema):
+    """Maintain monthly order partitions"""
+    from backend import create_app
+    from backend.dao.postgres_db import DBSession, shard_router
+    from backend.service import PartitionService
+
+    print("MAINTAIN PARTITIONS")
+    app = create_app()
+    with app.app_context():
+        sessions = [shard_router.session(name) for name in shard_router.names] if shard_router.enabled else [DBSession()]
+        for session in sessions:
+            service = PartitionService(session)
+            for name in service.create_partitions(months_ahead=ahead):
+                print("CREATED: %s" % name)
+
+            if retain is not None:
+                for name in service.detach_partitions(retain, archive_schema=archive_schema):
+                    print("DETACHED: %s" % name)
+
+
+@cli.command()
+@click.option("--source", default=None, help="Only move the users stored on this shard.")
+@click.option("--target", default=None, help="Only move the users owned by this shard.")
+@click.option("--start", default=None, type=click.UUID, help="Only move the users whose uuid is at least this one.")
+@click.option("--end", default=None, type=click.UUID, help="Only move the users whose uuid is below this one.")
+@click.option("--batch-size", default=500, help="Users moved per transaction.")
+def rebalance_shards(source, target, start, end, batch_size):
+    """Move users to the shard owning them on the hash ring"""
+    from backend import create_app
+    from backend.service import ShardService
+
+    print("REBALANCE SHARDS")
+    app = create_app()
+    with app.app_context():
+        try:
+            moved = ShardService().rebalance(source=source, target=target, start=start, end=end, batch_size=batch_size)
+        except ValueError as error:
+            raise click.BadParameter(str(error))
+
+    for (source_name, target_name), amount in sorted(moved.items()):
+        print("MOVED %d USERS: %s -> %s" % (amount, source_name, target_name))
+
+
 if __name__ == "__main__":
     cli()
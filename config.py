@@ -8,7 +8,31 @@ class BaseConfig(object):
     ERROR_404_HELP = False
     ERROR_INCLUDE_MESSAGE = False
     TEST_DOMAIN_IP = os.getenv("TEST_DOMAIN_IP")
+    DATABASE_AUTO_CREATE = os.getenv("DATABASE_AUTO_CREATE", default="true").lower() == "true"
+    DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+    DATABASE_READ_YOUR_WRITES = float(os.getenv("DATABASE_READ_YOUR_WRITES", default=5))
+    DATABASE_SHARDS = dict(shard.strip().split("=", 1) for shard in os.getenv("DATABASE_SHARDS", default="").split(",") if shard.strip())
+    DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", default=5))
+    DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", default=10))
+    DATABASE_POOL_TIMEOUT = float(os.getenv("DATABASE_POOL_TIMEOUT", default=30))
+    DATABASE_POOL_RECYCLE = int(os.getenv("DATABASE_POOL_RECYCLE", default=-1))
+    DATABASE_POOL_PRE_PING = os.getenv("DATABASE_POOL_PRE_PING", default="false").lower() == "true"
+    JSON_BACKEND = os.getenv("JSON_BACKEND", default="json")
+    JSON_ENCODE_RESPONSES = os.getenv("JSON_ENCODE_RESPONSES", default="false").lower() == "true"
+    TIME_ORDERED_UUIDS = os.getenv("TIME_ORDERED_UUIDS", default="true").lower() == "true"
     WILLSTORES_WS = os.getenv("WILLSTORES_WS")
+    WILLSTORES_POOL_SIZE = int(os.getenv("WILLSTORES_POOL_SIZE", default=10))
+    WILLSTORES_CONCURRENCY = int(os.getenv("WILLSTORES_CONCURRENCY", default=10))
+    WILLSTORES_TIMEOUT = float(os.getenv("WILLSTORES_TIMEOUT", default=5))
+    WILLSTORES_RETRIES = int(os.getenv("WILLSTORES_RETRIES", default=2))
+    WILLSTORES_BATCH_TOTALS = os.getenv("WILLSTORES_BATCH_TOTALS", default="false").lower() == "true"
+    ORDER_IMPORT_BATCH_SIZE = int(os.getenv("ORDER_IMPORT_BATCH_SIZE", default=5000))
+    ORDER_SNAPSHOTS = os.getenv("ORDER_SNAPSHOTS", default="false").lower() == "true"
+    ORDER_SNAPSHOT_TTL = float(os.getenv("ORDER_SNAPSHOT_TTL", default=0))
+    ORDER_LIST_SHARED_MAX_AGE = int(os.getenv("ORDER_LIST_SHARED_MAX_AGE", default=0))
+    PRODUCT_CACHE_SIZE = int(os.getenv("PRODUCT_CACHE_SIZE", default=1000))
+    PRODUCT_CACHE_MAX_BYTES = int(os.getenv("PRODUCT_CACHE_MAX_BYTES", default=8388608))
+    PRODUCT_CACHE_TTL = float(os.getenv("PRODUCT_CACHE_TTL", default=300))
 
 
 class DevelopmentConfig(BaseConfig):
@@ -19,8 +43,10 @@ class TestConfig(BaseConfig):
     DEBUG = True
     TESTING = True
     SECRET_KEY = os.getenv("SECRET_KEY", default=BaseConfig.SECRET_KEY)
+    PRODUCT_CACHE_SIZE = int(os.getenv("PRODUCT_CACHE_SIZE", default=0))
 
 
 class ProductionConfig(BaseConfig):
     DEBUG = False
+    DATABASE_AUTO_CREATE = os.getenv("DATABASE_AUTO_CREATE", default="false").lower() == "true"
     SECRET_KEY = os.getenv("SECRET_KEY")
@@ -0,0 +1,11 @@
+import os
+
+
+# Workers serve their requests on threads, so a listing waiting on Postgres or WillStores
+# only holds its own thread. Database sessions are scoped per thread.
+workers = int(os.getenv("WEB_CONCURRENCY", default=4))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", default=8))
+
+# The application, and so its database engines, is created in each worker after the fork.
+preload_app = False
@@ -0,0 +1,56 @@
+import os
+import re
+import sys
+from logging.config import fileConfig
+from alembic import context
+from dotenv import load_dotenv, find_dotenv
+from sqlalchemy import create_engine
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.dao.postgres_db import Base  # noqa: E402
+import backend.model  # noqa: E402,F401 imported to register the models on Base.metadata
+
+
+config = context.config
+fileConfig(config.config_file_name)
+load_dotenv(find_dotenv())
+
+target_metadata = Base.metadata
+
+
+PARTITION = re.compile(r"^(orders|order_product)_(y\d{4}m\d{2}|default)$")
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # Monthly and default partitions are managed by PartitionService, not by the models.
+    if not reflected or compare_to is not None:
+        return True
+    if type_ == "table":
+        return not PARTITION.match(name)
+    if type_ == "foreign_key_constraint":
+        return not PARTITION.match(object.referred_table.name)
+    return True
+
+
+def run_migrations_offline():
+    context.configure(url=os.getenv("DATABASE_URL"), target_metadata=target_metadata, literal_binds=True, include_object=include_object)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    engine = create_engine(os.getenv("DATABASE_URL"))
+
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,59 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases built by create_all before migrations existed already have this schema.
+    if "orders" in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        "orders",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("uuid", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_uuid", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("uuid")
+    )
+    op.create_table(
+        "products",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("uuid", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("es_id", sa.String(length=100), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("es_id"),
+        sa.UniqueConstraint("uuid")
+    )
+    op.create_table(
+        "order_product",
+        sa.Column("order_id", sa.BigInteger(), nullable=False),
+        sa.Column("product_id", sa.BigInteger(), nullable=False),
+        sa.Column("amount", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["order_id"], ["orders.id"], onupdate="CASCADE", ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"], onupdate="CASCADE", ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("order_id", "product_id")
+    )
+
+
+def downgrade():
+    op.drop_table("order_product")
+    op.drop_table("products")
+    op.drop_table("orders")
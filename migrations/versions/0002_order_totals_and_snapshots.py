@@ -0,0 +1,41 @@
+"""Order totals and order_product snapshots
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("orders", sa.Column("total_outlet", sa.Numeric(precision=12, scale=2), nullable=True))
+    op.add_column("orders", sa.Column("total_retail", sa.Numeric(precision=12, scale=2), nullable=True))
+    op.add_column("orders", sa.Column("total_symbol", sa.String(length=10), nullable=True))
+    op.add_column("order_product", sa.Column("name", sa.String(length=255), nullable=True))
+    op.add_column("order_product", sa.Column("image", sa.String(length=1000), nullable=True))
+    op.add_column("order_product", sa.Column("price_outlet", sa.Numeric(precision=12, scale=2), nullable=True))
+    op.add_column("order_product", sa.Column("price_retail", sa.Numeric(precision=12, scale=2), nullable=True))
+    op.add_column("order_product", sa.Column("price_symbol", sa.String(length=10), nullable=True))
+    op.add_column("order_product", sa.Column("discount", sa.Float(), nullable=True))
+    op.add_column("order_product", sa.Column("snapshot_at", sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("order_product", "snapshot_at")
+    op.drop_column("order_product", "discount")
+    op.drop_column("order_product", "price_symbol")
+    op.drop_column("order_product", "price_retail")
+    op.drop_column("order_product", "price_outlet")
+    op.drop_column("order_product", "image")
+    op.drop_column("order_product", "name")
+    op.drop_column("orders", "total_symbol")
+    op.drop_column("orders", "total_retail")
+    op.drop_column("orders", "total_outlet")
@@ -0,0 +1,27 @@
+"""User listing and order_product indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index("ix_orders_user_uuid_updated_at", "orders", ["user_uuid", sa.text("updated_at DESC")], postgresql_concurrently=True)
+        op.create_index("ix_order_product_product_id", "order_product", ["product_id"], postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_order_product_product_id", table_name="order_product", postgresql_concurrently=True)
+        op.drop_index("ix_orders_user_uuid_updated_at", table_name="orders", postgresql_concurrently=True)
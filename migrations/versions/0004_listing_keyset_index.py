@@ -0,0 +1,27 @@
+"""Extend the user listing index with the keyset tie breaker
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index("ix_orders_user_uuid_updated_at_id", "orders", ["user_uuid", sa.text("updated_at DESC"), sa.text("id DESC")], postgresql_concurrently=True)
+        op.drop_index("ix_orders_user_uuid_updated_at", table_name="orders", postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index("ix_orders_user_uuid_updated_at", "orders", ["user_uuid", sa.text("updated_at DESC")], postgresql_concurrently=True)
+        op.drop_index("ix_orders_user_uuid_updated_at_id", table_name="orders", postgresql_concurrently=True)
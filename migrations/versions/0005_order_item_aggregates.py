@@ -0,0 +1,66 @@
+"""Denormalized product_types and items_amount on orders
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+REFRESH_AGGREGATES = """
+UPDATE orders SET
+    product_types = (SELECT count(*) FROM order_product WHERE order_product.order_id = orders.id),
+    items_amount = (SELECT coalesce(sum(amount), 0) FROM order_product WHERE order_product.order_id = orders.id)
+WHERE orders.id IN (SELECT DISTINCT order_id FROM {items})
+"""
+
+
+def upgrade():
+    op.add_column("orders", sa.Column("product_types", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("orders", sa.Column("items_amount", sa.Integer(), server_default="0", nullable=False))
+    op.execute(REFRESH_AGGREGATES.format(items="order_product"))
+    op.execute("""
+        CREATE OR REPLACE FUNCTION order_product_refresh_aggregates() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' OR TG_OP = 'UPDATE' THEN
+                {new_items};
+            END IF;
+            IF TG_OP = 'DELETE' OR TG_OP = 'UPDATE' THEN
+                {old_items};
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """.format(new_items=REFRESH_AGGREGATES.format(items="new_items"), old_items=REFRESH_AGGREGATES.format(items="old_items")))
+    op.execute("""
+        CREATE TRIGGER order_product_aggregates_insert AFTER INSERT ON order_product
+            REFERENCING NEW TABLE AS new_items
+            FOR EACH STATEMENT EXECUTE PROCEDURE order_product_refresh_aggregates()
+    """)
+    op.execute("""
+        CREATE TRIGGER order_product_aggregates_update AFTER UPDATE ON order_product
+            REFERENCING OLD TABLE AS old_items NEW TABLE AS new_items
+            FOR EACH STATEMENT EXECUTE PROCEDURE order_product_refresh_aggregates()
+    """)
+    op.execute("""
+        CREATE TRIGGER order_product_aggregates_delete AFTER DELETE ON order_product
+            REFERENCING OLD TABLE AS old_items
+            FOR EACH STATEMENT EXECUTE PROCEDURE order_product_refresh_aggregates()
+    """)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER order_product_aggregates_delete ON order_product")
+    op.execute("DROP TRIGGER order_product_aggregates_update ON order_product")
+    op.execute("DROP TRIGGER order_product_aggregates_insert ON order_product")
+    op.execute("DROP FUNCTION order_product_refresh_aggregates()")
+    op.drop_column("orders", "items_amount")
+    op.drop_column("orders", "product_types")
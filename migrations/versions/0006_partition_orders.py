@@ -0,0 +1,301 @@
+"""Partition orders and order_product by month
+
+The partitioned tables are built next to the live ones and filled in batches,
+each in its own transaction, while a row trigger records the orders changed in
+the meantime. Only the final swap, which copies those changed orders again,
+blocks writes. The downgrade rewrites the tables in a single transaction.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+MONTHS_AHEAD = 3
+
+BATCH_SIZE = 10000
+
+RENAMED_INDEXES = [
+    "orders_pkey",
+    "ix_orders_user_uuid_updated_at_id",
+    "order_product_pkey",
+    "ix_order_product_product_id"
+]
+
+RENAMED_CONSTRAINTS = [
+    ("orders", "orders_pkey"),
+    ("orders", "orders_uuid_created_at_key"),
+    ("order_product", "order_product_pkey"),
+    ("order_product", "order_product_order_id_order_created_at_fkey"),
+    ("order_product", "order_product_product_id_fkey")
+]
+
+ORDER_COLUMNS = "id, uuid, user_uuid, total_outlet, total_retail, total_symbol, product_types, items_amount, created_at, updated_at"
+
+ITEM_COLUMNS = "order_id, product_id, amount, name, image, price_outlet, price_retail, price_symbol, discount, snapshot_at"
+
+COPY_ORDERS = """
+    INSERT INTO orders_new ({columns})
+    SELECT {source} FROM orders WHERE {{where}}
+""".format(columns=ORDER_COLUMNS, source=ORDER_COLUMNS.replace("created_at,", "coalesce(created_at, updated_at, now()),"))
+
+COPY_ITEMS = """
+    INSERT INTO order_product_new ({columns}, order_created_at)
+    SELECT {source}, orders_new.created_at FROM order_product AS item
+    JOIN orders_new ON orders_new.id = item.order_id
+    WHERE {{where}}
+""".format(columns=ITEM_COLUMNS, source=", ".join("item.%s" % column for column in ITEM_COLUMNS.split(", ")))
+
+COPY_UUIDS = """
+    INSERT INTO order_uuids (uuid, order_id, created_at)
+    SELECT uuid, id, created_at FROM orders_new WHERE {where}
+"""
+
+
+def create_triggers():
+    op.execute("""
+        CREATE TRIGGER order_product_aggregates_insert AFTER INSERT ON order_product
+            REFERENCING NEW TABLE AS new_items
+            FOR EACH STATEMENT EXECUTE PROCEDURE order_product_refresh_aggregates()
+    """)
+    op.execute("""
+        CREATE TRIGGER order_product_aggregates_update AFTER UPDATE ON order_product
+            REFERENCING OLD TABLE AS old_items NEW TABLE AS new_items
+            FOR EACH STATEMENT EXECUTE PROCEDURE order_product_refresh_aggregates()
+    """)
+    op.execute("""
+        CREATE TRIGGER order_product_aggregates_delete AFTER DELETE ON order_product
+            REFERENCING OLD TABLE AS old_items
+            FOR EACH STATEMENT EXECUTE PROCEDURE order_product_refresh_aggregates()
+    """)
+
+
+def drop_triggers():
+    op.execute("DROP TRIGGER order_product_aggregates_delete ON order_product")
+    op.execute("DROP TRIGGER order_product_aggregates_update ON order_product")
+    op.execute("DROP TRIGGER order_product_aggregates_insert ON order_product")
+
+
+def create_uuid_triggers():
+    op.execute("""
+        CREATE OR REPLACE FUNCTION orders_refresh_uuids() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO order_uuids (uuid, order_id, created_at) SELECT uuid, id, created_at FROM new_orders;
+            ELSIF TG_OP = 'DELETE' THEN
+                DELETE FROM order_uuids WHERE uuid IN (SELECT uuid FROM old_orders);
+            ELSE
+                DELETE FROM order_uuids WHERE (uuid, order_id, created_at) IN (
+                    SELECT uuid, id, created_at FROM old_orders EXCEPT SELECT uuid, id, created_at FROM new_orders
+                );
+                INSERT INTO order_uuids (uuid, order_id, created_at)
+                    SELECT uuid, id, created_at FROM new_orders EXCEPT SELECT uuid, id, created_at FROM old_orders;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER orders_uuids_insert AFTER INSERT ON orders
+            REFERENCING NEW TABLE AS new_orders
+            FOR EACH STATEMENT EXECUTE PROCEDURE orders_refresh_uuids()
+    """)
+    op.execute("""
+        CREATE TRIGGER orders_uuids_update AFTER UPDATE ON orders
+            REFERENCING OLD TABLE AS old_orders NEW TABLE AS new_orders
+            FOR EACH STATEMENT EXECUTE PROCEDURE orders_refresh_uuids()
+    """)
+    op.execute("""
+        CREATE TRIGGER orders_uuids_delete AFTER DELETE ON orders
+            REFERENCING OLD TABLE AS old_orders
+            FOR EACH STATEMENT EXECUTE PROCEDURE orders_refresh_uuids()
+    """)
+
+
+def rename_tables(suffix):
+    op.rename_table("order_product", "order_product%s" % suffix)
+    op.rename_table("orders", "orders%s" % suffix)
+    for index in RENAMED_INDEXES:
+        op.execute("ALTER INDEX %s RENAME TO %s%s" % (index, index, suffix))
+
+
+def upgrade():
+    op.create_table(
+        "orders_new",
+        sa.Column("id", sa.BigInteger(), server_default=sa.text("nextval('orders_id_seq')"), nullable=False),
+        sa.Column("uuid", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_uuid", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("total_outlet", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("total_retail", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("total_symbol", sa.String(length=10), nullable=True),
+        sa.Column("product_types", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("items_amount", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id", "created_at", name="orders_pkey_new"),
+        sa.UniqueConstraint("uuid", "created_at", name="orders_uuid_created_at_key_new"),
+        postgresql_partition_by="RANGE (created_at)"
+    )
+    op.create_index("ix_orders_user_uuid_updated_at_id_new", "orders_new", ["user_uuid", sa.text("updated_at DESC"), sa.text("id DESC")])
+    op.create_table(
+        "order_product_new",
+        sa.Column("order_id", sa.BigInteger(), nullable=False),
+        sa.Column("order_created_at", sa.DateTime(), nullable=False),
+        sa.Column("product_id", sa.BigInteger(), nullable=False),
+        sa.Column("amount", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=True),
+        sa.Column("image", sa.String(length=1000), nullable=True),
+        sa.Column("price_outlet", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("price_retail", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("price_symbol", sa.String(length=10), nullable=True),
+        sa.Column("discount", sa.Float(), nullable=True),
+        sa.Column("snapshot_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["order_id", "order_created_at"], ["orders_new.id", "orders_new.created_at"],
+            name="order_product_order_id_order_created_at_fkey_new", onupdate="CASCADE", ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"], name="order_product_product_id_fkey_new", onupdate="CASCADE", ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("order_id", "order_created_at", "product_id", name="order_product_pkey_new"),
+        postgresql_partition_by="RANGE (order_created_at)"
+    )
+    op.create_index("ix_order_product_product_id_new", "order_product_new", ["product_id"])
+    op.create_table(
+        "order_uuids",
+        sa.Column("uuid", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("order_id", sa.BigInteger(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("uuid")
+    )
+
+    op.execute("CREATE TABLE orders_default PARTITION OF orders_new DEFAULT")
+    op.execute("CREATE TABLE order_product_default PARTITION OF order_product_new DEFAULT")
+
+    months = op.get_bind().execute(sa.text("""
+        SELECT generate_series(
+            date_trunc('month', coalesce(min(coalesce(created_at, updated_at)), now())),
+            date_trunc('month', now()) + interval '%d months',
+            interval '1 month'
+        )::date FROM orders
+    """ % MONTHS_AHEAD)).fetchall()
+    for (lower, ) in months:
+        for table in ["orders", "order_product"]:
+            op.execute(
+                "CREATE TABLE %s_y%04dm%02d PARTITION OF %s_new FOR VALUES FROM ('%s') TO ('%s'::date + interval '1 month')"
+                % (table, lower.year, lower.month, table, lower, lower)
+            )
+
+    op.execute("CREATE TABLE orders_partition_changes (order_id BIGINT NOT NULL)")
+    op.execute("""
+        CREATE FUNCTION orders_partition_capture() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO orders_partition_changes
+                VALUES ((to_jsonb(CASE WHEN TG_OP = 'DELETE' THEN OLD ELSE NEW END) ->> TG_ARGV[0])::bigint);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER orders_partition_capture AFTER INSERT OR UPDATE OR DELETE ON orders
+            FOR EACH ROW EXECUTE PROCEDURE orders_partition_capture('id')
+    """)
+    op.execute("""
+        CREATE TRIGGER order_product_partition_capture AFTER INSERT OR UPDATE OR DELETE ON order_product
+            FOR EACH ROW EXECUTE PROCEDURE orders_partition_capture('order_id')
+    """)
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        first, last = bind.execute(sa.text("SELECT min(id), max(id) FROM orders")).fetchone()
+        for lower in range(first or 0, (last or 0) + 1, BATCH_SIZE):
+            bounds = {"lower": lower, "upper": lower + BATCH_SIZE}
+            bind.execute(sa.text(COPY_ORDERS.format(where="id >= :lower AND id < :upper")), bounds)
+            bind.execute(sa.text(COPY_ITEMS.format(where="item.order_id >= :lower AND item.order_id < :upper")), bounds)
+            bind.execute(sa.text(COPY_UUIDS.format(where="id >= :lower AND id < :upper")), bounds)
+
+    op.execute("LOCK TABLE orders, order_product IN EXCLUSIVE MODE")
+    changed = "id IN (SELECT order_id FROM orders_partition_changes)"
+    op.execute("DELETE FROM order_uuids WHERE order_%s" % changed)
+    op.execute("DELETE FROM orders_new WHERE %s" % changed)
+    op.execute(COPY_ORDERS.format(where=changed))
+    op.execute(COPY_ITEMS.format(where="item.order_%s" % changed))
+    op.execute(COPY_UUIDS.format(where=changed))
+
+    op.execute("ALTER SEQUENCE orders_id_seq OWNED BY NONE")
+    op.drop_table("order_product")
+    op.drop_table("orders")
+    op.drop_table("orders_partition_changes")
+    op.execute("DROP FUNCTION orders_partition_capture()")
+
+    op.rename_table("orders_new", "orders")
+    op.rename_table("order_product_new", "order_product")
+    for table, constraint in RENAMED_CONSTRAINTS:
+        op.execute("ALTER TABLE %s RENAME CONSTRAINT %s_new TO %s" % (table, constraint, constraint))
+    for index in ["ix_orders_user_uuid_updated_at_id", "ix_order_product_product_id"]:
+        op.execute("ALTER INDEX %s_new RENAME TO %s" % (index, index))
+
+    op.execute("ALTER SEQUENCE orders_id_seq OWNED BY orders.id")
+    create_triggers()
+    create_uuid_triggers()
+
+
+def downgrade():
+    op.execute("DROP TRIGGER orders_uuids_delete ON orders")
+    op.execute("DROP TRIGGER orders_uuids_update ON orders")
+    op.execute("DROP TRIGGER orders_uuids_insert ON orders")
+    op.execute("DROP FUNCTION orders_refresh_uuids()")
+    op.drop_table("order_uuids")
+    drop_triggers()
+    op.execute("ALTER SEQUENCE orders_id_seq OWNED BY NONE")
+    rename_tables("_partitioned")
+
+    op.create_table(
+        "orders",
+        sa.Column("id", sa.BigInteger(), server_default=sa.text("nextval('orders_id_seq')"), nullable=False),
+        sa.Column("uuid", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_uuid", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("total_outlet", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("total_retail", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("total_symbol", sa.String(length=10), nullable=True),
+        sa.Column("product_types", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("items_amount", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("uuid")
+    )
+    op.create_index("ix_orders_user_uuid_updated_at_id", "orders", ["user_uuid", sa.text("updated_at DESC"), sa.text("id DESC")])
+    op.create_table(
+        "order_product",
+        sa.Column("order_id", sa.BigInteger(), nullable=False),
+        sa.Column("product_id", sa.BigInteger(), nullable=False),
+        sa.Column("amount", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=True),
+        sa.Column("image", sa.String(length=1000), nullable=True),
+        sa.Column("price_outlet", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("price_retail", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("price_symbol", sa.String(length=10), nullable=True),
+        sa.Column("discount", sa.Float(), nullable=True),
+        sa.Column("snapshot_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["order_id"], ["orders.id"], onupdate="CASCADE", ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"], onupdate="CASCADE", ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("order_id", "product_id")
+    )
+    op.create_index("ix_order_product_product_id", "order_product", ["product_id"])
+
+    op.execute("INSERT INTO orders ({columns}) SELECT {columns} FROM orders_partitioned".format(columns=ORDER_COLUMNS))
+    op.execute("INSERT INTO order_product ({columns}) SELECT {columns} FROM order_product_partitioned".format(columns=ITEM_COLUMNS))
+
+    op.execute("ALTER SEQUENCE orders_id_seq OWNED BY orders.id")
+    op.execute("DROP TABLE order_product_partitioned CASCADE")
+    op.execute("DROP TABLE orders_partitioned CASCADE")
+    create_triggers()
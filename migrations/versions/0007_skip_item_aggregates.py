@@ -0,0 +1,60 @@
+"""Let bulk loads skip the order item aggregate trigger
+
+Loads that already write product_types and items_amount set
+willorders.skip_item_aggregates to on for their transaction.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+REFRESH_AGGREGATES = """
+UPDATE orders SET
+    product_types = (SELECT count(*) FROM order_product WHERE order_product.order_id = orders.id),
+    items_amount = (SELECT coalesce(sum(amount), 0) FROM order_product WHERE order_product.order_id = orders.id)
+WHERE orders.id IN (SELECT DISTINCT order_id FROM {items})
+"""
+
+REFRESH_FUNCTION = """
+    CREATE OR REPLACE FUNCTION order_product_refresh_aggregates() RETURNS trigger AS $$
+    BEGIN
+        {skip}
+        IF TG_OP = 'INSERT' OR TG_OP = 'UPDATE' THEN
+            {new_items};
+        END IF;
+        IF TG_OP = 'DELETE' OR TG_OP = 'UPDATE' THEN
+            {old_items};
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+SKIP = """IF current_setting('willorders.skip_item_aggregates', true) = 'on' THEN
+            RETURN NULL;
+        END IF;"""
+
+
+def upgrade():
+    op.execute(REFRESH_FUNCTION.format(
+        skip=SKIP,
+        new_items=REFRESH_AGGREGATES.format(items="new_items"),
+        old_items=REFRESH_AGGREGATES.format(items="old_items")
+    ))
+
+
+def downgrade():
+    op.execute(REFRESH_FUNCTION.format(
+        skip="",
+        new_items=REFRESH_AGGREGATES.format(items="new_items"),
+        old_items=REFRESH_AGGREGATES.format(items="old_items")
+    ))
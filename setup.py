@@ -9,6 +9,7 @@ setup(
    author_email="willrogerpereira@hotmail.com",
    url="https://github.com/willrp/willorders-ws",
    install_requires=[
+       "alembic",
        "Flask",
        "flask-restplus",
        "marshmallow",